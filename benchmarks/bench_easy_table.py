@@ -0,0 +1,293 @@
+'''
+Offline benchmark suite for `easy_table`
+
+`AgGrid` is replaced by a stub that prepares the data like st_aggrid
+(`_parse_data_and_grid_options`) and serializes what the component would
+send to the browser, so no Streamlit server is needed. For every case of
+the matrix (rows x columns x children depth x column type) it records:
+
+- wall time of `easy_table` with a cold and a warm gridOptions cache
+- wall time of `compile_columns` for the same column objects (cache hit)
+  and for a rebuilt tree
+- peak memory (tracemalloc) of a cold call
+- serialized size of gridOptions and of the row data (the Arrow buffer
+  st_aggrid sends by default, or the JSON records of `rowData`)
+- number of JsCode blocks in gridOptions
+
+Usage
+-----
+    python benchmarks/bench_easy_table.py run --preset quick --output base.json
+    python benchmarks/bench_easy_table.py run --rows 1000 100000 --cols 10 100 --types bar icon
+    python benchmarks/bench_easy_table.py compare base.json new.json
+'''
+import argparse
+import itertools
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import numpy as np
+import pandas as pd
+from st_aggrid.aggrid_utils import _parse_data_and_grid_options
+from streamlit import dataframe_util
+
+import easy_st_aggrid
+import easy_st_aggrid.table as table_module
+from easy_st_aggrid import col_base, col_text, col_bool, col_bar, col_icon, col_status
+try:
+    from easy_st_aggrid.column_spec import compile_columns
+except ImportError: # arbol anterior a las specs compiladas
+    compile_columns = None
+
+
+PRESETS = {
+    "quick": dict(rows=[1_000, 10_000], cols=[10, 100], depth=[0, 1], types=["text", "bar", "icon", "status", "bool"]),
+    "full": dict(rows=[1_000, 10_000, 100_000, 1_000_000], cols=[10, 100, 1000], depth=[0, 1, 3], types=["text", "bar", "icon", "status", "bool"]),
+}
+
+METRICS = ["time_cold_s", "time_warm_s", "spec_hit_s", "spec_rebuild_s", "peak_mem_mb", "grid_options_bytes", "data_bytes"]
+
+STATES = ["OK", "WARN", "FAIL", "NA"]
+COLORS = ["#2ecc71", "#f1c40f", "#e74c3c", "#95a5a6"]
+
+
+## AGGRID STUB
+class _Captured:
+    grid_options_bytes = 0
+    data_bytes = 0
+    jscode_blocks = 0
+
+
+def _json_default(obj):
+    js_code = getattr(obj, 'js_code', None)
+    if isinstance(js_code, str):
+        _Captured.jscode_blocks += 1
+        return js_code
+    if isinstance(obj, dict):
+        return dict(obj)
+    return str(obj)
+
+
+def _row_payload_bytes(data, grid_options, use_json_serialization) -> int:
+    # Lo que st_aggrid envia: buffer Arrow del argumento, o rowData en JSON
+    if data is None:
+        return len(grid_options.get('rowData', '').encode('utf-8'))
+    try:
+        return len(dataframe_util.convert_pandas_df_to_arrow_bytes(data, downcast_large_types=True))
+    except Exception:
+        if use_json_serialization != 'auto':
+            raise
+        # Igual que AgGrid con 'auto': filas en JSON cuando Arrow no puede convertir
+        return len(data.to_json(orient='records').encode('utf-8'))
+
+
+def _aggrid_stub(data=None, gridOptions=None, **kwargs):
+    _Captured.jscode_blocks = 0
+    _Captured.grid_options_bytes = len(json.dumps(gridOptions, default=_json_default).encode('utf-8'))
+    use_json_serialization = kwargs.get('use_json_serialization', 'auto')
+    data, grid_options, _ = _parse_data_and_grid_options(
+        data, gridOptions, {}, kwargs.get('allow_unsafe_jscode', False), use_json_serialization is True,
+    )
+    _Captured.data_bytes = _row_payload_bytes(data, grid_options, use_json_serialization)
+    return None
+
+
+table_module.AgGrid = _aggrid_stub
+
+
+## DATA AND COLUMNS
+def make_frame(rows: int, cols: int, col_type: str, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    data = dict()
+    for i in range(cols):
+        name = f"c{i}"
+        if col_type == "bar":
+            data[name] = rng.normal(0, 100, rows)
+        elif col_type in ("icon", "status"):
+            data[name] = rng.choice(STATES, rows)
+        elif col_type == "bool":
+            data[name] = rng.random(rows) > 0.5
+        else:
+            data[name] = rng.integers(0, 1_000_000, rows).astype(str)
+    return pd.DataFrame(data)
+
+
+def make_column(name: str, col_type: str) -> col_base:
+    if col_type == "bar":
+        return col_bar(name)
+    if col_type == "icon":
+        return col_icon(name, states=[
+            col_icon.state(s, s.lower(), c, "circle") for s, c in zip(STATES, COLORS)
+        ])
+    if col_type == "status":
+        return col_status(name, states=[
+            col_status.state(s, s.lower(), c) for s, c in zip(STATES, COLORS)
+        ])
+    if col_type == "bool":
+        return col_bool(name)
+    return col_text(name)
+
+
+def make_columns(df: pd.DataFrame, col_type: str, depth: int, group_size: int = 5):
+    columns = [make_column(name, col_type) for name in df.columns]
+    for level in range(depth):
+        columns = [
+            col_base(alias=f"G{level}_{i}", children=columns[i:i + group_size])
+            for i in range(0, len(columns), group_size)
+        ]
+    return columns
+
+
+## RUN
+def run_case(rows: int, cols: int, depth: int, col_type: str, repeat: int = 3) -> dict:
+    df = make_frame(rows, cols, col_type)
+
+    def call():
+        # Columnas recreadas en cada llamada, como en un rerun de Streamlit
+        table_module.easy_table(df, columns_list=make_columns(df, col_type, depth))
+
+    # Arboles anteriores a la cache de gridOptions no la tienen
+    grid_options_cache = getattr(table_module, 'grid_options_cache', None)
+    clear_cache = grid_options_cache.clear if grid_options_cache is not None else (lambda: None)
+
+    clear_cache()
+    tracemalloc.start()
+    call()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    cold = []
+    for _ in range(repeat):
+        clear_cache()
+        t0 = time.perf_counter()
+        call()
+        cold.append(time.perf_counter() - t0)
+    warm = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        call()
+        warm.append(time.perf_counter() - t0)
+
+    # compile_columns: mismas columnas (hit) frente a un arbol recreado
+    spec_hit, spec_rebuild = [], []
+    if compile_columns is not None:
+        columns = make_columns(df, col_type, depth)
+        compile_columns(columns)
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            compile_columns(columns)
+            spec_hit.append(time.perf_counter() - t0)
+        for _ in range(repeat):
+            rebuilt = make_columns(df, col_type, depth)
+            t0 = time.perf_counter()
+            compile_columns(rebuilt)
+            spec_rebuild.append(time.perf_counter() - t0)
+
+    return {
+        "rows": rows,
+        "cols": cols,
+        "depth": depth,
+        "type": col_type,
+        "time_cold_s": min(cold),
+        "time_warm_s": min(warm),
+        "spec_hit_s": min(spec_hit, default=None),
+        "spec_rebuild_s": min(spec_rebuild, default=None),
+        "peak_mem_mb": peak / 2**20,
+        "grid_options_bytes": _Captured.grid_options_bytes,
+        "data_bytes": _Captured.data_bytes,
+        "jscode_blocks": _Captured.jscode_blocks,
+    }
+
+
+def _case_id(case: dict) -> tuple:
+    return (case["rows"], case["cols"], case["depth"], case["type"])
+
+
+def run(args) -> None:
+    matrix = dict(PRESETS[args.preset])
+    for name in ("rows", "cols", "depth", "types"):
+        if getattr(args, name):
+            matrix[name] = getattr(args, name)
+
+    results = []
+    for rows, cols, depth, col_type in itertools.product(matrix["rows"], matrix["cols"], matrix["depth"], matrix["types"]):
+        if rows * cols > args.max_cells:
+            continue
+        case = run_case(rows, cols, depth, col_type, repeat=args.repeat)
+        results.append(case)
+        spec = (
+            f"spec hit={case['spec_hit_s'] * 1000:6.2f}ms rebuild={case['spec_rebuild_s'] * 1000:6.2f}ms "
+            if case['spec_hit_s'] is not None else ""
+        )
+        print(
+            f"{col_type:>6} rows={rows:>9,} cols={cols:>5} depth={depth} | "
+            f"cold={case['time_cold_s'] * 1000:9.1f}ms warm={case['time_warm_s'] * 1000:9.1f}ms {spec}"
+            f"peak={case['peak_mem_mb']:8.1f}MB options={case['grid_options_bytes']:>10,}B data={case['data_bytes']:>12,}B",
+            flush=True,
+        )
+
+    report = {
+        "version": getattr(easy_st_aggrid, "__version__", None),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+    }
+    Path(args.output).write_text(json.dumps(report, indent=2))
+    print(f"\n{len(results)} cases -> {args.output}")
+
+
+def compare(args) -> None:
+    base = {_case_id(c): c for c in json.loads(Path(args.base).read_text())["results"]}
+    new = {_case_id(c): c for c in json.loads(Path(args.new).read_text())["results"]}
+    regressions = 0
+    for case_id in sorted(base.keys() & new.keys()):
+        changes = []
+        for metric in METRICS:
+            # Ficheros de versiones anteriores pueden no traer todas las metricas
+            old_val, new_val = base[case_id].get(metric), new[case_id].get(metric)
+            if not old_val or new_val is None:
+                continue
+            ratio = new_val / old_val
+            flag = "!" if ratio > 1 + args.threshold else " "
+            regressions += flag == "!"
+            changes.append(f"{flag}{metric}={ratio:5.2f}x")
+        print(f"{str(case_id):<36} " + " ".join(changes))
+    print(f"\n{regressions} metrics above +{args.threshold:.0%}")
+    sys.exit(1 if regressions and args.fail else 0)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_run = sub.add_parser("run", help="run the benchmark matrix")
+    p_run.add_argument("--preset", choices=sorted(PRESETS), default="quick")
+    p_run.add_argument("--rows", type=int, nargs="+")
+    p_run.add_argument("--cols", type=int, nargs="+")
+    p_run.add_argument("--depth", type=int, nargs="+")
+    p_run.add_argument("--types", nargs="+", choices=PRESETS["full"]["types"])
+    p_run.add_argument("--repeat", type=int, default=3)
+    p_run.add_argument("--max-cells", type=int, default=50_000_000, help="skip cases with rows*cols above this")
+    p_run.add_argument("--output", default="bench_results.json")
+    p_run.set_defaults(func=run)
+
+    p_cmp = sub.add_parser("compare", help="diff two result files")
+    p_cmp.add_argument("base")
+    p_cmp.add_argument("new")
+    p_cmp.add_argument("--threshold", type=float, default=0.10, help="relative increase reported as regression")
+    p_cmp.add_argument("--fail", action="store_true", help="exit with status 1 on regressions")
+    p_cmp.set_defaults(func=compare)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+'''
+Import-time benchmark for `easy_st_aggrid`
+
+Every case runs in a fresh interpreter (cold start of a Streamlit worker)
+and records the wall time of its import statement and the number of
+modules loaded by it:
+
+- package: `import easy_st_aggrid`
+- column: `from easy_st_aggrid import col_text`
+- table: `from easy_st_aggrid import easy_table`
+- eager: every public name, i.e. what the package used to import up front
+
+The difference between `package` / `column` and `eager` is the cold-start
+time saved by the lazy imports.
+
+Usage
+-----
+    python benchmarks/bench_import.py run --repeat 10 --output import.json
+    python benchmarks/bench_import.py compare base.json new.json
+'''
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+CASES = {
+    "package": "import easy_st_aggrid",
+    "column": "from easy_st_aggrid import col_text",
+    "table": "from easy_st_aggrid import easy_table",
+    "eager": "import easy_st_aggrid; [getattr(easy_st_aggrid, n) for n in easy_st_aggrid.__all__]",
+}
+
+# Se ejecuta en un interprete nuevo por medicion
+_PROBE = '''
+import sys, time, json
+sys.path.insert(0, {root!r})
+before = len(sys.modules)
+t = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - t
+print(json.dumps({{"time_s": elapsed, "modules": len(sys.modules) - before}}))
+'''
+
+
+def measure(statement: str) -> dict:
+    code = _PROBE.format(root=str(ROOT), statement=statement)
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def run(args) -> None:
+    results = []
+    for name in args.cases:
+        samples = [measure(CASES[name]) for _ in range(args.repeat)]
+        times = [s["time_s"] for s in samples]
+        result = {
+            "case": name,
+            "time_median_s": statistics.median(times),
+            "time_min_s": min(times),
+            "modules": samples[-1]["modules"],
+        }
+        results.append(result)
+        print(f"{name:>8} | median={result['time_median_s'] * 1000:8.1f}ms min={result['time_min_s'] * 1000:8.1f}ms modules={result['modules']:5d}")
+
+    by_case = {r["case"]: r for r in results}
+    if "eager" in by_case:
+        eager = by_case["eager"]["time_median_s"]
+        for name in ("package", "column"):
+            if name in by_case:
+                print(f"{name} saves {(eager - by_case[name]['time_median_s']) * 1000:.1f}ms vs eager")
+
+    payload = {"python": platform.python_version(), "platform": platform.platform(), "results": results}
+    Path(args.output).write_text(json.dumps(payload, indent=2))
+    print(f"\n{len(results)} cases -> {args.output}")
+
+
+def compare(args) -> None:
+    base = {r["case"]: r for r in json.loads(Path(args.base).read_text())["results"]}
+    new = {r["case"]: r for r in json.loads(Path(args.new).read_text())["results"]}
+    for name in [c for c in CASES if c in base and c in new]:
+        b, n = base[name]["time_median_s"], new[name]["time_median_s"]
+        change = (n - b) / b if b else 0.0
+        print(f"{name:>8} | {b * 1000:8.1f}ms -> {n * 1000:8.1f}ms ({change:+.0%}) modules {base[name]['modules']} -> {new[name]['modules']}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_run = sub.add_parser("run")
+    p_run.add_argument("--cases", nargs="+", choices=list(CASES), default=list(CASES))
+    p_run.add_argument("--repeat", type=int, default=10)
+    p_run.add_argument("--output", default="bench_import.json")
+    p_run.set_defaults(func=run)
+
+    p_cmp = sub.add_parser("compare")
+    p_cmp.add_argument("base")
+    p_cmp.add_argument("new")
+    p_cmp.set_defaults(func=compare)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -16,22 +16,104 @@ cell_style
 Table
 -----
 easy_table
+
+Selection
+---------
+selected_data
+selected_ids
+
+Export
+------
+export_button
+export_file
+
+Instrumentation
+---------------
+capture_metrics
+table_metrics
+
+Every name is imported on first access (PEP 562), so `import easy_st_aggrid`
+does not load st_aggrid, streamlit or pandas until they are needed.
 '''
+import sys
+import types
+from typing import TYPE_CHECKING
+
 from ._version import __version__
-from st_aggrid import JsCode
-
-from easy_st_aggrid.defaults import \
-    cell_style, \
-    default_cell, \
-    default_header, \
-    col_base, \
-    col_text, \
-    col_bool, \
-    col_str_date
-
-from easy_st_aggrid.table import easy_table
-
-## CUSTOM COLUMNS
-from easy_st_aggrid.col_status import col_status
-from easy_st_aggrid.col_bar import col_bar
-from easy_st_aggrid.col_icon import col_icon
+
+# Nombre publico -> modulo que lo define (carga diferida)
+_LAZY = {
+    'JsCode': 'st_aggrid',
+    ## STYLE AND BASE COLUMNS
+    'cell_style': 'easy_st_aggrid.defaults',
+    'default_cell': 'easy_st_aggrid.defaults',
+    'default_header': 'easy_st_aggrid.defaults',
+    'col_base': 'easy_st_aggrid.defaults',
+    'col_text': 'easy_st_aggrid.defaults',
+    'col_bool': 'easy_st_aggrid.defaults',
+    'col_str_date': 'easy_st_aggrid.defaults',
+    ## TABLE
+    'easy_table': 'easy_st_aggrid.table',
+    'selected_data': 'easy_st_aggrid.selection',
+    'selected_ids': 'easy_st_aggrid.selection',
+    'export_button': 'easy_st_aggrid.export',
+    'export_file': 'easy_st_aggrid.export',
+    'capture_metrics': 'easy_st_aggrid.instrumentation',
+    'table_metrics': 'easy_st_aggrid.instrumentation',
+    ## CUSTOM COLUMNS
+    'col_status': 'easy_st_aggrid.col_status',
+    'col_bar': 'easy_st_aggrid.col_bar',
+    'col_icon': 'easy_st_aggrid.col_icon',
+    'col_sparkline': 'easy_st_aggrid.col_sparkline',
+    'col_heatmap': 'easy_st_aggrid.col_heatmap',
+}
+
+__all__ = ['__version__', *_LAZY]
+
+
+def __getattr__(name: str):
+    module_name = _LAZY.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value # los siguientes accesos no pasan por aqui
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
+
+
+class _Package(types.ModuleType):
+    def __setattr__(self, name, value):
+        # Importar el submodulo col_bar (p.ej. desde table) lo asigna como atributo
+        # del paquete y taparia la clase del mismo nombre: se guarda la clase
+        if isinstance(value, types.ModuleType) and _LAZY.get(name) == value.__name__ and hasattr(value, name):
+            value = getattr(value, name)
+        super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _Package
+
+
+if TYPE_CHECKING:
+    from st_aggrid import JsCode
+    from easy_st_aggrid.defaults import \
+        cell_style, \
+        default_cell, \
+        default_header, \
+        col_base, \
+        col_text, \
+        col_bool, \
+        col_str_date
+    from easy_st_aggrid.table import easy_table
+    from easy_st_aggrid.selection import selected_data, selected_ids
+    from easy_st_aggrid.export import export_button, export_file
+    from easy_st_aggrid.instrumentation import capture_metrics, table_metrics
+    from easy_st_aggrid.col_status import col_status
+    from easy_st_aggrid.col_bar import col_bar
+    from easy_st_aggrid.col_icon import col_icon
+    from easy_st_aggrid.col_sparkline import col_sparkline
+    from easy_st_aggrid.col_heatmap import col_heatmap
@@ -0,0 +1,202 @@
+'''
+Small in-process caches shared by `easy_table`
+
+Classes
+-------
+LRUCache
+
+Functions
+---------
+fingerprint
+digest
+schema_fingerprint
+data_version
+'''
+import hashlib
+import pickle
+import threading
+from collections import OrderedDict
+from dataclasses import fields, is_dataclass
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+_MISSING = object()
+
+
+class LRUCache:
+    '''
+    Thread-safe LRU cache with bounded size and hit/miss counters.
+
+    Streamlit runs every session in its own thread, so all accesses are
+    serialized with a lock.
+
+    Parameters
+    ----------
+    maxsize : int
+        Maximum number of entries kept. The least recently used entry is
+        evicted first.
+    on_evict : Callable[[Hashable, Any], None] or None
+        Called with (key, value) for every entry evicted or cleared (e.g.
+        to delete the file an entry points to).
+
+    Methods
+    -------
+    get
+    put
+    clear
+    info
+    '''
+    def __init__(self, maxsize: int = 64, on_evict: Optional[Callable[[Hashable, Any], None]] = None):
+        self.maxsize = maxsize
+        self.on_evict = on_evict
+        self.hits = 0
+        self.misses = 0
+        self._data: 'OrderedDict[Hashable, Any]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        '''
+        Returns the cached value (and marks it as recently used) or `default`
+        '''
+        with self._lock:
+            value = self._data.get(key, _MISSING)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> Any:
+        '''
+        Stores `value` under `key`, evicting the oldest entries if needed
+        '''
+        evicted = []
+        with self._lock:
+            previous = self._data.get(key, _MISSING)
+            if previous is not _MISSING and previous is not value:
+                evicted.append((key, previous))
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                evicted.append(self._data.popitem(last=False))
+        self._evict(evicted)
+        return value
+
+    def clear(self) -> None:
+        '''
+        Removes every entry and resets the counters
+        '''
+        with self._lock:
+            evicted = list(self._data.items())
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+        self._evict(evicted)
+
+    def _evict(self, entries) -> None:
+        # Fuera del lock: el callback puede ser lento (borrar ficheros)
+        if self.on_evict is not None:
+            for key, value in entries:
+                self.on_evict(key, value)
+
+    def info(self) -> Dict[str, int]:
+        '''
+        Returns the counters in the same spirit as `functools.lru_cache`
+        '''
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "maxsize": self.maxsize,
+            "currsize": len(self._data),
+        }
+
+
+def _canonical(obj: Any) -> Any:
+    '''
+    Converts `obj` into a structure whose `repr` is stable between reruns.
+
+    JsCode objects are reduced to their source (a new instance is created on
+    every rerun) and dataclasses (col_base, cell_style, ...) to their fields.
+    '''
+    if obj is None or isinstance(obj, (bool, int, float, str)):
+        return obj
+    js_code = getattr(obj, 'js_code', None)
+    if isinstance(js_code, str):
+        return ('JsCode', js_code)
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return (
+            type(obj).__qualname__,
+            tuple((f.name, _canonical(getattr(obj, f.name))) for f in fields(obj)),
+        )
+    if isinstance(obj, dict):
+        return ('dict', tuple(sorted(((repr(k), _canonical(v)) for k, v in obj.items()))))
+    if isinstance(obj, (list, tuple)):
+        return (type(obj).__name__, tuple(_canonical(v) for v in obj))
+    if isinstance(obj, (set, frozenset)):
+        return ('set', tuple(sorted(repr(_canonical(v)) for v in obj)))
+    return (type(obj).__qualname__, repr(obj))
+
+
+def fingerprint(*objs: Any) -> str:
+    '''
+    Returns a short hash identifying the given objects by value
+    '''
+    payload = repr(tuple(_canonical(o) for o in objs)).encode('utf-8')
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+def digest(obj: Any) -> str:
+    '''
+    Returns a short hash of a built structure (columnDefs, gridOptions)
+
+    Much cheaper than `fingerprint`: the object is pickled in C instead of
+    walked in Python. Two equal structures built the same way get the same
+    digest; objects that cannot be pickled fall back to `fingerprint`.
+    '''
+    try:
+        payload = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        return fingerprint(obj)
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+def schema_fingerprint(df: Optional[Any]) -> Any:
+    '''
+    Returns (column names, dtypes) of a dataframe, the only part of the data
+    that `GridOptionsBuilder.from_dataframe` depends on
+    '''
+    if df is None:
+        return None
+    return (
+        tuple(str(c) for c in df.columns),
+        tuple(str(t) for t in df.dtypes),
+    )
+
+
+def data_version(df: Any, columns: Optional[Any] = None) -> str:
+    '''
+    Returns a hash of the dataframe values (and index) computed with the
+    vectorized `pd.util.hash_pandas_object`
+
+    Used as part of the cache keys of everything derived from the data.
+    Columns holding unhashable cells (lists, dicts) are hashed by their
+    string representation.
+    '''
+    import pandas as pd
+
+    frame = df if columns is None else df[list(columns)]
+    try:
+        hashes = pd.util.hash_pandas_object(frame, index=True).to_numpy()
+    except TypeError:
+        hashes = pd.util.hash_pandas_object(frame.astype(str), index=True).to_numpy()
+    h = hashlib.blake2b(digest_size=16)
+    h.update(repr(schema_fingerprint(frame)).encode('utf-8'))
+    h.update(hashes.tobytes())
+    return h.hexdigest()
@@ -1,8 +1,19 @@
-from typing import Optional
-from dataclasses import dataclass
+import warnings
+from typing import Dict, Optional, Hashable, List
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
 
 from easy_st_aggrid.defaults import col_base
-from st_aggrid import JsCode
+from easy_st_aggrid.cache import LRUCache, data_version
+from easy_st_aggrid.renderers import BAR_RENDERER, BAR_RENDERER_LITE
+
+BAR_FIELD_PREFIX = '__bar_'
+
+## CACHE
+# Escala calculada por (version de datos de la columna, campo, percentil)
+max_abs_cache = LRUCache(maxsize=512)
 
 
 def _find_col_bars(cols):
@@ -13,83 +24,146 @@ def _find_col_bars(cols):
         if hasattr(c, 'children') and c.children:
             yield from _find_col_bars(c.children)
 
+def auto_scale_col_bars(
+        df: 'pd.DataFrame',
+        columns_list: List[col_base],
+        version: Optional[Hashable] = None,
+    ) -> None:
+    '''
+    Computes `max_abs` for every col_bar without an explicit value
+
+    All the pending numeric columns are scaled in a single NumPy pass and
+    each result is cached per column and data version, so the renderer is
+    only rebuilt when the data actually changes.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+    columns_list : List[col_base]
+    version : Hashable or None
+        Identifier of the whole dataframe. If None, each column is hashed.
+    '''
+    bars = [
+        c for c in _find_col_bars(columns_list)
+        if (c.max_abs is None or c._auto_scaled) and c.id in df.columns
+    ]
+    pending = dict()
+    for col in bars:
+        col_version = version if version is not None else data_version(df, [col.id])
+        cache_key = (col_version, col.id, col.clip_percentile)
+        max_abs = max_abs_cache.get(cache_key)
+        if max_abs is None:
+            pending.setdefault(cache_key, []).append(col)
+        else:
+            col._set_auto_max_abs(max_abs)
+    if not pending:
+        return
+
+    keys = list(pending)
+    values = np.column_stack([
+        pd.to_numeric(df[k[1]], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+        for k in keys
+    ])
+    values = np.abs(values)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning) # columnas todo NaN
+        scales = np.nanmax(values, axis=0) if len(values) else np.full(len(keys), np.nan)
+        for q in {k[2] for k in keys if k[2] is not None}:
+            idx = [i for i, k in enumerate(keys) if k[2] == q]
+            if len(values):
+                scales[idx] = np.nanpercentile(values[:, idx], q, axis=0)
+    scales = np.where(np.isfinite(scales) & (scales > 0), scales, 1.0)
+
+    for k, scale in zip(keys, scales.tolist()):
+        max_abs_cache.put(k, scale)
+        for col in pending[k]:
+            col._set_auto_max_abs(scale)
+
+def bar_field(field: str) -> str:
+    """Campo oculto con el porcentaje precalculado de una col_bar."""
+    return f"{BAR_FIELD_PREFIX}{field}"
+
+def bar_percent_columns(
+        df: 'pd.DataFrame',
+        columns_list: List[col_base],
+    ) -> Dict[str, np.ndarray]:
+    '''
+    Precomputed bar of every `performance` col_bar of `df`
+
+    The signed half-bar width (-50..50, in % of the track) is computed for
+    the whole column in one vectorized operation against `max_abs` and
+    shipped as a float32 field with one decimal; nulls and non-numeric
+    values give NaN (no bar).
+
+    Returns
+    -------
+    Dict[str, np.ndarray]
+        `bar_field(field)` -> percentages, for `frame.with_columns`.
+    '''
+    columns = dict()
+    for col in _find_col_bars(columns_list):
+        if not col.performance or col.max_abs is None or col.id not in df.columns:
+            continue
+        values = pd.to_numeric(df[col.id], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+        max_val = col.max_abs if col.max_abs > 0 else 1
+        pct = np.clip(values / max_val, -1, 1) * 50
+        columns[bar_field(col.id)] = np.round(pct, 1).astype(np.float32)
+    return columns
+
 @dataclass
 class col_bar(col_base):
     '''
     Diverging bar column.
+
+    Parameters
+    ----------
+    max_abs : float or None
+        Value drawn as a full half-bar. If None, `easy_table` computes it
+        from the data (maximum absolute value of the column).
+    clip_percentile : float or None
+        Percentile (0-100) of the absolute values used instead of the
+        maximum when `max_abs` is computed, to limit the effect of outliers.
+        Bars above it are drawn full.
+    performance : bool
+        Lightweight renderer for large grids: one DOM node per cell drawn
+        with a CSS gradient, and the bar width precomputed by `easy_table`
+        in a hidden `__bar_<field>` field instead of in every refresh.
     '''
     max_abs: Optional[float] = None
+    clip_percentile: Optional[float] = None
+    performance: bool = False
+    _auto_scaled: bool = field(default=False, init=False, repr=False)
 
     def __post_init__(self):
         if self.filter:
             self.filter = 'agNumberColumnFilter'
+        if self.clip_percentile is not None and not 0 < self.clip_percentile <= 100:
+            raise ValueError("clip_percentile must be in the range (0, 100].")
         if self.max_abs is not None:
             self._build_renderer()
 
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        # Un max_abs asignado por el usuario sustituye a la escala calculada
+        if name == 'max_abs' and '_auto_scaled' in self.__dict__:
+            super().__setattr__('_auto_scaled', False)
+            if value is not None:
+                self._build_renderer()
+
+    def _set_auto_max_abs(self, max_abs: float):
+        self._auto_scaled = True
+        if max_abs != self.max_abs:
+            # Sin pasar por col_bar.__setattr__: la escala sigue siendo automatica
+            col_base.__setattr__(self, 'max_abs', max_abs)
+            self._build_renderer()
+
     def _build_renderer(self):
         max_val = self.max_abs if self.max_abs and self.max_abs > 0 else 1
 
-        _BAR_RENDERER = JsCode(f"""
-            class DivergingBarRenderer {{
-                init(params) {{
-                    this.eGui = document.createElement('div');
-                    this.eGui.style.display = 'flex';
-                    this.eGui.style.alignItems = 'center';
-                    this.eGui.style.gap = '8px';
-                    this.eGui.style.width = '100%';
-                    this.eGui.style.overflow = 'hidden';
-
-                    let val = parseFloat(params.value);
-                    if (isNaN(val)) {{ this.eGui.innerHTML = params.value || ''; return; }}
-
-                    const maxAbs = {max_val};
-                    const pct = Math.min((Math.abs(val) / maxAbs) * 50, 50);
-                    const color = val >= 0 ? '#e74c3c' : '#2ecc71';
-
-                    const container = document.createElement('div');
-                    container.style.flex = '1 1 auto';
-                    container.style.minWidth = '0';
-                    container.style.position = 'relative';
-                    container.style.height = '12px';
-                    container.style.background = '#e6e6e6';
-                    container.style.borderRadius = '6px';
-                    container.style.overflow = 'hidden';
-
-                    const center = document.createElement('div');
-                    center.style.position = 'absolute';
-                    center.style.left = '50%';
-                    center.style.top = '0';
-                    center.style.width = '1px';
-                    center.style.height = '100%';
-                    center.style.background = '#999';
-                    container.appendChild(center);
-
-                    if (val !== 0) {{
-                        const bar = document.createElement('div');
-                        bar.style.position = 'absolute';
-                        bar.style.top = '0';
-                        bar.style.height = '100%';
-                        bar.style.width = pct + '%';
-                        bar.style.background = color;
-                        if (val > 0) bar.style.left = '50%';
-                        else bar.style.right = '50%';
-                        container.appendChild(bar);
-                    }}
-
-                    const label = document.createElement('span');
-                    label.style.flex = '0 0 auto';
-                    label.style.fontSize = '13px';
-                    label.style.fontWeight = '600';
-                    label.style.minWidth = '45px';
-                    label.style.textAlign = 'right';
-                    label.style.whiteSpace = 'nowrap';
-                    label.style.paddingRight = '40px';
-                    label.textContent = val.toFixed(0);
-
-                    this.eGui.appendChild(container);
-                    this.eGui.appendChild(label);
-                }}
-                getGui() {{ return this.eGui; }}
-            }}
-            """)
-        self.kwargs['cellRenderer'] = _BAR_RENDERER
\ No newline at end of file
+        # Renderer compartido (renderers.py): la columna solo lleva su escala
+        if self.performance:
+            self.kwargs['cellRenderer'] = BAR_RENDERER_LITE
+            self.kwargs['cellRendererParams'] = {"maxAbs": max_val, "pctField": bar_field(self.id)}
+        else:
+            self.kwargs['cellRenderer'] = BAR_RENDERER
+            self.kwargs['cellRendererParams'] = {"maxAbs": max_val}
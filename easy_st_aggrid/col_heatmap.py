@@ -0,0 +1,200 @@
+'''
+Heatmap column: cell background from precomputed color bins
+
+Instead of a `cellStyle` JsCode function evaluated on every cell refresh,
+the bin of every value is computed in Python with one `np.digitize` pass
+and shipped as a tiny int8 field (`__heat_<field>`, -1 = no value). The
+column only carries `cellClassRules` comparing that field, and the colors
+live in one stylesheet passed to the grid (`custom_css`), shared by every
+column with the same palette.
+
+Bins are quantiles of the whole column (computed once per data version,
+so every page of the paged row model uses the same scale) or explicit
+thresholds.
+
+Classes
+-------
+col_heatmap
+
+Functions
+---------
+heat_field
+heat_edges
+heat_bin_columns
+heatmap_css
+'''
+import warnings
+from typing import Dict, Hashable, List, Optional, Union
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from easy_st_aggrid.defaults import col_base
+from easy_st_aggrid.cache import LRUCache, data_version, fingerprint
+
+HEAT_FIELD_PREFIX = '__heat_'
+HEAT_MISSING = -1
+
+# Secuencial (azules), de menor a mayor
+DEFAULT_HEAT_COLORS = ['#f7fbff', '#c6dbef', '#6baed6', '#2171b5', '#08306b']
+
+## CACHE
+# Limites de los bins cuantiles por (version de datos de la columna, campo, numero de bins)
+heat_edges_cache = LRUCache(maxsize=512)
+
+
+def heat_field(field: str) -> str:
+    """Campo oculto con el bin precalculado de una col_heatmap."""
+    return f"{HEAT_FIELD_PREFIX}{field}"
+
+
+def _find_col_heatmaps(cols):
+    for c in cols:
+        if isinstance(c, col_heatmap):
+            yield c
+        if c.children:
+            yield from _find_col_heatmaps(c.children)
+
+
+def _numeric(series: 'pd.Series') -> np.ndarray:
+    return pd.to_numeric(series, errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+
+
+def _interpolate_colors(colors: List[str], n: int) -> List[str]:
+    '''
+    `n` colors evenly spaced along the palette (linear RGB interpolation)
+    '''
+    if len(colors) == n:
+        return list(colors)
+    rgb = np.array([[int(c.lstrip('#')[i:i + 2], 16) for i in (0, 2, 4)] for c in colors], dtype=float)
+    at = np.linspace(0, len(colors) - 1, n)
+    channels = np.column_stack([np.interp(at, np.arange(len(colors)), rgb[:, i]) for i in range(3)])
+    return ['#%02x%02x%02x' % tuple(c) for c in np.rint(channels).astype(int)]
+
+
+def _text_color(color: str) -> str:
+    # Luminancia relativa aproximada: texto blanco sobre fondos oscuros
+    r, g, b = (int(color.lstrip('#')[i:i + 2], 16) / 255 for i in (0, 2, 4))
+    return '#ffffff' if 0.2126 * r + 0.7152 * g + 0.0722 * b < 0.5 else '#212121'
+
+
+def heat_edges(
+        df: 'pd.DataFrame',
+        col: 'col_heatmap',
+        version: Optional[Hashable] = None,
+    ) -> np.ndarray:
+    '''
+    Inner bin edges of a col_heatmap: its thresholds, or the quantiles of
+    the column (cached per data version)
+    '''
+    if not isinstance(col.bins, int):
+        return np.asarray(col.bins, dtype=float)
+    col_version = version if version is not None else data_version(df, [col.id])
+    cache_key = (col_version, col.id, col.bins)
+    edges = heat_edges_cache.get(cache_key)
+    if edges is None:
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning) # columna todo NaN
+            edges = np.nanquantile(_numeric(df[col.id]), np.linspace(0, 1, col.bins + 1)[1:-1])
+        edges = heat_edges_cache.put(cache_key, edges)
+    return edges
+
+
+def heat_bin_columns(
+        df: 'pd.DataFrame',
+        columns_list: List[col_base],
+        reference: Optional['pd.DataFrame'] = None,
+        version: Optional[Hashable] = None,
+    ) -> Dict[str, np.ndarray]:
+    '''
+    Bin of every value of the col_heatmap columns of `df`
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Rows sent to the grid.
+    columns_list : List[col_base]
+    reference : pd.DataFrame or None
+        Full frame the quantiles are computed on (default `df`).
+    version : Hashable or None
+        Identifier of `reference`. If None, each column is hashed.
+
+    Returns
+    -------
+    Dict[str, np.ndarray]
+        `heat_field(field)` -> int8 bins, for `frame.with_columns`.
+    '''
+    reference = df if reference is None else reference
+    columns = dict()
+    for col in _find_col_heatmaps(columns_list):
+        if col.id not in df.columns or col.id not in reference.columns:
+            continue
+        edges = heat_edges(reference, col, version=version)
+        values = _numeric(df[col.id])
+        bins = np.digitize(values, edges) if len(edges) and not np.isnan(edges).any() \
+            else np.zeros(len(values), dtype=np.int64)
+        columns[heat_field(col.id)] = np.where(np.isnan(values), HEAT_MISSING, bins).astype(np.int8)
+    return columns
+
+
+def heatmap_css(columns_list: List[col_base]) -> Dict[str, Dict[str, str]]:
+    '''
+    Stylesheet of the col_heatmap palettes (AgGrid `custom_css` format)
+    '''
+    css = dict()
+    for col in _find_col_heatmaps(columns_list or ()):
+        for name, color in zip(col._classes, col._colors):
+            css[f".ag-cell.{name}"] = {
+                "background-color": f"{color} !important",
+                "color": f"{_text_color(color)} !important",
+            }
+    return css
+
+
+@dataclass
+class col_heatmap(col_base):
+    '''
+    Numeric column colored by bins
+
+    Parameters
+    ----------
+    bins : int or List[float]
+        Number of quantile bins of the column, or the ascending thresholds
+        between bins (n thresholds -> n + 1 bins; a value equal to a
+        threshold goes to the upper bin).
+    colors : List[str] or None
+        Hex colors from the lowest to the highest bin. Interpolated when
+        their number differs from the number of bins.
+    '''
+    bins: Union[int, List[float]] = 5
+    colors: Optional[List[str]] = None
+    _classes: List[str] = field(default_factory=list, init=False, repr=False)
+    _colors: List[str] = field(default_factory=list, init=False, repr=False)
+
+    def __post_init__(self):
+        if self.filter:
+            self.filter = 'agNumberColumnFilter'
+        if isinstance(self.bins, int):
+            if self.bins < 1:
+                raise ValueError("bins must be a positive integer.")
+            n_bins = self.bins
+        else:
+            self.bins = [float(b) for b in self.bins]
+            if sorted(self.bins) != self.bins:
+                raise ValueError("bins thresholds must be ascending.")
+            n_bins = len(self.bins) + 1
+        if n_bins > 127:
+            raise ValueError("col_heatmap supports at most 127 bins.") # bins en int8
+
+        self._colors = _interpolate_colors(self.colors or DEFAULT_HEAT_COLORS, n_bins)
+        # Clases compartidas por las columnas con la misma paleta
+        palette = fingerprint(self._colors)[:8]
+        self._classes = [f"easy-heat-{palette}-{i}" for i in range(n_bins)]
+
+        bin_field = heat_field(self.id)
+        self.kwargs = dict(self.kwargs) if self.kwargs else {}
+        self.kwargs['cellClassRules'] = {
+            name: f"data != null && data['{bin_field}'] === {i}"
+            for i, name in enumerate(self._classes)
+        }
@@ -0,0 +1,270 @@
+'''
+Sparkline column for list-valued cells (one time series per row)
+
+The series never travel as they are: `easy_table` downsamples every row
+in Python to `points` values, scales them to integers 0..100 (-1 = gap)
+and replaces the cells of the column with these short lists, drawn by one
+shared SVG renderer. Rows of the same length are processed together as a
+2D array, so both algorithms are vectorized over rows:
+
+- 'minmax': the minimum and the maximum of each bucket, in their original
+  order (keeps every peak, the usual choice for latency histories);
+- 'lttb': Largest-Triangle-Three-Buckets, one point per bucket chosen by
+  the area it forms with its neighbours (smoother shape).
+
+The downsampled cells are cached per data version.
+
+Classes
+-------
+col_sparkline
+
+Functions
+---------
+series_arrays
+minmax_downsample
+lttb_downsample
+sparkline_cells
+sparkline_columns
+'''
+import hashlib
+import warnings
+from itertools import chain
+from typing import Any, Dict, Hashable, List, Literal, Optional, Tuple
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from easy_st_aggrid.defaults import col_base
+from easy_st_aggrid.cache import LRUCache
+from easy_st_aggrid.renderers import SPARKLINE_RENDERER
+
+SPARKLINE_GAP = -1
+_CHUNK_VALUES = 4_000_000 # valores por bloque de filas (32 MB en float64)
+
+## CACHE
+# Celdas ya reducidas por (version de datos, campo, puntos, metodo, escala)
+sparkline_cache = LRUCache(maxsize=64)
+
+
+def _cell_length(value: Any) -> int:
+    if value is None or isinstance(value, (str, bytes)):
+        return 0
+    try:
+        return len(value)
+    except TypeError: # NaN, escalares
+        return 0
+
+
+def series_arrays(values: 'pd.Series') -> Tuple[np.ndarray, np.ndarray]:
+    '''
+    Flattens list-valued cells into one float array
+
+    Returns
+    -------
+    (flat, lengths): the values of every cell one after another (nulls
+    as NaN) and the length of each cell (0 for missing cells).
+    '''
+    cells = values.to_numpy(dtype=object)
+    lengths = np.fromiter(map(_cell_length, cells), dtype=np.int64, count=len(cells))
+    filled = [c for c, n in zip(cells, lengths) if n]
+    try:
+        if filled and all(isinstance(c, np.ndarray) for c in filled):
+            # Celdas numpy: copia de buffers, sin recorrer los valores en Python
+            return np.concatenate(filled).astype(float, copy=False), lengths
+        flat = np.fromiter(chain.from_iterable(filled), dtype=float, count=int(lengths.sum()))
+    except (TypeError, ValueError): # None o texto dentro de alguna serie
+        flat = np.concatenate([pd.to_numeric(pd.Series(list(c), dtype=object), errors='coerce').to_numpy(dtype=float) for c in filled]) \
+            if filled else np.empty(0)
+    return flat, lengths
+
+
+def minmax_downsample(matrix: np.ndarray, points: int) -> np.ndarray:
+    '''
+    Min/max-bucket downsampling of every row of `matrix` to at most `points` values
+    '''
+    n, length = matrix.shape
+    if length <= points:
+        return matrix
+    size = -(-length // max(points // 2, 1)) # puntos por bucket
+    buckets = -(-length // size)
+    padded = np.full((n, buckets * size), np.nan)
+    padded[:, :length] = matrix
+    padded = padded.reshape(n, buckets, size)
+    missing = np.isnan(padded)
+    lo = np.where(missing, np.inf, padded).argmin(axis=2)
+    hi = np.where(missing, -np.inf, padded).argmax(axis=2)
+    # Cada par en su orden original dentro del bucket
+    order = np.stack([np.minimum(lo, hi), np.maximum(lo, hi)], axis=2)
+    return np.take_along_axis(padded, order, axis=2).reshape(n, buckets * 2)
+
+
+def lttb_downsample(matrix: np.ndarray, points: int) -> np.ndarray:
+    '''
+    Largest-Triangle-Three-Buckets downsampling of every row of `matrix` to `points` values
+
+    The first and the last value are kept; the loop runs over the buckets
+    and each step works on all the rows at once.
+    '''
+    n, length = matrix.shape
+    if length <= points or points < 3:
+        return matrix if length <= points else matrix[:, np.linspace(0, length - 1, points).astype(np.int64)]
+    rows = np.arange(n)
+    every = (length - 2) / (points - 2)
+    out = np.empty((n, points))
+    out[:, 0], out[:, -1] = matrix[:, 0], matrix[:, -1]
+    a = np.zeros(n, dtype=np.int64) # punto elegido en el bucket anterior
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning) # buckets todo NaN
+        for i in range(points - 2):
+            start, end = int(i * every) + 1, int((i + 1) * every) + 1
+            next_start, next_end = end, min(int((i + 2) * every) + 1, length)
+            avg_x = (next_start + next_end - 1) / 2
+            avg_y = np.nanmean(matrix[:, next_start:next_end], axis=1)
+            ax, ay = a, matrix[rows, a]
+            x = np.arange(start, end)
+            area = np.abs(
+                (ax - avg_x)[:, None] * (matrix[:, start:end] - ay[:, None])
+                - (ax[:, None] - x) * (avg_y - ay)[:, None]
+            )
+            a = start + np.where(np.isnan(area), -1, area).argmax(axis=1)
+            out[:, i + 1] = matrix[rows, a]
+    return out
+
+
+def _series_version(flat: np.ndarray, lengths: np.ndarray) -> str:
+    # sha256 (acelerado por hardware) es ~2x mas rapido que blake2b con series largas
+    h = hashlib.sha256()
+    h.update(lengths.tobytes())
+    h.update(flat.tobytes())
+    return h.hexdigest()
+
+
+def _find_col_sparklines(cols):
+    for c in cols:
+        if isinstance(c, col_sparkline):
+            yield c
+        if c.children:
+            yield from _find_col_sparklines(c.children)
+
+
+def sparkline_cells(
+        values: 'pd.Series',
+        points: int = 50,
+        method: Literal["minmax", "lttb"] = 'minmax',
+        scale: Literal["row", "column"] = 'row',
+        version: Optional[Hashable] = None,
+    ) -> np.ndarray:
+    '''
+    Downsampled and scaled cells of one sparkline column
+
+    Returns an object array with one list of integers 0..100 per row
+    (`SPARKLINE_GAP` for null values, None for missing cells).
+    '''
+    flat = lengths = None
+    if version is None:
+        flat, lengths = series_arrays(values)
+        version = _series_version(flat, lengths)
+    cache_key = (version, values.name, points, method, scale)
+    cells = sparkline_cache.get(cache_key)
+    if cells is not None:
+        return cells
+    if flat is None:
+        flat, lengths = series_arrays(values)
+
+    downsample = lttb_downsample if method == 'lttb' else minmax_downsample
+    starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+    groups = []
+    for length in np.unique(lengths[lengths > 0]):
+        same = np.flatnonzero(lengths == length)
+        step = max(1, _CHUNK_VALUES // int(length))
+        for i in range(0, len(same), step):
+            rows = same[i:i + step]
+            matrix = flat[starts[rows][:, None] + np.arange(length)]
+            groups.append((rows, downsample(matrix, points)))
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning) # filas todo NaN
+        if scale == 'column' and groups:
+            lo = np.nanmin([np.nanmin(m) for _, m in groups])
+            hi = np.nanmax([np.nanmax(m) for _, m in groups])
+        cells = np.full(len(values), None, dtype=object)
+        for rows, matrix in groups:
+            if scale != 'column':
+                lo = np.nanmin(matrix, axis=1, keepdims=True)
+                hi = np.nanmax(matrix, axis=1, keepdims=True)
+            span = np.where(hi > lo, hi - lo, np.nan)
+            scaled = np.where(np.isfinite(span), (matrix - lo) / span * 100, 50) # serie plana: al centro
+            scaled = np.where(np.isnan(matrix), SPARKLINE_GAP, np.rint(scaled)).astype(np.int16)
+            for row, cell in zip(rows.tolist(), scaled.tolist()):
+                cells[row] = cell
+    return sparkline_cache.put(cache_key, cells)
+
+
+def sparkline_columns(
+        df: 'pd.DataFrame',
+        columns_list: List[col_base],
+        version: Optional[Hashable] = None,
+    ) -> Dict[str, np.ndarray]:
+    '''
+    Downsampled cells of every col_sparkline of `df`
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Rows sent to the grid.
+    columns_list : List[col_base]
+    version : Hashable or None
+        Identifier of the rows of `df`. If None, each series column is hashed.
+
+    Returns
+    -------
+    Dict[str, np.ndarray]
+        field -> cells, for `frame.with_columns`.
+    '''
+    return {
+        col.id: sparkline_cells(df[col.id], col.points, col.method, col.scale, version=version)
+        for col in _find_col_sparklines(columns_list)
+        if col.id in df.columns
+    }
+
+
+@dataclass
+class col_sparkline(col_base):
+    '''
+    Sparkline column: draws the list of numbers of each cell as a line
+
+    Parameters
+    ----------
+    points : int
+        Maximum number of values sent per row.
+    method : "minmax" or "lttb"
+        Downsampling algorithm (see the module docstring).
+    scale : "row" or "column"
+        Vertical range of each line: its own minimum and maximum, or the
+        ones of the whole column (lines comparable between rows).
+    color : str
+    line_width : float
+        Stroke width in pixels.
+    '''
+    points: int = 50
+    method: Literal["minmax", "lttb"] = 'minmax'
+    scale: Literal["row", "column"] = 'row'
+    color: str = '#3498db'
+    line_width: float = 1.5
+
+    def __post_init__(self):
+        if self.points < 2:
+            raise ValueError("points must be at least 2.")
+        if self.method not in ('minmax', 'lttb'):
+            raise ValueError(f"Unknown method: {self.method!r}")
+        if self.scale not in ('row', 'column'):
+            raise ValueError(f"Unknown scale: {self.scale!r}")
+        # Una lista no se filtra ni se ordena
+        self.filter = False
+        self.kwargs = dict(self.kwargs) if self.kwargs else {}
+        self.kwargs.setdefault('sortable', False)
+        self.kwargs.update({
+            "cellRenderer": SPARKLINE_RENDERER,
+            "cellRendererParams": {"color": self.color, "lineWidth": self.line_width},
+        })
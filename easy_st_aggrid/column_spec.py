@@ -0,0 +1,170 @@
+'''
+Compiled column configuration for `easy_table`
+
+`compile_columns(columns_list)` builds the columnDefs tree once (one
+`col_base.data()` walk) together with the field -> path index and the
+flattened export order, and memoizes the result at two levels:
+
+- by identity: the same column objects, unchanged, get the compiled spec
+  back without any walk. A column changes when one of its attributes is
+  assigned (`col_base` versions every assignment) or when keys are added
+  to / removed from its `kwargs` or `children`.
+- by content: a tree rebuilt on each rerun pays one `data()` walk and a
+  pickled digest of the result, and shares the spec already compiled for
+  an equal tree.
+
+Changes inside a nested object (a value of `kwargs` replaced in place, a
+`cell_style` edited after the column was built) are not seen: assign the
+attribute again to recompile.
+
+Classes
+-------
+ColumnSpec
+
+Functions
+---------
+compile_columns
+is_helper_field
+'''
+import copy
+from typing import Any, Dict, Iterable, List, Tuple
+
+from easy_st_aggrid.defaults import col_base
+from easy_st_aggrid.cache import LRUCache, digest
+from easy_st_aggrid.col_bar import BAR_FIELD_PREFIX
+from easy_st_aggrid.col_heatmap import HEAT_FIELD_PREFIX
+from easy_st_aggrid.datasource import GROUP_COUNT_FIELD
+from easy_st_aggrid.delta import ROW_ID_FIELD
+from easy_st_aggrid.tree import TREE_PATH_FIELD
+
+# Campos auxiliares que easy_table anade al frame enviado (nunca columnas del usuario)
+HELPER_FIELDS = frozenset({ROW_ID_FIELD, TREE_PATH_FIELD, GROUP_COUNT_FIELD})
+HELPER_PREFIXES = (BAR_FIELD_PREFIX, HEAT_FIELD_PREFIX)
+
+
+def is_helper_field(field: Any) -> bool:
+    '''
+    True if `field` is one of the helper fields easy_table injects
+    '''
+    field = str(field)
+    return field in HELPER_FIELDS or field.startswith(HELPER_PREFIXES)
+
+
+## CACHE
+# Specs compiladas por digest de los columnDefs construidos
+spec_cache = LRUCache(maxsize=64)
+# Specs por identidad y version de las columnas (sin recorrer el arbol)
+tree_cache = LRUCache(maxsize=64)
+
+
+def _tree_key(columns_list: List[col_base]) -> Tuple:
+    '''
+    Identity of a columns tree: object, version and size of `kwargs` and
+    `children` of every column
+
+    The cached spec keeps the columns alive, so their `id` is not reused
+    while the entry exists.
+    '''
+    return tuple(
+        (
+            id(col),
+            getattr(col, '_version', 0),
+            len(col.kwargs) if col.kwargs else 0,
+            _tree_key(col.children) if col.children else None,
+        )
+        for col in columns_list
+    )
+
+
+class ColumnSpec:
+    '''
+    columnDefs compiled from a list of `col_base`
+
+    Attributes
+    ----------
+    columns_list : List[col_base]
+    column_defs : List[Dict]
+        Result of `col.data()` for every top-level column. Shared between
+        calls: copy it before mutating.
+    paths : Dict[str, Tuple[int, ...]]
+        Position of each field in the tree (indexes through `children`).
+    fields : List[str]
+        Configured fields in visual order (export order).
+    fingerprint : str
+        Digest of the compiled columnDefs, usable as cache key.
+    token : Tuple
+        Identity of the columns it was compiled from (see `is_stale`).
+    '''
+    def __init__(self, columns_list: List[col_base], exclude_prefix: str = "__", column_defs: List[Dict] = None):
+        self.columns_list = list(columns_list)
+        self.token = _tree_key(self.columns_list)
+        self.column_defs = column_defs if column_defs is not None else [col.data() for col in self.columns_list]
+        self.paths: Dict[str, Tuple[int, ...]] = dict()
+        self.fields: List[str] = []
+        self._index(self.column_defs, (), exclude_prefix)
+        self._field_set = set(self.fields)
+        self.fingerprint = digest(self.column_defs)
+
+    def _index(self, column_defs: List[Dict[str, Any]], path: Tuple[int, ...], exclude_prefix: str):
+        for i, col in enumerate(column_defs):
+            if "children" in col:
+                self._index(col["children"], path + (i,), exclude_prefix)
+                continue
+            field = col.get("field")
+            if field and not field.startswith(exclude_prefix):
+                self.paths[field] = path + (i,)
+                self.fields.append(field)
+
+    @property
+    def is_stale(self) -> bool:
+        '''
+        True if a column of the tree changed after compiling
+        '''
+        return _tree_key(self.columns_list) != self.token
+
+    def get(self, field: str) -> Dict[str, Any]:
+        '''
+        Returns the columnDef of a field
+        '''
+        path = self.paths[field]
+        col = self.column_defs[path[0]]
+        for i in path[1:]:
+            col = col["children"][i]
+        return col
+
+    def extra_columns(self, df_columns: Iterable[str]) -> List[str]:
+        '''
+        Dataframe columns not configured in the spec (easy_table helper fields excluded)
+        '''
+        return [
+            c for c in df_columns
+            if c not in self._field_set and not is_helper_field(c)
+        ]
+
+    def export_fields(self, df_columns: Iterable[str]) -> List[str]:
+        '''
+        Export order: configured fields, then the unconfigured dataframe columns
+        '''
+        return self.fields + self.extra_columns(df_columns)
+
+
+def compile_columns(columns_list: List[col_base]) -> ColumnSpec:
+    '''
+    Returns the (memoized) compiled spec of a columns list
+    '''
+    token = _tree_key(columns_list)
+    spec = tree_cache.get(token)
+    if spec is not None:
+        return spec
+
+    column_defs = [col.data() for col in columns_list]
+    spec = spec_cache.get(digest(column_defs))
+    if spec is None:
+        spec = ColumnSpec(columns_list, column_defs=column_defs)
+        spec_cache.put(spec.fingerprint, spec)
+    else:
+        # Mismo contenido, otros objetos: la spec servida apunta a las columnas del llamante
+        spec = copy.copy(spec)
+        spec.columns_list = list(columns_list)
+        spec.token = token
+    return tree_cache.put(token, spec)
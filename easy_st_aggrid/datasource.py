@@ -0,0 +1,432 @@
+'''
+Python-side row models for `easy_table`
+
+Only a window of the dataframe is sent to the browser; the rest stays in
+the Python process and is served block by block.
+
+A `ChunkedSource` goes the other way: the data arrives as an iterator of
+dataframe chunks (a SQL cursor, `pd.read_csv(..., chunksize=...)`) and the
+table is rendered with the rows loaded so far while the rest is read.
+
+Classes
+-------
+DataFrameSource
+GroupedSource
+ChunkedSource
+
+Functions
+---------
+page_selector
+group_path_selector
+expand_group
+chunked_source
+'''
+import time
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from easy_st_aggrid.cache import LRUCache, data_version
+from easy_st_aggrid.frame import shallow_copy
+
+## CACHE
+# Bloques de vistas filtradas/ordenadas servidos recientemente (clave: version de
+# datos, vista, tamaño, bloque). Son copias compactas (take): no retienen el frame completo
+block_cache = LRUCache(maxsize=256)
+
+
+class DataFrameSource:
+    '''
+    Serves fixed-size row blocks of a dataframe
+
+    Blocks of the full frame are positional slices (`iloc`), views that
+    never copy it. Blocks of a `positions` view are taken row by row and
+    the most recently used ones are kept in `block_cache`. Every call
+    returns a new (shallow) frame object: AgGrid modifies the frame it
+    receives, and a cached block must be served unchanged on the next rerun.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+    block_size : int
+        Number of rows per block.
+    version : Hashable or None
+        Identifier of the data. Computed with `data_version` if not given.
+    positions : np.ndarray or None
+        Rows of `df` served, in this order (e.g. the filtered and sorted
+        positions of `filters.filtered_positions`). None = every row.
+    view : Hashable or None
+        Identifier of `positions` in the block cache.
+
+    Methods
+    -------
+    block
+    block_bounds
+    block_positions
+    '''
+    def __init__(
+            self,
+            df: 'pd.DataFrame',
+            block_size: int = 1000,
+            version: Optional[Hashable] = None,
+            positions: Optional['np.ndarray'] = None,
+            view: Optional[Hashable] = None,
+        ):
+        if block_size < 1:
+            raise ValueError("block_size must be a positive integer.")
+        self.df = df
+        self.block_size = block_size
+        self._version = version
+        self.positions = positions
+        self.view = view
+
+    @property
+    def version(self) -> Hashable:
+        if self._version is None:
+            self._version = data_version(self.df)
+        return self._version
+
+    @property
+    def row_count(self) -> int:
+        return len(self.df) if self.positions is None else len(self.positions)
+
+    @property
+    def block_count(self) -> int:
+        return max(1, -(-self.row_count // self.block_size))
+
+    def block_bounds(self, block: int) -> tuple:
+        '''
+        Returns the (start, end) row positions of a block
+        '''
+        start = block * self.block_size
+        return start, min(start + self.block_size, self.row_count)
+
+    def block_positions(self, block: int) -> 'np.ndarray':
+        '''
+        Returns the positions in the full frame of the rows of a block
+        '''
+        start, end = self.block_bounds(block)
+        if self.positions is None:
+            return np.arange(start, end)
+        return self.positions[start:end]
+
+    def block(self, block: int) -> 'pd.DataFrame':
+        '''
+        Returns the rows of a block (0-based)
+        '''
+        if not 0 <= block < self.block_count:
+            raise IndexError(f"Block {block} out of range (0..{self.block_count - 1}).")
+        if self.positions is None:
+            # Un slice es inmediato: no se cachea (la vista retendria el frame completo)
+            start, end = self.block_bounds(block)
+            return shallow_copy(self.df.iloc[start:end])
+        key = (self.version, self.view, self.block_size, block)
+        rows = block_cache.get(key)
+        if rows is None:
+            # Solo se copian las filas del bloque, nunca la vista completa
+            rows = block_cache.put(key, self.df.take(self.block_positions(block)))
+        return shallow_copy(rows)
+
+
+def page_selector(source: DataFrameSource, key: Optional[str] = None) -> int:
+    '''
+    Streamlit control to move through the blocks of a source
+
+    Returns the selected block (0-based).
+    '''
+    import streamlit as st
+
+    widget_key = f"{key or 'easy_table'}__page"
+    if source.block_count == 1:
+        st.session_state.pop(widget_key, None)
+        return 0
+    # Valor solo por session_state (value= y session_state a la vez hace avisar a Streamlit).
+    # Si los datos encogen, la pagina guardada puede quedar fuera de rango
+    if st.session_state.get(widget_key, 1) > source.block_count:
+        st.session_state[widget_key] = source.block_count
+    elif widget_key not in st.session_state:
+        st.session_state[widget_key] = 1
+
+    col_page, col_info = st.columns([1, 4])
+    with col_page:
+        page = st.number_input(
+            'Página',
+            min_value=1,
+            max_value=source.block_count,
+            step=1,
+            key=widget_key,
+        )
+    block = int(page) - 1
+    start, end = source.block_bounds(block)
+    with col_info:
+        st.caption(f"Filas {start + 1:,} - {end:,} de {source.row_count:,}")
+    return block
+
+
+## GROUPED ROW MODEL
+# Posiciones de las filas de cada grupo y filas de grupo ya agregadas
+group_positions_cache = LRUCache(maxsize=256)
+group_rows_cache = LRUCache(maxsize=256)
+
+# Nombre reservado (como __path__ / __row_id__): no choca con columnas ni agregados
+GROUP_COUNT_FIELD = '__count__'
+
+# Nombres de aggFunc de AG Grid -> pandas
+_AGG_FUNCS = {
+    'sum': 'sum',
+    'avg': 'mean',
+    'min': 'min',
+    'max': 'max',
+    'count': 'count',
+    'first': 'first',
+    'last': 'last',
+}
+
+
+class GroupedSource:
+    '''
+    Row groups computed in Python with pandas `groupby`
+
+    Only one level is materialized at a time: the groups of the level under
+    `path` (with their row count and aggregates), or the leaf rows once the
+    path covers every group column. Row positions of every expanded group
+    and the aggregated group rows are cached per data version.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+    group_by : List[str]
+        Group columns, outermost first.
+    aggs : Dict[str, str]
+        AG Grid aggFunc ('sum', 'avg', 'min', 'max', 'count', 'first', 'last')
+        of each value column.
+    version : Hashable or None
+        Identifier of the data. Computed with `data_version` if not given.
+
+    Methods
+    -------
+    positions
+    groups
+    leaves
+    '''
+    def __init__(
+            self,
+            df: 'pd.DataFrame',
+            group_by: List[str],
+            aggs: Optional[Dict[str, str]] = None,
+            version: Optional[Hashable] = None,
+        ):
+        if not group_by:
+            raise ValueError("GroupedSource requires at least one group column.")
+        self.df = df
+        self.group_by = list(group_by)
+        self.aggs = {
+            c: _AGG_FUNCS[f] for c, f in (aggs or {}).items()
+            if f in _AGG_FUNCS and c in df.columns and c not in self.group_by
+        }
+        self._version = version
+
+    @property
+    def version(self) -> Hashable:
+        if self._version is None:
+            self._version = data_version(self.df)
+        return self._version
+
+    def is_leaf(self, path: Tuple) -> bool:
+        return len(path) >= len(self.group_by)
+
+    def positions(self, path: Tuple) -> 'np.ndarray':
+        '''
+        Positions of the rows under a group path (vectorized, cached per level)
+        '''
+        if not path:
+            return np.arange(len(self.df))
+        key = (self.version, tuple(self.group_by), path)
+        positions = group_positions_cache.get(key)
+        if positions is None:
+            parent = self.positions(path[:-1])
+            values = self.df[self.group_by[len(path) - 1]].to_numpy()[parent]
+            value = path[-1]
+            mask = pd.isna(values) if pd.isna(value) else (values == value)
+            positions = group_positions_cache.put(key, parent[mask])
+        return positions
+
+    def groups(self, path: Tuple = ()) -> 'pd.DataFrame':
+        '''
+        Group rows of the level under `path`: group value, row count and aggregates
+        '''
+        key = (self.version, tuple(self.group_by), tuple(sorted(self.aggs.items())), path)
+        rows = group_rows_cache.get(key)
+        if rows is None:
+            column = self.group_by[len(path)]
+            subset = self.df.take(self.positions(path))
+            grouped = subset.groupby(column, dropna=False, sort=True, observed=True)
+            rows = grouped.size().rename(GROUP_COUNT_FIELD).to_frame()
+            if self.aggs:
+                rows = rows.join(grouped.agg(self.aggs))
+            rows = group_rows_cache.put(key, rows.reset_index())
+        return shallow_copy(rows) # la grid modifica el frame recibido
+
+    def leaves(self, path: Tuple) -> 'pd.DataFrame':
+        '''
+        Leaf rows of a fully expanded path
+        '''
+        return self.df.take(self.positions(path))
+
+
+def group_path_selector(source: GroupedSource, key: Optional[str] = None) -> Tuple:
+    '''
+    Streamlit breadcrumb of the expanded groups
+
+    Returns the current group path (one value per expanded level).
+    '''
+    import streamlit as st
+
+    state_key = f"{key or 'easy_table'}__group_path"
+    path = tuple(st.session_state.get(state_key, ()))[:len(source.group_by)]
+
+    labels = ['Todos'] + [f"{c}: {v}" for c, v in zip(source.group_by, path)]
+    cols = st.columns(len(labels) + 1)
+    for level, (col, label) in enumerate(zip(cols, labels)):
+        with col:
+            if st.button(label, key=f"{state_key}__{level}", disabled=level == len(path)):
+                path = path[:level]
+                st.session_state[state_key] = path
+                st.rerun()
+    return path
+
+
+def expand_group(source: GroupedSource, path: Tuple, value, key: Optional[str] = None) -> None:
+    '''
+    Opens the group `value` under `path` (takes effect on the next rerun)
+    '''
+    import streamlit as st
+
+    st.session_state[f"{key or 'easy_table'}__group_path"] = tuple(path) + (value,)
+
+
+## CHUNKED SOURCE
+class ChunkedSource:
+    '''
+    Dataframe built progressively from an iterator of chunks
+
+    Every `load_batch()` reads one batch and returns all the rows loaded so
+    far. The first batch is only the first chunk, so something is shown
+    right away. The following batches read at least `batch_rows` rows, and
+    at least as many rows as are already loaded, so the number of batches
+    grows only logarithmically with the data. A batch also ends after
+    `max_seconds`.
+
+    Parameters
+    ----------
+    chunks : Iterable[pd.DataFrame]
+        Chunks with the same columns (anything accepted by `pd.DataFrame`).
+    batch_rows : int
+    max_seconds : float
+    version : Hashable or None
+        Identifier of the data the chunks come from.
+
+    Methods
+    -------
+    load_batch
+    close
+    '''
+    def __init__(
+            self,
+            chunks: Iterable[Any],
+            batch_rows: int = 50_000,
+            max_seconds: float = 1.0,
+            version: Optional[Hashable] = None,
+        ):
+        self.chunks = chunks
+        self.batch_rows = batch_rows
+        self.max_seconds = max_seconds
+        self.version = version
+        self.frame: Optional['pd.DataFrame'] = None
+        self.exhausted = False
+        self.batches = 0
+        self._iterator = iter(chunks)
+
+    @property
+    def row_count(self) -> int:
+        return 0 if self.frame is None else len(self.frame)
+
+    def load_batch(self) -> 'pd.DataFrame':
+        '''
+        Reads the next batch of chunks and returns every row loaded so far
+        '''
+        if self.exhausted:
+            return self.frame
+        target = max(self.batch_rows, self.row_count)
+        start = time.perf_counter()
+        new, rows = [], 0
+        while True:
+            try:
+                chunk = next(self._iterator)
+            except StopIteration:
+                self.close()
+                break
+            if not isinstance(chunk, pd.DataFrame):
+                chunk = pd.DataFrame(chunk)
+            new.append(chunk)
+            rows += len(chunk)
+            # Primer lote = primer chunk: mostrar datos cuanto antes
+            if self.frame is None or rows >= target or time.perf_counter() - start >= self.max_seconds:
+                break
+
+        if new:
+            frames = new if self.frame is None else [self.frame] + new
+            # Chunks con RangeIndex (p.ej. un cursor SQL) reinician en 0: renumerar
+            ignore_index = all(isinstance(f.index, pd.RangeIndex) for f in frames)
+            self.frame = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=ignore_index)
+            self.batches += 1
+        if self.frame is None:
+            self.frame = pd.DataFrame()
+        return self.frame
+
+    def close(self) -> None:
+        '''
+        Stops reading (closes the iterator when it supports it)
+        '''
+        self.exhausted = True
+        close = getattr(self._iterator, 'close', None)
+        if callable(close):
+            close()
+
+
+def chunked_source(
+        chunks: Iterable[Any],
+        key: Optional[str] = None,
+        version: Optional[Hashable] = None,
+        batch_rows: int = 50_000,
+    ) -> ChunkedSource:
+    '''
+    Returns the `ChunkedSource` of a table, kept in `st.session_state`
+
+    Every rerun of the script creates a new iterator: the one of the first
+    run is kept (and the new ones closed) while `version` does not change,
+    so the loading goes on where the previous rerun stopped. Pass a new
+    `version` to read the data again. Without a `version` the iterator
+    object itself identifies the data: pass the same object on every rerun
+    (e.g. from `st.cache_resource`), a different one starts the loading again.
+
+    The source is stored under `key`, which is required: two tables without
+    a key would share (and consume) the same iterator.
+    '''
+    import streamlit as st
+
+    if key is None:
+        raise ValueError("chunked sources require a key")
+    state_key = f"{key}__chunks"
+    source = st.session_state.get(state_key)
+    if source is None or source.version != version or (version is None and chunks is not source.chunks):
+        if source is not None:
+            source.close()
+        source = ChunkedSource(chunks, batch_rows=batch_rows, version=version)
+        st.session_state[state_key] = source
+    elif chunks is not source.chunks:
+        close = getattr(chunks, 'close', None)
+        if callable(close):
+            close()
+    return source
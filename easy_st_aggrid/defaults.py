@@ -10,12 +10,7 @@
 
 from typing import Optional, Union, List, Tuple, Dict, Any, Literal, TYPE_CHECKING
 from dataclasses import dataclass, asdict, field
-
-# from typing import TYPE_CHECKING
-# if TYPE_CHECKING:
-import pandas as pd
-
-from easy_st_aggrid import *
+from itertools import count
 
 @dataclass
 class cell_style:
@@ -50,6 +45,9 @@ class cell_style:
             cell_dict['background-color'] = cell_dict.pop('background_color')
         return cell_dict
 
+# Version global de las columnas: cada asignacion de atributo toma un numero nuevo
+_column_versions = count(1)
+
 default_cell = cell_style(
     fontSize=14,
 )
@@ -86,6 +84,10 @@ class col_base:
     Methods
     -------
     data
+
+    Every attribute assignment gives the column a new `_version`, so a
+    compiled configuration (see `compile_columns`) notices the change
+    without walking the column again.
     '''
     id: Optional[str] = None
     alias: Optional[str] = None
@@ -111,6 +113,13 @@ class col_base:
     # enableValue: bool = False           # Permite al usuario cambiar la aggregation desde el sidebar
 
     kwargs: Optional[Dict[str, Any]] = field(default_factory=dict)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        # Reasignar el mismo objeto (p.ej. el auto-escalado de col_bar en cada rerun) no es un cambio
+        unchanged = name in self.__dict__ and self.__dict__[name] is value
+        object.__setattr__(self, name, value)
+        if not unchanged:
+            object.__setattr__(self, '_version', next(_column_versions))
     
     def data(self) -> Dict[str, Any]:
         '''
@@ -265,6 +274,7 @@ class col_bool(col_base):
         }}
         """
 
+        from st_aggrid import JsCode # diferido: importar defaults no carga st_aggrid
         self.kwargs["cellRenderer"] = JsCode(js_renderer)
 
         # Centrado
@@ -0,0 +1,179 @@
+'''
+Stable row ids and row deltas between reruns
+
+With `easy_table(..., row_id=...)` every row gets a stable id (a key
+column, or a vectorized hash of the dataframe index) exposed to AG Grid
+through `getRowId`. The grid then applies new row data as a transaction
+against the rows it already has: only added, removed and changed rows are
+re-rendered and the scroll position and selection are kept.
+
+The delta against the previous render is also computed in Python
+(vectorized row hashes with `pd.util.hash_pandas_object`) and stored in
+`st.session_state[f"{key}__row_delta"]`. Ids and hashes are cached per
+data version.
+
+Classes
+-------
+row_delta
+
+Functions
+---------
+index_ids
+row_ids
+row_hashes
+compute_row_delta
+use_row_ids
+'''
+from dataclasses import dataclass, field
+from typing import Any, Dict, Hashable, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from st_aggrid import JsCode
+
+from easy_st_aggrid.cache import LRUCache
+from easy_st_aggrid.frame import with_columns
+
+ROW_ID_FIELD = '__row_id__'
+
+## CACHE
+# (campo de id, ids derivados, hashes de filas) por (version, row_id, con hashes)
+row_ids_cache = LRUCache(maxsize=64)
+
+ROW_ID_GETTER = JsCode("""
+    function(params) {
+        return String(params.data[(params.context || {}).easyRowId]);
+    }
+""")
+
+
+@dataclass
+class row_delta:
+    '''
+    Rows that changed between two renders (as row ids)
+
+    Parameters
+    ----------
+    added : np.ndarray
+    changed : np.ndarray
+    removed : np.ndarray
+    '''
+    added: np.ndarray = field(default_factory=lambda: np.empty(0))
+    changed: np.ndarray = field(default_factory=lambda: np.empty(0))
+    removed: np.ndarray = field(default_factory=lambda: np.empty(0))
+
+    @property
+    def empty(self) -> bool:
+        return not (len(self.added) or len(self.changed) or len(self.removed))
+
+
+def index_ids(index: 'pd.Index') -> np.ndarray:
+    '''
+    Vectorized hash of index labels, truncated to 53 bits so JS numbers keep
+    them exact
+    '''
+    hashes = pd.util.hash_pandas_object(index, index=False).to_numpy()
+    return (hashes >> np.uint64(11)).astype(np.int64)
+
+
+def row_ids(df: 'pd.DataFrame', row_id: Union[str, bool, np.ndarray]) -> Tuple[str, Optional[np.ndarray]]:
+    '''
+    Returns (id field, new id values)
+
+    A column name is used as is (it must be unique). `True` derives the ids
+    from the dataframe index (`index_ids`). An array gives the ids directly
+    (e.g. row positions).
+    '''
+    if isinstance(row_id, np.ndarray):
+        return ROW_ID_FIELD, row_id
+    if isinstance(row_id, str):
+        if row_id not in df.columns:
+            raise KeyError(f"row_id column not found: {row_id!r}")
+        if not df[row_id].is_unique:
+            raise ValueError(f"row_id column {row_id!r} has duplicated values.")
+        return row_id, None
+    if not df.index.is_unique:
+        raise ValueError("row_id=True requires a dataframe index without duplicated labels.")
+    return ROW_ID_FIELD, index_ids(df.index)
+
+
+def row_hashes(df: 'pd.DataFrame') -> np.ndarray:
+    '''
+    Content hash of every row (vectorized)
+    '''
+    try:
+        return pd.util.hash_pandas_object(df, index=False).to_numpy()
+    except TypeError: # celdas no hashables (listas, dicts)
+        return pd.util.hash_pandas_object(df.astype(str), index=False).to_numpy()
+
+
+def compute_row_delta(
+        previous: Optional[Tuple[np.ndarray, np.ndarray]],
+        ids: np.ndarray,
+        hashes: np.ndarray,
+    ) -> row_delta:
+    '''
+    Compares (ids, hashes) snapshots with index lookups, without Python loops
+    '''
+    if previous is None:
+        return row_delta(added=ids)
+    prev_ids, prev_hashes = previous
+    prev_index = pd.Index(prev_ids)
+    pos = prev_index.get_indexer(ids)
+    existing = pos >= 0
+    changed = existing.copy()
+    changed[existing] = prev_hashes[pos[existing]] != hashes[existing]
+    removed = ~prev_index.isin(ids)
+    return row_delta(
+        added=ids[~existing],
+        changed=ids[changed],
+        removed=np.asarray(prev_ids)[removed],
+    )
+
+
+def use_row_ids(
+        grid_options: Dict[str, Any],
+        df: 'pd.DataFrame',
+        row_id: Union[str, bool, np.ndarray],
+        key: Optional[str] = None,
+        version: Optional[Hashable] = None,
+    ) -> Tuple['pd.DataFrame', Optional[row_delta]]:
+    '''
+    Sets `getRowId` and, when the table has a key, computes the delta
+    against the previous render
+
+    `version` identifies the data of `df`: the ids and row hashes are then
+    computed once per version (explicit id arrays are never cached).
+
+    Returns the frame to send (with the `__row_id__` column when the ids are
+    derived) and the delta (None without key).
+    '''
+    cache_key = None
+    if version is not None and not isinstance(row_id, np.ndarray):
+        cache_key = (version, row_id, key is not None)
+    cached = row_ids_cache.get(cache_key) if cache_key is not None else None
+    if cached is None:
+        id_field, new_ids = row_ids(df, row_id)
+        # Hash del contenido antes de anadir la columna de ids
+        hashes = row_hashes(df) if key is not None else None
+        if cache_key is not None:
+            row_ids_cache.put(cache_key, (id_field, new_ids, hashes))
+    else:
+        id_field, new_ids, hashes = cached
+    if new_ids is not None:
+        df = with_columns(df, {id_field: new_ids})
+
+    grid_options.setdefault("context", {})["easyRowId"] = id_field
+    grid_options["getRowId"] = ROW_ID_GETTER
+
+    if key is None:
+        return df, None
+
+    import streamlit as st
+
+    ids = df[id_field].to_numpy()
+    snapshot_key = f"{key}__row_snapshot"
+    delta = compute_row_delta(st.session_state.get(snapshot_key), ids, hashes)
+    st.session_state[snapshot_key] = (ids, hashes)
+    st.session_state[f"{key}__row_delta"] = delta
+    return df, delta
@@ -0,0 +1,315 @@
+'''
+Python-side export of `easy_table` data to xlsx / CSV
+
+The browser export of AG Grid builds the whole file in the tab, which runs
+out of memory with multi-million-row frames. These functions write the file
+from the dataframe instead, in row chunks, with the same columns as the
+grid export: configured fields in visual order followed by the unconfigured
+ones (`ColumnSpec.export_fields`), the `alias` of each column as header, and
+the `stringType` columns (`col_text`) written as text.
+
+Only one chunk is materialized at a time: CSV chunks are appended to the
+file, and xlsx rows are flushed to disk by xlsxwriter's `constant_memory`
+mode. Frames longer than the Excel row limit continue on new sheets.
+
+`export_button` builds the file only when it is clicked. Exported files
+are temporary files reused while the data does not change, and deleted
+when they leave `export_cache` (and at interpreter exit).
+
+The xlsx format requires the optional dependency `xlsxwriter`.
+
+Classes
+-------
+export_column
+
+Functions
+---------
+export_columns
+write_csv
+write_xlsx
+export_file
+export_button
+'''
+import atexit
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import Any, BinaryIO, Dict, Hashable, List, Literal, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from easy_st_aggrid.cache import LRUCache, data_version, fingerprint
+from easy_st_aggrid.column_spec import ColumnSpec, compile_columns
+from easy_st_aggrid.defaults import col_base
+
+EXCEL_MAX_ROWS = 1_048_576
+
+
+def _remove_file(key: Hashable, path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+## CACHE
+# Ficheros ya exportados (clave: version de datos, columnas, formato); se borran al salir de la cache
+export_cache = LRUCache(maxsize=16, on_evict=_remove_file)
+atexit.register(export_cache.clear)
+
+
+@dataclass
+class export_column:
+    '''
+    One exported column
+
+    Parameters
+    ----------
+    field : str
+    header : str
+        `headerName` of the column (its alias), or the field.
+    text : bool
+        Column with the `stringType` cell class: always exported as text.
+    '''
+    field: str
+    header: str
+    text: bool = False
+
+
+def _is_string_type(col: Dict[str, Any]) -> bool:
+    cell_class = col.get('cellClass')
+    if isinstance(cell_class, (list, tuple)):
+        return 'stringType' in cell_class
+    return cell_class == 'stringType'
+
+
+def export_columns(
+        df: 'pd.DataFrame',
+        columns_list: Union[List[col_base], ColumnSpec, None] = None,
+    ) -> List[export_column]:
+    '''
+    Returns the exported columns in the order of the grid export
+    '''
+    if not columns_list:
+        return [export_column(str(c), str(c)) for c in df.columns if not str(c).startswith('__')]
+    spec = columns_list if isinstance(columns_list, ColumnSpec) else compile_columns(columns_list)
+    columns = []
+    for field in spec.export_fields(df.columns):
+        if field not in df.columns:
+            continue
+        col = spec.get(field) if field in spec.paths else {}
+        columns.append(export_column(field, col.get('headerName') or field, _is_string_type(col)))
+    return columns
+
+
+def _chunk_values(chunk: 'pd.DataFrame', columns: List[export_column]) -> List[List[Any]]:
+    '''
+    Rows of a chunk as Python values accepted by xlsxwriter (nulls -> None)
+    '''
+    data = []
+    for col in columns:
+        series = chunk[col.field]
+        if col.text:
+            values = series.astype(str).to_numpy(dtype=object)
+        elif pd.api.types.is_datetime64_any_dtype(series.dtype):
+            if getattr(series.dt, 'tz', None) is not None:
+                series = series.dt.tz_localize(None)
+            values = series.astype(object).to_numpy() # Timestamp es un datetime
+        elif pd.api.types.is_bool_dtype(series.dtype) or pd.api.types.is_numeric_dtype(series.dtype):
+            values = series.to_numpy(dtype=object)
+        else:
+            values = series.to_numpy(dtype=object)
+            values = np.array([v if isinstance(v, (str, int, float, bool)) else str(v) for v in values], dtype=object)
+        nulls = series.isna().to_numpy()
+        if nulls.any():
+            values = values.copy()
+            values[nulls] = None
+        data.append(values)
+    return np.column_stack(data).tolist() if data else []
+
+
+def write_csv(
+        df: 'pd.DataFrame',
+        path: str,
+        columns_list: Union[List[col_base], ColumnSpec, None] = None,
+        chunk_size: int = 100_000,
+        sep: str = ',',
+        encoding: str = 'utf-8-sig',
+    ) -> str:
+    '''
+    Writes the export columns of `df` as CSV, `chunk_size` rows at a time
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+    path : str
+    columns_list : List[col_base], ColumnSpec or None
+        Columns configuration of the table (order and headers).
+    chunk_size : int
+    sep : str
+    encoding : str
+        'utf-8-sig' by default, so Excel detects the encoding.
+    '''
+    columns = export_columns(df, columns_list)
+    fields = [c.field for c in columns]
+    with open(path, 'w', encoding=encoding, newline='') as f:
+        pd.DataFrame(columns=[c.header for c in columns]).to_csv(f, sep=sep, index=False)
+        for start in range(0, len(df), chunk_size):
+            df.iloc[start:start + chunk_size][fields].to_csv(f, sep=sep, index=False, header=False)
+    return path
+
+
+def write_xlsx(
+        df: 'pd.DataFrame',
+        path: str,
+        columns_list: Union[List[col_base], ColumnSpec, None] = None,
+        chunk_size: int = 50_000,
+        sheet_name: str = 'Datos',
+    ) -> str:
+    '''
+    Writes the export columns of `df` as xlsx, `chunk_size` rows at a time
+
+    Rows are streamed to disk (xlsxwriter `constant_memory`); after
+    1,048,575 data rows a new sheet is started with the same headers.
+    `stringType` columns get a text ('@') format.
+    '''
+    try:
+        import xlsxwriter
+    except ImportError as e:
+        raise ImportError(
+            "xlsx export requires xlsxwriter: pip install xlsxwriter"
+        ) from e
+
+    columns = export_columns(df, columns_list)
+    fields = [c.field for c in columns]
+    workbook = xlsxwriter.Workbook(path, {
+        'constant_memory': True,
+        'default_date_format': 'yyyy-mm-dd hh:mm:ss',
+        'nan_inf_to_errors': True,
+    })
+    header_format = workbook.add_format({'bold': True})
+    text_format = workbook.add_format({'num_format': '@'})
+    rows_per_sheet = EXCEL_MAX_ROWS - 1
+
+    def new_sheet(n: int):
+        sheet = workbook.add_worksheet(sheet_name if n == 0 else f"{sheet_name} ({n + 1})")
+        for i, col in enumerate(columns):
+            if col.text:
+                sheet.set_column(i, i, None, text_format)
+        sheet.write_row(0, 0, [c.header for c in columns], header_format)
+        return sheet
+
+    try:
+        sheet, sheet_n, row = new_sheet(0), 0, 1
+        for start in range(0, len(df), chunk_size):
+            rows = _chunk_values(df.iloc[start:start + chunk_size][fields], columns)
+            for values in rows:
+                if row > rows_per_sheet:
+                    sheet_n += 1
+                    sheet, row = new_sheet(sheet_n), 1
+                sheet.write_row(row, 0, values)
+                row += 1
+    finally:
+        workbook.close()
+    return path
+
+
+def export_file(
+        df: 'pd.DataFrame',
+        columns_list: Union[List[col_base], ColumnSpec, None] = None,
+        file_format: Literal["xlsx", "csv"] = 'xlsx',
+        version: Optional[Hashable] = None,
+        chunk_size: Optional[int] = None,
+    ) -> str:
+    '''
+    Exports `df` to a temporary file and returns its path
+
+    The file is reused while the data (`version`, computed from the values
+    if not given) and the columns configuration do not change, and deleted
+    when evicted from `export_cache`.
+    '''
+    if file_format not in ('xlsx', 'csv'):
+        raise ValueError(f"Unknown file_format: {file_format!r}")
+    spec = compile_columns(columns_list) if columns_list and not isinstance(columns_list, ColumnSpec) else columns_list
+    if version is None:
+        version = data_version(df)
+    cache_key = fingerprint(version, spec.fingerprint if spec else list(df.columns), file_format)
+    path = export_cache.get(cache_key)
+    if path is not None and os.path.exists(path):
+        return path
+
+    # Nombre unico: solo se publica en la cache una vez escrito por completo
+    fd, path = tempfile.mkstemp(prefix='easy_table_', suffix=f".{file_format}")
+    os.close(fd)
+    writer = write_xlsx if file_format == 'xlsx' else write_csv
+    kwargs = {} if chunk_size is None else {'chunk_size': chunk_size}
+    try:
+        writer(df, path, columns_list=spec, **kwargs)
+    except BaseException:
+        _remove_file(cache_key, path)
+        raise
+    return export_cache.put(cache_key, path)
+
+
+def export_button(
+        df: 'pd.DataFrame',
+        columns_list: Union[List[col_base], ColumnSpec, None] = None,
+        file_format: Literal["xlsx", "csv"] = 'xlsx',
+        file_name: Optional[str] = None,
+        label: str = 'Exportar',
+        key: Optional[str] = None,
+        version: Optional[Hashable] = None,
+        chunk_size: Optional[int] = None,
+    ) -> bool:
+    '''
+    Streamlit download button with the Python-side export of `df`
+
+    Nothing is exported (or hashed) while rendering: the file is built, or
+    reused from `export_cache`, when the button is clicked.
+
+    The file is written in chunks, but Streamlit serves downloads from its
+    in-memory media storage: on click the whole file is read once into the
+    server memory (no extra copy is made here). For files too large for
+    that, call `export_file` and serve the returned path by other means.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Same dataframe passed to `easy_table`.
+    columns_list : List[col_base], ColumnSpec or None
+        Same `columns_list` passed to `easy_table`.
+    file_format : "xlsx" or "csv"
+    file_name : str or None
+    label : str
+    key : str or None
+    version : Hashable or None
+        Identifier of the data (e.g. the `data_version` of `easy_table`).
+        Without it the values are hashed on each click.
+    chunk_size : int or None
+
+    Returns
+    -------
+    True if the button was clicked.
+    '''
+    import streamlit as st
+
+    if file_format not in ('xlsx', 'csv'):
+        raise ValueError(f"Unknown file_format: {file_format!r}")
+
+    def build() -> BinaryIO:
+        # Streamlit la ejecuta al pulsar el boton, fuera del script, y lee el fichero una sola vez
+        path = export_file(df, columns_list, file_format=file_format, version=version, chunk_size=chunk_size)
+        return open(path, 'rb')
+
+    mime = (
+        'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+        if file_format == 'xlsx' else 'text/csv'
+    )
+    return st.download_button(
+        label=label,
+        data=build,
+        file_name=file_name or f"export.{file_format}",
+        mime=mime,
+        key=key,
+    )
@@ -0,0 +1,364 @@
+'''
+Python-side support for the AG Grid column filters
+
+Set filters (`agSetColumnFilter`: `col_str_date`, `col_status`, ...) get
+their distinct values computed in Python with vectorized pandas calls and
+cached per data version, so the browser does not scan every row each time
+a filter menu opens.
+
+When only part of the data lives in the browser (`row_model='paged'`),
+the filterModel and sortModel of the grid state are pushed down to the
+Python frame: every column filter is compiled once into a vectorized
+predicate (boolean mask over a Series) and the sort into a stable
+multi-column sort. The resulting row positions are cached per data
+version and filter state.
+
+Functions
+---------
+set_filter_values
+use_set_filter_values
+grid_models
+compile_column_filter
+filter_mask
+filtered_positions
+'''
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from st_aggrid import JsCode
+
+from easy_st_aggrid.cache import LRUCache, data_version, fingerprint
+
+## CACHE
+# Valores distintos por (version de datos, campo, con conteos)
+set_filter_cache = LRUCache(maxsize=256)
+# Predicados compilados por modelo de filtro de columna
+predicate_cache = LRUCache(maxsize=256)
+# Posiciones filtradas y ordenadas por (version de datos, filterModel, sortModel)
+filtered_positions_cache = LRUCache(maxsize=64)
+
+# Muestra "valor (n)" en la lista del filtro usando los conteos del context
+SET_FILTER_COUNT_RENDERER = JsCode("""
+    function(params) {
+        const label = params.valueFormatted ?? params.value ?? '(Blanks)';
+        const counts = ((params.context || {}).easySetCounts || {})[params.colDef && params.colDef.field] || {};
+        const n = counts[String(params.value)];
+        return n === undefined ? label : label + ' (' + n + ')';
+    }
+""")
+
+
+def _json_value(value: Any) -> Any:
+    if value is None or (not isinstance(value, (list, tuple)) and pd.isna(value)):
+        return None
+    if hasattr(value, 'item'):
+        return value.item()
+    return value
+
+
+def _js_key(value: Any) -> str:
+    '''
+    Same text as `String(value)` in JS, used as key of the counts map
+    '''
+    if value is None:
+        return 'null'
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def set_filter_values(
+        series: 'pd.Series',
+        counts: bool = False,
+    ) -> Tuple[List[Any], Optional[Dict[str, int]]]:
+    '''
+    Distinct values of a column (sorted, blanks last) and optionally the
+    number of rows of each one
+
+    Uses `value_counts` / `unique`, both hash-based and vectorized.
+    '''
+    if counts:
+        vc = series.value_counts(dropna=False, sort=False)
+        uniques = vc.index
+    else:
+        vc = None
+        uniques = pd.Index(series.unique())
+
+    not_null = uniques[~pd.isna(uniques)]
+    try:
+        ordered = not_null.sort_values()
+    except TypeError: # tipos mezclados
+        ordered = not_null[pd.Index(not_null.astype(str)).argsort()]
+
+    values = [_json_value(v) for v in ordered]
+    if len(not_null) < len(uniques):
+        values.append(None)
+    if vc is None:
+        return values, None
+    return values, {_js_key(_json_value(k)): int(n) for k, n in vc.items()}
+
+
+def _set_filter_columns(column_defs: List[Dict[str, Any]]):
+    for col in column_defs:
+        if col.get('children'):
+            yield from _set_filter_columns(col['children'])
+        elif col.get('filter') == 'agSetColumnFilter' and col.get('field'):
+            yield col
+
+
+def use_set_filter_values(
+        grid_options: Dict[str, Any],
+        df: 'pd.DataFrame',
+        version: Optional[Hashable] = None,
+        counts: bool = False,
+        max_values: int = 10_000,
+    ) -> None:
+    '''
+    Sets `filterParams.values` of every set-filter column of gridOptions
+
+    Parameters
+    ----------
+    grid_options : Dict[str, Any]
+    df : pd.DataFrame
+        Full data (not only the rows sent to the browser).
+    version : Hashable or None
+        Identifier of the data. If None, each column is hashed.
+    counts : bool
+        Also show the number of rows of each value in the filter list.
+    max_values : int
+        Columns with more distinct values keep the client-side list.
+    '''
+    for col in _set_filter_columns(grid_options.get('columnDefs', [])):
+        field = col['field']
+        if field not in df.columns or pd.api.types.is_datetime64_any_dtype(df[field].dtype):
+            continue
+        col_version = version if version is not None else data_version(df, [field])
+        cache_key = (col_version, field, counts)
+        cached = set_filter_cache.get(cache_key)
+        if cached is None:
+            cached = set_filter_cache.put(cache_key, set_filter_values(df[field], counts=counts))
+        values, value_counts = cached
+        if len(values) > max_values:
+            continue
+
+        filter_params = dict(col.get('filterParams') or {})
+        filter_params['values'] = values
+        if value_counts is not None:
+            filter_params.setdefault('cellRenderer', SET_FILTER_COUNT_RENDERER)
+            grid_options.setdefault('context', {}).setdefault('easySetCounts', {})[field] = value_counts
+        col['filterParams'] = filter_params
+
+
+## FILTER / SORT PUSHDOWN
+Predicate = Callable[['pd.Series'], np.ndarray]
+
+
+def grid_models(state: Any) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    '''
+    Returns (filterModel, sortModel) from the value of the grid component
+    (`st.session_state[key]`, an AgGrid response or its gridState)
+    '''
+    if state is None:
+        return {}, []
+    if not isinstance(state, dict):
+        state = getattr(state, 'grid_response', None) or {}
+    grid_state = state.get('gridState', state) or {}
+    filter_model = (grid_state.get('filter') or {}).get('filterModel') or {}
+    sort_model = (grid_state.get('sort') or {}).get('sortModel') or []
+    return filter_model, sort_model
+
+
+def _blank(series: 'pd.Series') -> np.ndarray:
+    mask = series.isna().to_numpy()
+    if pd.api.types.is_object_dtype(series.dtype) or pd.api.types.is_string_dtype(series.dtype):
+        mask |= (series.astype(str) == '').to_numpy()
+    return mask
+
+
+def _text(series: 'pd.Series') -> 'pd.Series':
+    return series.astype(str).str.lower()
+
+
+def _as_numbers(series: 'pd.Series') -> 'pd.Series':
+    if pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype):
+        return series
+    return pd.to_numeric(series, errors='coerce')
+
+
+def _as_dates(series: 'pd.Series') -> 'pd.Series':
+    if pd.api.types.is_datetime64_any_dtype(series.dtype):
+        return series.dt.tz_localize(None) if getattr(series.dt, 'tz', None) is not None else series
+    return pd.to_datetime(series, errors='coerce')
+
+
+def _text_condition(model: Dict[str, Any]) -> Predicate:
+    kind = model.get('type', 'contains')
+    value = str(model.get('filter') or '').lower()
+    if kind == 'blank':
+        return _blank
+    if kind == 'notBlank':
+        return lambda s: ~_blank(s)
+    ops = {
+        'contains': lambda t: t.str.contains(value, regex=False),
+        'notContains': lambda t: ~t.str.contains(value, regex=False),
+        'equals': lambda t: t == value,
+        'notEqual': lambda t: t != value,
+        'startsWith': lambda t: t.str.startswith(value),
+        'endsWith': lambda t: t.str.endswith(value),
+    }
+    op = ops.get(kind)
+    if op is None:
+        raise ValueError(f"Unknown text filter type: {kind!r}")
+    # Los nulos solo pasan los filtros negativos (igual que AG Grid)
+    negative = kind in ('notContains', 'notEqual')
+    return lambda s: np.where(s.isna().to_numpy(), negative, op(_text(s)).to_numpy(dtype=bool))
+
+
+def _range_condition(model: Dict[str, Any], convert: Callable, parse: Callable) -> Predicate:
+    kind = model.get('type', 'equals')
+    if kind == 'blank':
+        return lambda s: convert(s).isna().to_numpy()
+    if kind == 'notBlank':
+        return lambda s: convert(s).notna().to_numpy()
+    lo = parse(model.get('filter', model.get('dateFrom')))
+    hi = parse(model.get('filterTo', model.get('dateTo')))
+    ops = {
+        'equals': lambda v: v == lo,
+        'notEqual': lambda v: v != lo,
+        'lessThan': lambda v: v < lo,
+        'lessThanOrEqual': lambda v: v <= lo,
+        'greaterThan': lambda v: v > lo,
+        'greaterThanOrEqual': lambda v: v >= lo,
+        'inRange': lambda v: (v > lo) & (v < hi),
+    }
+    op = ops.get(kind)
+    if op is None:
+        raise ValueError(f"Unknown filter type: {kind!r}")
+    negative = kind == 'notEqual'
+
+    def predicate(s):
+        values = convert(s)
+        return np.where(values.isna().to_numpy(), negative, op(values).to_numpy(dtype=bool))
+    return predicate
+
+
+def _date_condition(model: Dict[str, Any]) -> Predicate:
+    # AG Grid compara fechas a nivel de dia
+    return _range_condition(
+        model,
+        lambda s: _as_dates(s).dt.normalize(),
+        lambda v: None if v is None else pd.Timestamp(v).normalize(),
+    )
+
+
+def _set_condition(model: Dict[str, Any]) -> Predicate:
+    values = model.get('values') or []
+    wanted = {v for v in values if v is not None}
+    blanks = None in values
+
+    def predicate(s):
+        # Claves JS de los valores distintos (no de cada fila) y lookup por codigo
+        codes, uniques = pd.factorize(s, use_na_sentinel=True)
+        keys = np.array([_js_key(_json_value(u)) in wanted for u in uniques] + [blanks], dtype=bool)
+        return keys[codes] # codigo -1 (nulo) -> ultima posicion = blanks
+    return predicate
+
+
+_CONDITIONS = {
+    'text': _text_condition,
+    'number': lambda m: _range_condition(m, _as_numbers, lambda v: None if v is None else float(v)),
+    'date': _date_condition,
+    'set': _set_condition,
+}
+
+
+def compile_column_filter(model: Dict[str, Any]) -> Predicate:
+    '''
+    Compiles the filter model of one column into a vectorized predicate
+
+    Supports the text, number, date and set filters, with combined
+    conditions (`operator` + `conditions`, or the older `condition1` /
+    `condition2`). Compiled predicates are cached by model.
+    '''
+    cache_key = fingerprint(model)
+    predicate = predicate_cache.get(cache_key)
+    if predicate is not None:
+        return predicate
+
+    conditions = model.get('conditions')
+    if conditions is None and 'condition1' in model:
+        conditions = [c for c in (model.get('condition1'), model.get('condition2')) if c]
+    if conditions:
+        parts = [compile_column_filter(dict(c, filterType=c.get('filterType', model.get('filterType')))) for c in conditions]
+        combine = np.logical_or if model.get('operator', 'AND').upper() == 'OR' else np.logical_and
+
+        def predicate(s):
+            mask = parts[0](s)
+            for part in parts[1:]:
+                mask = combine(mask, part(s))
+            return mask
+    else:
+        filter_type = model.get('filterType', 'text')
+        if filter_type not in _CONDITIONS:
+            raise ValueError(f"Unsupported filterType: {filter_type!r}")
+        predicate = _CONDITIONS[filter_type](model)
+    return predicate_cache.put(cache_key, predicate)
+
+
+def filter_mask(df: 'pd.DataFrame', filter_model: Dict[str, Any]) -> Optional[np.ndarray]:
+    '''
+    Boolean mask of the rows that pass every column filter (None = all)
+
+    Filters of columns not present in `df` are ignored.
+    '''
+    mask = None
+    for col_id, model in filter_model.items():
+        if col_id not in df.columns or not model:
+            continue
+        col_mask = compile_column_filter(model)(df[col_id])
+        mask = col_mask if mask is None else mask & col_mask
+    return mask
+
+
+def filtered_positions(
+        df: 'pd.DataFrame',
+        filter_model: Dict[str, Any],
+        sort_model: List[Dict[str, Any]],
+        version: Optional[Hashable] = None,
+    ) -> Optional[np.ndarray]:
+    '''
+    Positions of the rows of `df` that pass the filters, in sort order
+
+    Returns None when there is nothing to filter or sort (every row, in
+    the original order). Cached per data version and models.
+    '''
+    sort_model = [s for s in sort_model if s.get('colId') in df.columns and s.get('sort') in ('asc', 'desc')]
+    filter_model = {c: m for c, m in filter_model.items() if c in df.columns and m}
+    if not filter_model and not sort_model:
+        return None
+    if version is None:
+        version = data_version(df)
+    cache_key = (version, fingerprint(filter_model), fingerprint(sort_model))
+    positions = filtered_positions_cache.get(cache_key)
+    if positions is not None:
+        return positions
+
+    mask = filter_mask(df, filter_model)
+    positions = np.arange(len(df)) if mask is None else np.flatnonzero(mask)
+    if sort_model:
+        subset = df[[s['colId'] for s in sort_model]].take(positions).reset_index(drop=True)
+        # Una pasada estable por clave, de la ultima a la primera: cada clave con sus nulos
+        # en su lado (AG Grid: primero en ascendente, ultimo en descendente)
+        order = np.arange(len(subset))
+        for s in reversed(sort_model):
+            ascending = s['sort'] == 'asc'
+            order = subset[s['colId']].take(order).sort_values(
+                ascending=ascending,
+                kind='stable',
+                na_position='first' if ascending else 'last',
+            ).index.to_numpy()
+        positions = positions[order]
+    return filtered_positions_cache.put(cache_key, positions)
@@ -0,0 +1,40 @@
+'''
+Dataframe helpers shared by the `easy_table` transformations
+
+Functions
+---------
+with_columns
+shallow_copy
+'''
+from typing import Any, Dict
+
+import pandas as pd
+
+
+def with_columns(df: 'pd.DataFrame', columns: Dict[str, Any]) -> 'pd.DataFrame':
+    '''
+    Returns a new frame where `columns` replace (or are added to) the
+    columns of `df`
+
+    The untouched columns share their buffers with `df` (the result is
+    built unconsolidated), so only the transformed columns are allocated
+    and neither `df` nor the caller's frame is modified.
+    '''
+    data = {c: df[c] for c in df.columns}
+    data.update(columns)
+    return pd.DataFrame(data, index=df.index, columns=list(data), copy=False)
+
+
+def shallow_copy(df: 'pd.DataFrame') -> 'pd.DataFrame':
+    '''
+    Returns a new frame object sharing the column buffers of `df`
+
+    AgGrid modifies the frame it receives (adds `::auto_unique_id::`,
+    converts datetime columns to ISO strings): frames kept in a cache are
+    only handed out through a shallow copy, so those changes never reach
+    the cached object. pandas < 2 may write into the shared buffers on
+    `__setitem__`, so it gets a deep copy.
+    '''
+    if int(pd.__version__.split('.')[0]) < 2:
+        return df.copy()
+    return df.copy(deep=False)
@@ -0,0 +1,194 @@
+'''
+Opt-in timing and payload instrumentation for `easy_table`
+
+Each call to `easy_table` can report a `table_metrics` object with the
+duration of every phase and the size of what is sent to the browser,
+either to a callback (`easy_table(..., on_metrics=callback)`) or to every
+table rendered inside a `capture_metrics()` block:
+
+    with capture_metrics() as metrics:
+        easy_table(df, columns_list=cols)
+    metrics[0].spans  # {'copy': 0.001, 'grid_options': 0.02, ...}
+
+Without a callback or an active capture the tracer is a no-op.
+
+Classes
+-------
+table_metrics
+
+Functions
+---------
+capture_metrics
+start_trace
+'''
+import json
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+
+@dataclass
+class table_metrics:
+    '''
+    Metrics of one `easy_table` call
+
+    Parameters
+    ----------
+    key : str or None
+        `key` of the table.
+    spans : Dict[str, float]
+        Seconds spent in each phase, in execution order.
+    grid_options_cache_hit : bool or None
+    rows : int
+    columns : int
+    grid_options_bytes : int or None
+        Size of the serialized gridOptions (None if payload sizes are off).
+    row_payload_bytes : int or None
+        Size of the rows as st_aggrid sends them (Arrow buffer or JSON
+        records, see the `transport` of easy_table).
+    jscode_blocks : int or None
+        Number of JsCode objects in gridOptions.
+    rows_added, rows_changed, rows_removed : int or None
+        Row delta against the previous render (tables with `row_id` and `key`).
+    '''
+    key: Optional[str] = None
+    spans: Dict[str, float] = field(default_factory=dict)
+    grid_options_cache_hit: Optional[bool] = None
+    rows: int = 0
+    columns: int = 0
+    grid_options_bytes: Optional[int] = None
+    row_payload_bytes: Optional[int] = None
+    jscode_blocks: Optional[int] = None
+    rows_added: Optional[int] = None
+    rows_changed: Optional[int] = None
+    rows_removed: Optional[int] = None
+
+    @property
+    def total(self) -> float:
+        return sum(self.spans.values())
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {k: v for k, v in self.__dict__.items() if k != 'spans'}
+        data.update({f"span_{k}": v for k, v in self.spans.items()})
+        data['total'] = self.total
+        return data
+
+
+_ACTIVE_CAPTURE: ContextVar[Optional[tuple]] = ContextVar('easy_table_metrics', default=None)
+
+
+@contextmanager
+def capture_metrics(payload: bool = True) -> Iterator[List[table_metrics]]:
+    '''
+    Collects the metrics of every `easy_table` rendered inside the block
+
+    Parameters
+    ----------
+    payload : bool
+        Also serialize gridOptions and rows to report their byte size
+        (costs one extra encoding of the data).
+    '''
+    records: List[table_metrics] = []
+    token = _ACTIVE_CAPTURE.set((records, payload))
+    try:
+        yield records
+    finally:
+        _ACTIVE_CAPTURE.reset(token)
+
+
+class _Tracer:
+    '''
+    Measures consecutive phases: `lap(name)` closes the phase that started
+    at the previous lap
+    '''
+    enabled = True
+
+    def __init__(self, key: Optional[str], sinks: List[Callable[[table_metrics], None]], payload: bool):
+        self.metrics = table_metrics(key=key)
+        self.payload = payload
+        self._sinks = sinks
+        self._last = time.perf_counter()
+
+    def lap(self, name: str) -> None:
+        now = time.perf_counter()
+        self.metrics.spans[name] = self.metrics.spans.get(name, 0.0) + now - self._last
+        self._last = now
+
+    def restart(self) -> None:
+        '''
+        Discards the time elapsed since the last lap
+        '''
+        self._last = time.perf_counter()
+
+    def measure_payload(self, grid_options: Dict[str, Any], df: Any, transport: str = 'auto') -> None:
+        self.metrics.rows, self.metrics.columns = df.shape
+        if not self.payload:
+            return
+        jscode_blocks = 0
+
+        def default(obj):
+            nonlocal jscode_blocks
+            js_code = getattr(obj, 'js_code', None)
+            if isinstance(js_code, str):
+                jscode_blocks += 1
+                return js_code
+            if isinstance(obj, dict):
+                return dict(obj)
+            return str(obj)
+
+        self.metrics.grid_options_bytes = len(json.dumps(grid_options, default=default).encode('utf-8'))
+        self.metrics.jscode_blocks = jscode_blocks
+        from easy_st_aggrid.transport import row_payload_bytes
+        self.metrics.row_payload_bytes = row_payload_bytes(df, transport)
+
+    def finish(self) -> table_metrics:
+        for sink in self._sinks:
+            sink(self.metrics)
+        return self.metrics
+
+
+class _NullTracer:
+    enabled = False
+    payload = False
+
+    def lap(self, name: str) -> None:
+        pass
+
+    def restart(self) -> None:
+        pass
+
+    def measure_payload(self, grid_options: Dict[str, Any], df: Any, transport: str = 'auto') -> None:
+        pass
+
+    def finish(self) -> None:
+        return None
+
+
+_NULL_TRACER = _NullTracer()
+
+
+def start_trace(
+        key: Optional[str] = None,
+        callback: Optional[Callable[[table_metrics], None]] = None,
+    ):
+    '''
+    Returns the tracer for one `easy_table` call (a no-op one when nobody
+    is listening)
+
+    Payload sizes are measured for callbacks and for captures opened with
+    `payload=True`.
+    '''
+    sinks = []
+    payload = callback is not None
+    if callback is not None:
+        sinks.append(callback)
+    capture = _ACTIVE_CAPTURE.get()
+    if capture is not None:
+        records, capture_payload = capture
+        sinks.append(records.append)
+        payload = payload or capture_payload
+    if not sinks:
+        return _NULL_TRACER
+    return _Tracer(key, sinks, payload)
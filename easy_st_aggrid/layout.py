@@ -0,0 +1,132 @@
+'''
+Column layout computed in Python for wide tables
+
+With hundreds of columns the browser pays twice: every column is rendered
+for every row when column virtualisation is off, and the autosize pass
+measures the text of every column. `use_column_layout` turns column
+virtualisation on above a column-count threshold and can set the initial
+width of every column from its header and a string-length quantile of a
+row sample, so the grid needs no autosize pass.
+
+Functions
+---------
+estimate_widths
+use_column_layout
+'''
+from typing import Any, Dict, Hashable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from easy_st_aggrid.cache import LRUCache, data_version
+
+## CACHE
+# Anchos estimados por (version de la muestra, campos, parametros)
+width_cache = LRUCache(maxsize=64)
+
+
+def _leaf_columns(column_defs: List[Dict[str, Any]]):
+    for col in column_defs:
+        if col.get('children'):
+            yield from _leaf_columns(col['children'])
+        else:
+            yield col
+
+
+def estimate_widths(
+        df: 'pd.DataFrame',
+        headers: Dict[str, str],
+        sample_rows: int = 1000,
+        quantile: float = 0.9,
+        char_px: float = 8.0,
+        header_char_px: float = 9.0,
+        padding: int = 48,
+        min_width: int = 60,
+        max_width: int = 400,
+        version: Optional[Hashable] = None,
+    ) -> Dict[str, int]:
+    '''
+    Width in pixels of each column of `headers` (field -> header text)
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+    headers : Dict[str, str]
+    sample_rows : int
+        Rows read, evenly spaced over the frame.
+    quantile : float
+        Quantile of the text length of the cells used as content width
+        (ignores the few very long values).
+    char_px, header_char_px : float
+        Average width of a cell / header (bold) character.
+    padding : int
+        Cell padding plus the header menu and sort icons.
+    min_width, max_width : int
+    version : Hashable or None
+        Identifier of the data. If None, the sample is hashed.
+    '''
+    fields = [f for f in headers if f in df.columns]
+    n = len(df)
+    positions = np.unique(np.linspace(0, n - 1, min(n, sample_rows)).astype(np.int64)) if n else np.empty(0, np.int64)
+    sample = df[fields].take(positions)
+    if version is None:
+        version = data_version(sample)
+    cache_key = (version, tuple(headers.items()), sample_rows, quantile, char_px, header_char_px, padding, min_width, max_width)
+    widths = width_cache.get(cache_key)
+    if widths is not None:
+        return widths
+
+    header_px = np.array([len(str(headers[f])) for f in fields], dtype=float) * header_char_px
+    content_px = np.zeros(len(fields))
+    if len(sample):
+        for i, field in enumerate(fields):
+            series = sample[field]
+            # Sin escribir en el array: con pandas 3 to_numpy() devuelve una vista de solo lectura
+            lengths = np.where(series.isna().to_numpy(), 0.0, series.astype(str).str.len().to_numpy(dtype=float))
+            content_px[i] = np.quantile(lengths, quantile) * char_px
+    px = np.clip(np.maximum(header_px, content_px) + padding, min_width, max_width)
+    return width_cache.put(cache_key, dict(zip(fields, np.rint(px).astype(int).tolist())))
+
+
+def use_column_layout(
+        grid_options: Dict[str, Any],
+        df: 'pd.DataFrame',
+        virtualisation_threshold: Optional[int] = None,
+        estimate: bool = False,
+        version: Optional[Hashable] = None,
+    ) -> bool:
+    '''
+    Applies column virtualisation and the estimated widths to gridOptions
+
+    Parameters
+    ----------
+    grid_options : Dict[str, Any]
+    df : pd.DataFrame
+    virtualisation_threshold : int or None
+        Column virtualisation is turned on when the grid has more leaf
+        columns than this. None keeps it always off.
+    estimate : bool
+        Set the `width` of the columns without an explicit one (see
+        `estimate_widths`).
+    version : Hashable or None
+
+    Returns
+    -------
+    True if column virtualisation was turned on (the columns must then keep
+    their widths: fitting them all to the view renders every column again).
+    '''
+    leaves = list(_leaf_columns(grid_options.get('columnDefs', [])))
+    virtualised = virtualisation_threshold is not None and len(leaves) > virtualisation_threshold
+    if virtualised:
+        grid_options['suppressColumnVirtualisation'] = False
+
+    if not estimate:
+        return virtualised
+    # Las columnas con width propio (col_base(width=...), checkbox) se respetan
+    pending = [c for c in leaves if c.get('field') in df.columns and c.get('width') is None]
+    headers = {c['field']: c.get('headerName') or c['field'] for c in pending}
+    widths = estimate_widths(df, headers, version=version)
+    for col in pending:
+        col['width'] = widths[col['field']]
+        col['suppressSizeToFit'] = True
+    return virtualised
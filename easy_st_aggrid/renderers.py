@@ -0,0 +1,512 @@
+'''
+Shared cell renderers for the custom columns
+
+Each renderer is registered once in the gridOptions `components` and the
+columns only reference it by name, carrying their own compact parameters
+in `cellRendererParams` (state map, max_abs, icon size...).
+In the browser the classes are also kept in `window.__easy_renderers__`, so
+they are evaluated once per page even with several grids.
+
+Functions
+---------
+collect_components
+'''
+import json
+from typing import Any, Dict, List
+
+from st_aggrid import JsCode
+
+
+def _shared(name: str, js_class: str) -> JsCode:
+    '''
+    Wraps a JS class so it is defined only once per page
+    '''
+    return JsCode(f"""
+        (function() {{
+            const lib = window.__easy_renderers__ = window.__easy_renderers__ || {{}};
+            if (!lib.{name}) {{
+                lib.{name} = {js_class};
+            }}
+            return lib.{name};
+        }})()
+    """)
+
+
+## STATUS
+_STATUS_CSS = """
+.status-badge {
+    display:inline-flex;
+    align-items:center;
+    gap:8px;
+    padding:4px 10px;
+    border-radius:12px;
+    font-weight:600;
+    font-size:12px;
+    background:var(--status-bg);
+    color:var(--status-color);
+}
+
+.status-dot {
+    position:relative;
+    width:8px;
+    height:8px;
+    flex-shrink:0;
+}
+
+.status-dot::before {
+    content:'';
+    position:absolute;
+    width:8px;
+    height:8px;
+    border-radius:50%;
+    top:0;
+    left:0;
+    background:var(--status-color);
+}
+
+.status-dot::after {
+    content:'';
+    position:absolute;
+    top:-3px;
+    left:-3px;
+    width:14px;
+    height:14px;
+    border-radius:50%;
+    opacity:0;
+    border:1.5px solid var(--status-color);
+    animation: status_pulse 2s ease-out infinite;
+}
+
+@keyframes status_pulse {
+    0% { opacity:.6; transform:scale(.7); }
+    100% { opacity:0; transform:scale(2); }
+}
+"""
+
+STATUS_RENDERER = 'easyStatusRenderer'
+
+_STATUS_RENDERER = _shared(STATUS_RENDERER, f"""
+    class StatusRenderer {{
+        init(params) {{
+            const map = params.map || {{}};
+            const val = String(params.value ?? "");
+            const entry = map[val];
+
+            this.eGui = document.createElement('span');
+            if (!entry) {{
+                return;
+            }}
+
+            // Inyectar CSS una sola vez
+            if (!window.__status_css__) {{
+                const style = document.createElement('style');
+                style.innerHTML = {json.dumps(_STATUS_CSS)};
+                document.head.appendChild(style);
+                window.__status_css__ = true;
+            }}
+
+            this.eGui.className = "status-badge";
+            this.eGui.style.cssText = '--status-color:' + entry.color + ';--status-bg:' + entry.background + ';';
+
+            const txt = document.createElement('span');
+            txt.textContent = entry.label;
+
+            const dot = document.createElement('div');
+            dot.className = "status-dot";
+
+            this.eGui.appendChild(txt);
+            this.eGui.appendChild(dot);
+        }}
+
+        getGui() {{
+            return this.eGui;
+        }}
+    }}
+""")
+
+# Formatter para celdas y filtro: lee el mapa de cellRendererParams de la columna
+STATUS_VALUE_FORMATTER = JsCode("""
+    function(params) {
+        const map = (params.colDef && params.colDef.cellRendererParams || {}).map || {};
+        const entry = map[String(params.value ?? "")];
+        return entry ? entry.label : "";
+    }
+""")
+
+
+## ICON
+ICON_RENDERER = 'easyIconRenderer'
+
+_ICON_RENDERER = _shared(ICON_RENDERER, """
+    class IconStatusRenderer {
+        init(params) {
+            const map = params.map || {};
+            const fallbackColor = params.fallbackColor;
+            const fallbackIcon = params.fallbackIcon;
+            const baseIconSize = params.iconSize;
+            const filled = !!params.filled;
+
+            if (!document.getElementById('_mat_sym_link')) {
+                const link = document.createElement('link');
+                link.id = '_mat_sym_link';
+                link.rel = 'stylesheet';
+                link.href = 'https://fonts.googleapis.com/css2?family=Material+Symbols+Outlined:opsz,wght,FILL,GRAD@20..48,100..700,0..1,-50..200';
+                document.head.appendChild(link);
+            }
+
+            const val = String(params.value ?? "").trim();
+            const uid = 'is_' + Math.random().toString(36).substr(2, 9);
+            const cfg = map[val] || { color: fallbackColor, label: val, icon: fallbackIcon };
+            const color = cfg.color;
+            const materialIcon = cfg.icon;
+
+            const rh = (params.node && params.node.rowHeight) || 35;
+            const wrapSize = Math.max(18, Math.floor(rh * 0.72));
+            const dynIconSize = Math.max(12, Math.min(baseIconSize, wrapSize - 6));
+            const codeFontSize = Math.max(9, Math.min(12.5, rh * 0.34));
+            const descFontSize = Math.max(8, Math.min(10.5, rh * 0.28));
+            const gapSize = Math.max(2, Math.floor(rh * 0.08));
+
+            this.eGui = document.createElement('div');
+            this.eGui.style.cssText = 'display:flex;align-items:center;gap:'+gapSize+'px;height:100%;';
+
+            const iconWrap = document.createElement('div');
+            iconWrap.style.cssText = 'width:'+wrapSize+'px;height:'+wrapSize+'px;border-radius:50%;'
+                + 'background:' + color + '15;'
+                + 'display:flex;align-items:center;justify-content:center;flex-shrink:0;'
+                + 'opacity:0;animation:' + uid + '_iconPop 0.4s 0.08s cubic-bezier(0.34,1.56,0.64,1) forwards;';
+
+            const iconEl = document.createElement('span');
+            iconEl.className = 'material-symbols-outlined';
+            iconEl.textContent = materialIcon;
+            iconEl.style.cssText = 'font-size:' + dynIconSize + 'px;color:' + color + ';'
+                + 'user-select:none;line-height:1;'
+                + (filled ? 'font-variation-settings:"FILL" 1;' : '');
+            iconWrap.appendChild(iconEl);
+
+            const textBlock = document.createElement('div');
+            textBlock.style.cssText = 'display:flex;flex-direction:column;gap:0px;min-width:0;'
+                + 'opacity:0;animation:' + uid + '_textSlide 0.35s 0.18s ease-out forwards;';
+
+            const codeLine = document.createElement('span');
+            codeLine.style.cssText = 'font-size:'+codeFontSize+'px;font-weight:800;color:' + color + ';letter-spacing:0.3px;line-height:1.2;';
+            codeLine.textContent = val;
+
+            const descLine = document.createElement('span');
+            descLine.style.cssText = 'font-size:'+descFontSize+'px;color:#888;font-weight:500;line-height:1.2;'
+                + 'white-space:nowrap;overflow:hidden;text-overflow:ellipsis;';
+            descLine.textContent = cfg.label;
+
+            textBlock.appendChild(codeLine);
+            textBlock.appendChild(descLine);
+            this.eGui.appendChild(iconWrap);
+            this.eGui.appendChild(textBlock);
+
+            const style = document.createElement('style');
+            style.textContent = '@keyframes ' + uid + '_iconPop{from{opacity:0;transform:scale(0) rotate(-45deg)}to{opacity:1;transform:scale(1) rotate(0deg)}}'
+                + '@keyframes ' + uid + '_textSlide{from{opacity:0;transform:translateX(-8px)}to{opacity:1;transform:translateX(0)}}';
+            this.eGui.appendChild(style);
+        }
+        getGui() { return this.eGui; }
+    }
+""")
+
+# Modo rendimiento: una hoja de estilos global, sin animaciones y 3 nodos por celda
+_ICON_LITE_CSS = """
+.easy-icon {
+    display:flex;
+    align-items:center;
+    gap:6px;
+    height:100%;
+    min-width:0;
+    color:var(--icon-color);
+}
+
+.easy-icon-i {
+    font-size:var(--icon-size);
+    line-height:1;
+    user-select:none;
+    flex-shrink:0;
+}
+
+.easy-icon-filled .easy-icon-i {
+    font-variation-settings:"FILL" 1;
+}
+
+.easy-icon-t {
+    font-size:12px;
+    font-weight:800;
+    line-height:1.2;
+    min-width:0;
+    overflow:hidden;
+    white-space:nowrap;
+    text-overflow:ellipsis;
+}
+
+.easy-icon-t::after {
+    content:attr(data-label);
+    display:block;
+    font-size:10px;
+    font-weight:500;
+    color:#888;
+    overflow:hidden;
+    text-overflow:ellipsis;
+}
+"""
+
+ICON_RENDERER_LITE = 'easyIconRendererLite'
+
+_ICON_RENDERER_LITE = _shared(ICON_RENDERER_LITE, f"""
+    class IconStatusRendererLite {{
+        init(params) {{
+            if (!window.__easy_icon_css__) {{
+                const style = document.createElement('style');
+                style.innerHTML = {json.dumps(_ICON_LITE_CSS)};
+                document.head.appendChild(style);
+                if (!document.getElementById('_mat_sym_link')) {{
+                    const link = document.createElement('link');
+                    link.id = '_mat_sym_link';
+                    link.rel = 'stylesheet';
+                    link.href = 'https://fonts.googleapis.com/css2?family=Material+Symbols+Outlined:opsz,wght,FILL,GRAD@20..48,100..700,0..1,-50..200';
+                    document.head.appendChild(link);
+                }}
+                window.__easy_icon_css__ = true;
+            }}
+
+            const val = String(params.value ?? "").trim();
+            const cfg = (params.map || {{}})[val] || {{ color: params.fallbackColor, label: val, icon: params.fallbackIcon }};
+
+            this.eGui = document.createElement('div');
+            this.eGui.className = params.filled ? 'easy-icon easy-icon-filled' : 'easy-icon';
+            this.eGui.style.cssText = '--icon-color:' + cfg.color + ';--icon-size:' + params.iconSize + 'px;';
+
+            const iconEl = document.createElement('span');
+            iconEl.className = 'material-symbols-outlined easy-icon-i';
+            iconEl.textContent = cfg.icon;
+
+            const textEl = document.createElement('span');
+            textEl.className = 'easy-icon-t';
+            textEl.textContent = val;
+            textEl.setAttribute('data-label', cfg.label);
+
+            this.eGui.appendChild(iconEl);
+            this.eGui.appendChild(textEl);
+        }}
+        getGui() {{ return this.eGui; }}
+        refresh() {{ return false; }}
+    }}
+""")
+
+
+## BAR
+BAR_RENDERER = 'easyBarRenderer'
+
+_BAR_RENDERER = _shared(BAR_RENDERER, """
+    class DivergingBarRenderer {
+        init(params) {
+            this.eGui = document.createElement('div');
+            this.eGui.style.display = 'flex';
+            this.eGui.style.alignItems = 'center';
+            this.eGui.style.gap = '8px';
+            this.eGui.style.width = '100%';
+            this.eGui.style.overflow = 'hidden';
+
+            let val = parseFloat(params.value);
+            if (isNaN(val)) { this.eGui.innerHTML = params.value || ''; return; }
+
+            const maxAbs = params.maxAbs > 0 ? params.maxAbs : 1;
+            const pct = Math.min((Math.abs(val) / maxAbs) * 50, 50);
+            const color = val >= 0 ? '#e74c3c' : '#2ecc71';
+
+            const container = document.createElement('div');
+            container.style.flex = '1 1 auto';
+            container.style.minWidth = '0';
+            container.style.position = 'relative';
+            container.style.height = '12px';
+            container.style.background = '#e6e6e6';
+            container.style.borderRadius = '6px';
+            container.style.overflow = 'hidden';
+
+            const center = document.createElement('div');
+            center.style.position = 'absolute';
+            center.style.left = '50%';
+            center.style.top = '0';
+            center.style.width = '1px';
+            center.style.height = '100%';
+            center.style.background = '#999';
+            container.appendChild(center);
+
+            if (val !== 0) {
+                const bar = document.createElement('div');
+                bar.style.position = 'absolute';
+                bar.style.top = '0';
+                bar.style.height = '100%';
+                bar.style.width = pct + '%';
+                bar.style.background = color;
+                if (val > 0) bar.style.left = '50%';
+                else bar.style.right = '50%';
+                container.appendChild(bar);
+            }
+
+            const label = document.createElement('span');
+            label.style.flex = '0 0 auto';
+            label.style.fontSize = '13px';
+            label.style.fontWeight = '600';
+            label.style.minWidth = '45px';
+            label.style.textAlign = 'right';
+            label.style.whiteSpace = 'nowrap';
+            label.style.paddingRight = '40px';
+            label.textContent = val.toFixed(0);
+
+            this.eGui.appendChild(container);
+            this.eGui.appendChild(label);
+        }
+        getGui() { return this.eGui; }
+    }
+""")
+
+
+# Modo rendimiento: un solo nodo por celda. El porcentaje llega precalculado
+# en la fila (campo pctField, -50..50 sobre el ancho de la pista); la pista,
+# la linea central y la barra son un gradiente y la etiqueta un ::after
+_BAR_LITE_CSS = """
+.easy-bar {
+    display:flex;
+    align-items:center;
+    gap:8px;
+    width:100%;
+    height:100%;
+    overflow:hidden;
+    --c:#e74c3c;
+}
+
+.easy-bar-neg {
+    --c:#2ecc71;
+}
+
+.easy-bar::before {
+    content:'';
+    flex:1 1 auto;
+    min-width:0;
+    height:12px;
+    border-radius:6px;
+    background:
+        linear-gradient(#999, #999) 50% 0 / 1px 100% no-repeat,
+        linear-gradient(to right, #e6e6e6 var(--a), var(--c) var(--a) var(--b), #e6e6e6 var(--b));
+}
+
+.easy-bar::after {
+    content:attr(data-label);
+    flex:0 0 auto;
+    min-width:45px;
+    padding-right:40px;
+    text-align:right;
+    white-space:nowrap;
+    font-size:13px;
+    font-weight:600;
+}
+
+.easy-bar-na::before {
+    display:none;
+}
+"""
+
+BAR_RENDERER_LITE = 'easyBarRendererLite'
+
+_BAR_RENDERER_LITE = _shared(BAR_RENDERER_LITE, f"""
+    class DivergingBarRendererLite {{
+        init(params) {{
+            if (!window.__easy_bar_css__) {{
+                const style = document.createElement('style');
+                style.innerHTML = {json.dumps(_BAR_LITE_CSS)};
+                document.head.appendChild(style);
+                window.__easy_bar_css__ = true;
+            }}
+            this.eGui = document.createElement('div');
+            this.refresh(params);
+        }}
+        getGui() {{ return this.eGui; }}
+        refresh(params) {{
+            const val = params.value;
+            let pct = params.data ? params.data[params.pctField] : undefined;
+            if (pct === undefined && typeof val === 'number') {{
+                // Filas de grupo (agregados): sin campo precalculado
+                pct = Math.max(-50, Math.min(50, val / params.maxAbs * 50));
+            }}
+            if (pct == null || val == null || val === '') {{
+                this.eGui.className = 'easy-bar easy-bar-na';
+                this.eGui.setAttribute('data-label', val ?? '');
+                return true;
+            }}
+            this.eGui.className = pct < 0 ? 'easy-bar easy-bar-neg' : 'easy-bar';
+            this.eGui.style.cssText = '--a:' + (pct < 0 ? 50 + pct : 50) + '%;--b:' + (pct < 0 ? 50 : 50 + pct) + '%';
+            this.eGui.setAttribute('data-label', typeof val === 'number' ? Math.round(val) : val);
+            return true;
+        }}
+    }}
+""")
+
+
+## SPARKLINE
+SPARKLINE_RENDERER = 'easySparklineRenderer'
+
+# Los valores llegan ya reducidos y escalados a 0..100 (-1 = hueco): un svg y un path por celda
+_SPARKLINE_RENDERER = _shared(SPARKLINE_RENDERER, """
+    class SparklineRenderer {
+        init(params) {
+            const ns = 'http://www.w3.org/2000/svg';
+            this.eGui = document.createElementNS(ns, 'svg');
+            this.eGui.setAttribute('preserveAspectRatio', 'none');
+            this.eGui.style.cssText = 'width:100%;height:60%;display:block;margin-top:6%;overflow:visible;';
+            this.path = document.createElementNS(ns, 'path');
+            this.path.setAttribute('fill', 'none');
+            this.path.setAttribute('stroke', params.color || '#3498db');
+            this.path.setAttribute('stroke-width', params.lineWidth || 1.5);
+            this.path.setAttribute('stroke-linejoin', 'round');
+            this.path.setAttribute('vector-effect', 'non-scaling-stroke');
+            this.eGui.appendChild(this.path);
+            this.refresh(params);
+        }
+        getGui() { return this.eGui; }
+        refresh(params) {
+            // Con transporte Arrow la celda es un Vector
+            const values = params.value == null ? [] : Array.from(params.value);
+            let d = '', pen = false;
+            for (let i = 0; i < values.length; i++) {
+                const y = values[i];
+                if (y == null || y < 0) { pen = false; continue; }
+                d += (pen ? 'L' : 'M') + i + ' ' + (100 - y);
+                pen = true;
+            }
+            this.eGui.setAttribute('viewBox', '0 0 ' + Math.max(values.length - 1, 1) + ' 100');
+            this.path.setAttribute('d', d);
+            return true;
+        }
+    }
+""")
+
+
+## REGISTRY
+RENDERERS: Dict[str, JsCode] = {
+    STATUS_RENDERER: _STATUS_RENDERER,
+    ICON_RENDERER: _ICON_RENDERER,
+    ICON_RENDERER_LITE: _ICON_RENDERER_LITE,
+    BAR_RENDERER: _BAR_RENDERER,
+    BAR_RENDERER_LITE: _BAR_RENDERER_LITE,
+    SPARKLINE_RENDERER: _SPARKLINE_RENDERER,
+}
+
+
+def collect_components(column_defs: List[Dict[str, Any]]) -> Dict[str, JsCode]:
+    '''
+    Returns the shared renderers referenced by name in columnDefs (any level
+    of children), ready to be set as gridOptions['components']
+    '''
+    components = dict()
+    for col in column_defs:
+        name = col.get('cellRenderer')
+        if isinstance(name, str) and name in RENDERERS:
+            components[name] = RENDERERS[name]
+        if col.get('children'):
+            components.update(collect_components(col['children']))
+    return components
@@ -0,0 +1,335 @@
+'''
+Indexed quick search over the `col_text` columns of `easy_table`
+
+`easy_table(..., quick_search=True)` shows a search box above the grid.
+Instead of a substring scan of every row on each keystroke, the text of the
+configured `col_text` fields is indexed once per data version in a trigram
+inverted index built with NumPy:
+
+- every row text (fields lowercased and joined) is padded with two
+  sentinel characters, so every character starts one trigram and a query
+  of one or two characters is a contiguous range of trigram codes;
+- a trigram is packed in one uint64 (3 x 21 bits of code point) and the
+  index is a sorted array of trigrams plus CSR posting lists of rows.
+
+A query is split in words (all must match, like the AG Grid quick filter);
+each word intersects the posting lists of its trigrams and only the
+candidate rows are checked with a real substring test.
+
+When the data changes, rows are matched by their index label and only the
+added and changed rows are indexed again (into a small delta index merged
+on the next full rebuild). An index is never modified once built: the
+update returns a new index sharing the unchanged arrays, so sessions
+reading the shared cache never see a half-updated one.
+
+Classes
+-------
+TrigramIndex
+
+Functions
+---------
+text_fields
+row_texts
+search_index
+search_box
+'''
+import copy
+from typing import Hashable, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from easy_st_aggrid.cache import LRUCache, data_version
+from easy_st_aggrid.defaults import col_base, col_text
+
+FIELD_SEP = '\x1f'
+_PAD = '\x00\x00'
+_BITS = np.uint64(21)
+_CHAR_MAX = np.uint64((1 << 21) - 1)
+
+## CACHE
+# Indices por (tabla, campos, version de datos); inmutables, compartidos entre sesiones
+search_index_cache = LRUCache(maxsize=16)
+# Ultimo indice por (tabla, campos): base de la actualizacion incremental
+latest_index_cache = LRUCache(maxsize=16)
+
+
+def text_fields(columns_list: Iterable[col_base]) -> List[str]:
+    '''
+    Fields of the `col_text` columns (any level of children), in visual order
+    '''
+    fields = []
+    for col in columns_list or ():
+        if col.children:
+            fields.extend(text_fields(col.children))
+        elif isinstance(col, col_text) and col.id:
+            fields.append(col.id)
+    return fields
+
+
+def row_texts(df: 'pd.DataFrame', fields: List[str]) -> np.ndarray:
+    '''
+    Lowercased text of every row (fields joined by a separator)
+    '''
+    if not fields:
+        return np.full(len(df), '', dtype=object)
+    parts = [df[f].astype(str).where(df[f].notna(), '').str.lower() for f in fields]
+    text = parts[0] if len(parts) == 1 else parts[0].str.cat(parts[1:], sep=FIELD_SEP)
+    return text.to_numpy(dtype=object)
+
+
+def _code(chars: np.ndarray) -> np.ndarray:
+    return (chars[..., 0] << (_BITS * np.uint64(2))) | (chars[..., 1] << _BITS) | chars[..., 2]
+
+
+def _query_chars(word: str) -> np.ndarray:
+    return np.frombuffer(word.encode('utf-32-le'), dtype=np.uint32).astype(np.uint64)
+
+
+def _trigrams(texts: np.ndarray, chunk_rows: int = 200_000) -> Tuple[np.ndarray, np.ndarray]:
+    '''
+    Unique (trigram, row) pairs of `texts`, sorted by trigram then row
+    '''
+    all_codes, all_rows = [], []
+    for start in range(0, len(texts), chunk_rows):
+        chunk = texts[start:start + chunk_rows]
+        lengths = np.fromiter(map(len, chunk), dtype=np.int64, count=len(chunk)) + len(_PAD)
+        joined = _PAD.join(chunk) + _PAD
+        chars = np.frombuffer(joined.encode('utf-32-le'), dtype=np.uint32).astype(np.uint64)
+        row_of = np.repeat(np.arange(start, start + len(chunk)), lengths)
+        # Un trigrama es valido si sus tres caracteres son de la misma fila
+        valid = np.flatnonzero(row_of[:-2] == row_of[2:])
+        codes = (chars[valid] << (_BITS * np.uint64(2))) | (chars[valid + 1] << _BITS) | chars[valid + 2]
+        rows = row_of[valid]
+        # Las filas ya vienen en orden: un sort estable por trigrama basta
+        order = np.argsort(codes, kind='stable')
+        codes, rows = codes[order], rows[order]
+        keep = np.ones(len(codes), dtype=bool)
+        keep[1:] = (codes[1:] != codes[:-1]) | (rows[1:] != rows[:-1])
+        all_codes.append(codes[keep])
+        all_rows.append(rows[keep])
+
+    if not all_codes:
+        return np.empty(0, np.uint64), np.empty(0, np.int64)
+    codes, rows = np.concatenate(all_codes), np.concatenate(all_rows)
+    # Estable: dentro de un trigrama las filas siguen en orden ascendente
+    order = np.argsort(codes, kind='stable')
+    return codes[order], rows[order]
+
+
+class _Postings:
+    '''
+    CSR inverted index: sorted trigram keys and the rows of each one
+    '''
+    def __init__(self, texts: np.ndarray, offset: int = 0):
+        codes, rows = _trigrams(texts)
+        self.keys, starts = np.unique(codes, return_index=True)
+        self.indptr = np.append(starts, len(codes))
+        self.rows = rows + offset
+        self.size = offset + len(texts)
+
+    def lookup(self, code: np.uint64) -> np.ndarray:
+        i = np.searchsorted(self.keys, code)
+        if i == len(self.keys) or self.keys[i] != code:
+            return self.rows[:0]
+        return self.rows[self.indptr[i]:self.indptr[i + 1]]
+
+    def prefix(self, chars: np.ndarray) -> np.ndarray:
+        '''
+        Rows with any trigram starting with 1 or 2 characters
+        '''
+        pad = 3 - len(chars)
+        lo = _code(np.concatenate([chars, np.zeros(pad, np.uint64)]))
+        hi = _code(np.concatenate([chars, np.full(pad, _CHAR_MAX)]))
+        a = np.searchsorted(self.keys, lo, side='left')
+        b = np.searchsorted(self.keys, hi, side='right')
+        # Bitmap en vez de np.unique: el rango puede cubrir casi todas las filas
+        mask = np.zeros(self.size, dtype=bool)
+        mask[self.rows[self.indptr[a]:self.indptr[b]]] = True
+        return np.flatnonzero(mask)
+
+    def candidates(self, word: str) -> np.ndarray:
+        '''
+        Rows that contain every trigram of `word` (exact for up to 3 characters)
+        '''
+        chars = _query_chars(word)
+        if len(chars) < 3:
+            return self.prefix(chars)
+        codes = np.unique(_code(np.lib.stride_tricks.sliding_window_view(chars, 3)))
+        lists = sorted((self.lookup(c) for c in codes), key=len)
+        rows = lists[0]
+        for other in lists[1:]:
+            if not len(rows):
+                break
+            rows = np.intersect1d(rows, other, assume_unique=True)
+        return rows
+
+
+class TrigramIndex:
+    '''
+    Trigram index of row texts, searchable by substring
+
+    Rows live in slots: the slots of the main index plus the slots appended
+    by incremental updates (delta index). Each slot knows the current
+    position of its row in the dataframe, or -1 once removed / replaced.
+
+    Parameters
+    ----------
+    texts : np.ndarray
+        Text of each row (see `row_texts`).
+    ids : np.ndarray or None
+        Label of each row, used to match rows between data versions.
+    rebuild_ratio : float
+        Rebuild from scratch when the delta index exceeds this fraction of
+        the rows.
+
+    Methods
+    -------
+    search
+    updated
+    '''
+    def __init__(self, texts: np.ndarray, ids: Optional[np.ndarray] = None, rebuild_ratio: float = 0.2):
+        self.rebuild_ratio = rebuild_ratio
+        self.version: Optional[Hashable] = None
+        self._build(texts, ids)
+
+    def _build(self, texts: np.ndarray, ids: Optional[np.ndarray]):
+        self.texts = np.asarray(texts, dtype=object)
+        self.ids = None if ids is None else np.asarray(ids)
+        self._main_slots = len(self.texts)
+        self.hashes = pd.util.hash_array(self.texts)
+        self.slot_pos = np.arange(len(self.texts))
+        self.main = _Postings(self.texts)
+        self.delta: Optional[_Postings] = None
+        self.results = LRUCache(maxsize=32)
+
+    @property
+    def row_count(self) -> int:
+        return int((self.slot_pos >= 0).sum())
+
+    def updated(self, texts: np.ndarray, ids: Optional[np.ndarray]) -> 'TrigramIndex':
+        '''
+        Returns the index of the new texts of the table
+
+        Rows are matched by `ids`: unchanged rows only get their new
+        position, changed and added rows are indexed in a new delta index.
+        Without (unique) ids on both sides the index is rebuilt. This index
+        is left untouched (other sessions may be searching it).
+        '''
+        texts = np.asarray(texts, dtype=object)
+        if ids is None or self.ids is None:
+            return TrigramIndex(texts, ids, self.rebuild_ratio)
+
+        alive = np.flatnonzero(self.slot_pos >= 0)
+        old = pd.Index(self.ids[alive])
+        if not old.is_unique or not pd.Index(ids).is_unique:
+            return TrigramIndex(texts, ids, self.rebuild_ratio)
+
+        hashes = pd.util.hash_array(texts)
+        match = old.get_indexer(ids)
+        found = match >= 0
+        slots = alive[match[found]]
+        same = self.hashes[slots] == hashes[found]
+
+        new_pos = np.flatnonzero(~found)
+        new_pos = np.concatenate([new_pos, np.flatnonzero(found)[~same]])
+        delta_slots = len(self.texts) - self._main_slots + len(new_pos)
+        if delta_slots > self.rebuild_ratio * max(len(texts), 1):
+            return TrigramIndex(texts, ids, self.rebuild_ratio)
+
+        # Copia que comparte el indice principal; los arrays que cambian son nuevos
+        index = copy.copy(self)
+        index.version = None
+        index.results = LRUCache(maxsize=32)
+        # Filas que siguen igual: solo cambia su posicion; el resto se da de baja
+        index.slot_pos = np.full(len(self.slot_pos), -1, dtype=np.int64)
+        index.slot_pos[slots[same]] = np.flatnonzero(found)[same]
+        if len(new_pos):
+            new_pos = np.sort(new_pos)
+            index.texts = np.concatenate([self.texts, texts[new_pos]])
+            index.ids = np.concatenate([self.ids, np.asarray(ids)[new_pos]])
+            index.hashes = np.concatenate([self.hashes, hashes[new_pos]])
+            index.slot_pos = np.concatenate([index.slot_pos, new_pos])
+            index.delta = _Postings(index.texts[self._main_slots:], offset=self._main_slots)
+        return index
+
+    def search(self, query: str) -> np.ndarray:
+        '''
+        Positions (sorted) of the rows containing every word of `query`
+        '''
+        words = query.lower().split()
+        if not words:
+            return self.slot_pos[self.slot_pos >= 0]
+        cached = self.results.get(tuple(words))
+        if cached is not None:
+            return cached
+        slots = None
+        for word in sorted(set(words), key=len, reverse=True):
+            cand = self.main.candidates(word)
+            if self.delta is not None:
+                cand = np.concatenate([cand, self.delta.candidates(word)])
+            slots = cand if slots is None else np.intersect1d(slots, cand, assume_unique=True)
+            if not len(slots):
+                break
+        # Con mas de 3 caracteres los trigramas dan un superconjunto: comprobar la subcadena
+        for word in words:
+            if len(word) > 3 and len(slots):
+                texts = pd.Series(self.texts[slots], dtype=object)
+                slots = slots[texts.str.contains(word, regex=False).to_numpy(dtype=bool)]
+        positions = self.slot_pos[slots]
+        return self.results.put(tuple(words), np.sort(positions[positions >= 0]))
+
+
+def search_index(
+        df: 'pd.DataFrame',
+        fields: List[str],
+        key: Optional[str] = None,
+        version: Optional[Hashable] = None,
+    ) -> TrigramIndex:
+    '''
+    Returns the index of a table for the current data
+
+    Indexes are cached per (table key, fields, data version). A new data
+    version is indexed incrementally from the last index of the table,
+    matching rows by index label.
+    '''
+    if version is None:
+        version = data_version(df, fields)
+    table_key = (key, tuple(fields))
+    index = search_index_cache.get(table_key + (version,))
+    if index is not None:
+        return index
+
+    texts = row_texts(df, fields)
+    ids = df.index.to_numpy() if df.index.is_unique else None
+    previous = latest_index_cache.get(table_key)
+    index = TrigramIndex(texts, ids) if previous is None else previous.updated(texts, ids)
+    index.version = version
+    latest_index_cache.put(table_key, index)
+    return search_index_cache.put(table_key + (version,), index)
+
+
+def search_box(
+        df: 'pd.DataFrame',
+        fields: List[str],
+        key: Optional[str] = None,
+        version: Optional[Hashable] = None,
+    ) -> Tuple[str, Optional[np.ndarray]]:
+    '''
+    Streamlit search box of a table
+
+    Returns the query and the positions of the matching rows (None
+    without a query).
+    '''
+    import streamlit as st
+
+    query = st.text_input(
+        'Buscar',
+        key=f"{key or 'easy_table'}__search",
+        placeholder='Buscar...',
+        label_visibility='collapsed',
+    )
+    query = ' '.join((query or '').lower().split())
+    if not query:
+        return query, None
+    return query, search_index(df, fields, key=key, version=version).search(query)
@@ -0,0 +1,102 @@
+'''
+Selections resolved against the source dataframe
+
+With `easy_table(..., selection_response='ids')` every row carries its
+position in the dataframe as row id and the grid returns only the ids of
+the selected nodes (plus its state), through `DataReturnMode.CUSTOM` and
+`SELECTED_IDS_RETURN`, instead of the data of every row. The selection is
+resolved with a positional `take` on the original dataframe: fast for
+thousands of rows and dtypes preserved.
+
+Functions
+---------
+selected_ids
+selected_data
+'''
+from typing import Any, List, Union
+
+import numpy as np
+import pandas as pd
+from st_aggrid import JsCode
+
+from easy_st_aggrid.delta import ROW_ID_FIELD, index_ids
+
+SELECTED_IDS_FIELD = 'selectedRowIds'
+
+# Respuesta de la grid con selection_response='ids': ids de los nodos y estado
+# (gridState lo leen grid_models y el filter pushdown desde st.session_state[key])
+SELECTED_IDS_RETURN = JsCode("""
+    function({eventData}) {
+        const api = eventData.api;
+        return {
+            selectedRowIds: api.getSelectedNodes().map(node => node.id),
+            gridState: api.getState ? api.getState() : null,
+        };
+    }
+""")
+
+
+def _row_selection(selection: Any) -> Any:
+    # AG Grid >= 32: {selectAll, toggledNodes}; con selectAll los nodos son los deseleccionados
+    if isinstance(selection, dict):
+        return None if selection.get('selectAll') else selection.get('toggledNodes')
+    return selection
+
+
+def selected_ids(response: Any) -> List[str]:
+    '''
+    Returns the ids of the selected rows of an AgGrid response
+
+    Read from the ids returned by `SELECTED_IDS_RETURN`, or from the grid
+    state (`rowSelection`), falling back to the `__row_id__` field of
+    `selected_rows`.
+    '''
+    raw = getattr(response, 'raw_data', None) # CustomResponse (DataReturnMode.CUSTOM)
+    if isinstance(raw, dict):
+        return [str(i) for i in (raw.get(SELECTED_IDS_FIELD) or []) if i is not None]
+
+    ids = _row_selection(getattr(response, 'selected_rows_id', None))
+    if ids is None:
+        state = getattr(response, 'grid_state', None) or {}
+        ids = _row_selection(state.get('rowSelection') if isinstance(state, dict) else None)
+    if ids is None:
+        rows = getattr(response, 'selected_rows', None)
+        if isinstance(rows, pd.DataFrame) and ROW_ID_FIELD in rows.columns:
+            ids = rows[ROW_ID_FIELD].tolist()
+        elif isinstance(rows, list):
+            ids = [r.get(ROW_ID_FIELD) for r in rows if isinstance(r, dict)]
+    return [str(i) for i in (ids or []) if i is not None]
+
+
+def selected_data(
+        response: Any,
+        dataframe: 'pd.DataFrame',
+        row_id: Union[str, bool, None] = None,
+    ) -> 'pd.DataFrame':
+    '''
+    Returns the selected rows of `dataframe` (the frame passed to easy_table)
+
+    Parameters
+    ----------
+    response : AgGridReturn
+    dataframe : pd.DataFrame
+    row_id : str, bool or None
+        Same `row_id` given to easy_table: None for positional ids
+        (`selection_response='ids'`), a key column name, or True for ids
+        derived from the index.
+    '''
+    ids = selected_ids(response)
+    if not ids:
+        return dataframe.iloc[:0]
+
+    if row_id is None or row_id is False:
+        positions = pd.to_numeric(pd.Series(ids), errors='coerce').dropna().astype(np.int64).to_numpy()
+        positions = positions[(positions >= 0) & (positions < len(dataframe))]
+        return dataframe.take(positions)
+
+    if isinstance(row_id, str):
+        keys = pd.Index(dataframe[row_id].astype(str))
+    else:
+        keys = pd.Index(index_ids(dataframe.index).astype(str))
+    positions = keys.get_indexer(ids)
+    return dataframe.take(positions[positions >= 0])
@@ -1,15 +1,33 @@
 # __all__ = ['easy_table']
 
-from typing import Literal, Optional, List, Dict
+from typing import Literal, Optional, List, Dict, Tuple, Any, Hashable, Callable, Union, Iterable
 from enum import Enum
-from st_aggrid import AgGrid, JsCode, GridOptionsBuilder, ColumnsAutoSizeMode
+from st_aggrid import AgGrid, GridOptionsBuilder, ColumnsAutoSizeMode, DataReturnMode
 from st_aggrid.shared import StAggridTheme
 from easy_st_aggrid.defaults import *
+from easy_st_aggrid.cache import LRUCache, fingerprint, digest, schema_fingerprint
+from easy_st_aggrid.datasource import DataFrameSource, page_selector, \
+    GroupedSource, group_path_selector, expand_group, chunked_source, GROUP_COUNT_FIELD
+from easy_st_aggrid.col_bar import auto_scale_col_bars, bar_percent_columns
+from easy_st_aggrid.col_sparkline import sparkline_columns
+from easy_st_aggrid.col_heatmap import heat_bin_columns, heatmap_css
+from easy_st_aggrid.renderers import collect_components
+from easy_st_aggrid.column_spec import ColumnSpec, compile_columns
+from easy_st_aggrid.transport import json_serialization, \
+    dict_encode_columns, use_dict_encoding, value_getter_fields
+from easy_st_aggrid.filters import use_set_filter_values, grid_models, filtered_positions
+from easy_st_aggrid.delta import use_row_ids
+from easy_st_aggrid.selection import selected_ids, SELECTED_IDS_RETURN
+from easy_st_aggrid.tree import use_tree_data
+from easy_st_aggrid.layout import use_column_layout
+from easy_st_aggrid.frame import with_columns, shallow_copy
+from easy_st_aggrid.search import text_fields, search_box
+from easy_st_aggrid.instrumentation import table_metrics, start_trace, _NULL_TRACER
 # from easy_st_aggrid.co
 
-from typing import TYPE_CHECKING
-if TYPE_CHECKING:
-    import pandas as pd
+import numpy as np
+import pandas as pd
+import streamlit as st
 
 # def _columns_config(columns_list: List[col_base]) -> List[Dict]:
 #     '''
@@ -45,12 +63,78 @@ def _extract_fields(column_defs, exclude_prefix="__"):
 
     return fields
 
+def _table_frame(dataframe: 'pd.DataFrame', copy_data: bool = True) -> 'pd.DataFrame':
+    '''
+    Returns the frame used to render the table
+
+    With `copy_data=True` the frame is a full copy. With `copy_data=False`
+    it is a `shallow_copy`: it shares every column buffer and a
+    transformation must replace a whole column (`df[col] = values`), which
+    only allocates that column.
+    '''
+    if copy_data:
+        return dataframe.copy()
+    return shallow_copy(dataframe)
+
+## CACHE
+# gridOptions ya construidos, compartidos entre reruns y sesiones
+grid_options_cache = LRUCache(maxsize=128)
+
+def _mark_containers(obj: Any, marked: set) -> bool:
+    '''
+    Adds to `marked` the id of every dict/list holding a JsCode (at any
+    depth) and returns True if `obj` holds one
+    '''
+    if isinstance(obj, (dict, list)):
+        # Sin cortocircuito: hay que marcar todas las ramas
+        found = [_mark_containers(v, marked) for v in (obj.values() if isinstance(obj, dict) else obj)]
+        if any(found):
+            marked.add(id(obj))
+            return True
+        return False
+    return isinstance(getattr(obj, 'js_code', None), str)
+
+def _mark_columns(column_defs: List[Dict], marked: set) -> None:
+    marked.add(id(column_defs))
+    for col in column_defs:
+        marked.add(id(col))
+        if col.get("children"):
+            _mark_columns(col["children"], marked)
+
+def _freeze_options(grid_options: Dict[str, Any]) -> frozenset:
+    '''
+    Returns the ids of the containers of `grid_options` that a render may
+    write into, the only ones `_thaw_options` copies
+
+    Those are the containers of a JsCode (AgGrid replaces every JsCode by its
+    source in the dict it receives), the gridOptions dict and its first
+    level (`context`, `defaultColDef`...) and every columnDefs list and column
+    dict (`easy_table` adds widths, filter values, valueGetters...).
+    Everything else is shared between renders.
+    '''
+    marked = set()
+    _mark_containers(grid_options, marked)
+    marked.add(id(grid_options))
+    marked.update(id(v) for v in grid_options.values() if isinstance(v, (dict, list)))
+    _mark_columns(grid_options.get("columnDefs", []), marked)
+    return frozenset(marked)
+
+def _thaw_options(obj: Any, marked: frozenset) -> Any:
+    '''
+    Copies the containers of `obj` listed in `marked` (see `_freeze_options`)
+    '''
+    if id(obj) not in marked:
+        return obj
+    if isinstance(obj, dict):
+        return {k: _thaw_options(v, marked) for k, v in obj.items()}
+    return [_thaw_options(v, marked) for v in obj]
+
 # class Theme(str, Enum):
 #     STREAMLIT = "streamlit"
 #     LIGHT = "light"
 #     DARK = "dark"
 
-def build_column_defs(df, columns_list: Optional[List[col_base]] = None) -> List[Dict]:
+def build_column_defs(df, columns_list: Union[List[col_base], ColumnSpec, None] = None) -> List[Dict]:
     # Sin configuracion custom: todas las columnas planas del dataframe
     if not columns_list:
         return [
@@ -62,73 +146,49 @@ def build_column_defs(df, columns_list: Optional[List[col_base]] = None) -> List
         ]
 
     # Con configuracion custom: respetar jerarquia (children) y orden definidos
-    column_defs = [col.data() for col in columns_list]
+    spec = columns_list if isinstance(columns_list, ColumnSpec) else compile_columns(columns_list)
+    column_defs = list(spec.column_defs)
 
     # Mantener compatibilidad: anadir al final columnas del df no configuradas
-    configured_ids = set(_extract_fields(column_defs))
-    for col_name in df.columns:
-        if col_name not in configured_ids:
-            column_defs.append(
-                {
-                    "field": col_name,
-                    "headerTooltip": col_name,
-                }
-            )
+    for col_name in spec.extra_columns(df.columns):
+        column_defs.append(
+            {
+                "field": col_name,
+                "headerTooltip": col_name,
+            }
+        )
 
     return column_defs
 
-def easy_table(
-        dataframe: 'pd.DataFrame',
-        key: str = None,
-        columns_list: List[col_base] = None, 
+def build_grid_options(
+        df: 'pd.DataFrame',
+        columns_list: Union[List[col_base], ColumnSpec, None] = None,
         cell_style: cell_style = default_cell,
         header_style: cell_style = default_header,
-        # getRowStyle: str = None,
         select_checkbox: bool = False,
         selection_multiple: bool = False,
-        
-        fit_columns_on_grid_load: bool = True,
         suppressMovableColumns: bool = True,
         floatingFilter: bool = False,
         statusbar: bool = False,
         sidebar: bool = False,
-
-        height: int = None,
         row_height: int = 30,
         row_grouping: bool = False,
-        # dark_theme: bool = False,
-        # theme: Theme = Theme.STREAMLIT,
         theme: Literal["streamlit", "light", "dark"] = 'streamlit',
-
-        #TREE DATA:
-        # tree_data: bool = False,
-        # tree_level_col: str = None,
-        
-        enterprise: bool = False,
-    ): #  -> Any | str | 'pd.DataFrame' | None
+        tracer = _NULL_TRACER,
+    ) -> Tuple[Dict[str, Any], Any]:
     '''
-    Render a dataframe with AgGrid and custom options
+    Build the gridOptions dict and the AgGrid theme for `easy_table`
+
+    Only depends on the dataframe schema (column names and dtypes), never on
+    its values, so the result can be cached between reruns.
 
     Returns:
-        response.selected_rows
+        (grid_options, theme)
     '''
-
-    ## DATAFRAME
-    df = dataframe.copy()
-
-    # ---------------------------------------------------------------
-    #  AUTO-CALCULAR maxAbs PARA col_bar (búsqueda recursiva)
-    # ---------------------------------------------------------------
-
-
-    # if columns_list:
-    #     for col in _find_col_bars(columns_list):
-    #         if col.max_abs is None and col.id in df.columns:
-    #             series = pd.to_numeric(df[col.id], errors='coerce')
-    #             max_val = series.abs().max()
-    #             col.max_abs = float(max_val) if pd.notna(max_val) and max_val > 0 else 1
-    #             col._build_renderer()
-    # ---------------------------------------------------------------
+    spec = None
+    if columns_list:
+        spec = columns_list if isinstance(columns_list, ColumnSpec) else compile_columns(columns_list)
+        columns_list = spec.columns_list
 
     gb = GridOptionsBuilder.from_dataframe(df)
 
@@ -212,36 +272,8 @@ def easy_table(
     #     )
 
 
-    # ---------------------------------------------------------------
-    #  TREE DATA
-    #----------------------------------------------------------------
-    #Nombre y ancho de la columna agrupada (de momento HARD-CODED)
-    auto_tree_name = "Nivel"
-    auto_tree_width = 60
-
-
-    # if tree_data:
-    #     if not tree_level_col:
-    #         raise ValueError("tree_data requires tree_level_col and tree_id_col")
-    #     df = build_hierarchy(df, col_name=tree_level_col)
-        
-    #     gb.configure_grid_options(
-    #         treeData=True,
-    #         animateRows=True,
-    #         getDataPath=JsCode("function(data) { return JSON.parse(data.hierarchy); }"),
-    #         groupDefaultExpanded=group_default_expanded,
-    #         autoGroupColumnDef={
-    #             "headerName": auto_tree_name,
-    #             "field": tree_level_col,
-    #             "width": auto_tree_width,
-    #             "suppressSizeToFit": True, #PARA QUE NO SE AJUSTE
-    #             # "pinned": "left", #ESTE PINNED NO SE PONE, porque al ponerlo la columna de agrupacion se pone mas a la izda que el checkbox ->FEO
-    #             "cellRendererParams": {"suppressCount": True},
-    #             "cellStyle": cell_style.to_dict(),
-    #         },
-    #     )
-
     grid_options = gb.build()
+    tracer.lap('grid_builder')
 
     # 🔥 Forzar selección correctamente en 1.1.9
     # grid_options["rowSelection"] = "single"
@@ -325,7 +357,7 @@ def easy_table(
     ## COLUMNS CONFIG LIST
     if columns_list:
         # grid_options['columnDefs'] = _columns_config(columns_list=columns_list) #  or col.children
-        grid_options['columnDefs'] = build_column_defs(df, columns_list)
+        grid_options['columnDefs'] = build_column_defs(df, spec)
 
     ## CHECKBOX
     if select_checkbox:
@@ -353,8 +385,15 @@ def easy_table(
             }
         })
 
+    ## SHARED RENDERERS
+    components = collect_components(grid_options["columnDefs"])
+    if components:
+        grid_options.setdefault("components", {}).update(components)
 
-    exportable_columns = _extract_fields(grid_options["columnDefs"])
+    if spec:
+        exportable_columns = spec.export_fields(df.columns)
+    else:
+        exportable_columns = _extract_fields(grid_options["columnDefs"])
     grid_options["defaultExcelExportParams"] = {
         "columnKeys": exportable_columns,
     }
@@ -382,38 +421,7 @@ def easy_table(
         }
 
 
-    # ---------------------------------------------------------------
-    #  TREE DATA
-    #----------------------------------------------------------------
-    #Nombre y ancho de la columna agrupada (de momento HARD-CODED)
-    # auto_tree_name = "Nivel"
-    # auto_tree_width = 60
-
-
-    # if tree_data:
-    #     if not tree_level_col:
-    #         raise ValueError("tree_data requires tree_level_col and tree_id_col")
-    #     df = build_hierarchy(df, level_col=tree_level_col)
-        
-    #     gb.configure_grid_options(
-    #         treeData=True,
-    #         animateRows=True,
-    #         getDataPath=JsCode("function(data) { return JSON.parse(data.hierarchy); }"),
-    #         groupDefaultExpanded=group_default_expanded,
-    #         autoGroupColumnDef={
-    #             "headerName": auto_tree_name,
-    #             "field": tree_level_col,
-    #             "width": auto_tree_width,
-    #             "suppressSizeToFit": True, #PARA QUE NO SE AJUSTE
-    #             # "pinned": "left", #ESTE PINNED NO SE PONE, porque al ponerlo la columna de agrupacion se pone mas a la izda que el checkbox ->FEO
-    #             "cellRendererParams": {"suppressCount": False},
-    #             "cellStyle": cell_style.to_dict(),
-    #         },
-    #     )
-
-    # ---------------------------------------------------------------
-    #  TREE DATA
-    #----------------------------------------------------------------
+    tracer.lap('column_defs')
 
     ## THEME
 
@@ -447,25 +455,456 @@ def easy_table(
             accentColor="#004467",
             rangeSelectionBorderColor="#004467",
         )
-    
-    
+
+    _theme = _theme if theme in ['dark', 'light'] else 'streamlit'
+    tracer.lap('theme')
+
+    return grid_options, _theme
+
+
+def easy_table(
+        dataframe: Union['pd.DataFrame', Iterable['pd.DataFrame']],
+        key: str = None,
+        columns_list: List[col_base] = None, 
+        cell_style: cell_style = default_cell,
+        header_style: cell_style = default_header,
+        # getRowStyle: str = None,
+        select_checkbox: bool = False,
+        selection_multiple: bool = False,
+        
+        fit_columns_on_grid_load: bool = True,
+        column_virtualisation_threshold: Optional[int] = None,
+        estimate_column_widths: bool = False,
+        suppressMovableColumns: bool = True,
+        floatingFilter: bool = False,
+        statusbar: bool = False,
+        sidebar: bool = False,
+
+        height: int = None,
+        row_height: int = 30,
+        row_grouping: bool = False,
+        # dark_theme: bool = False,
+        # theme: Theme = Theme.STREAMLIT,
+        theme: Literal["streamlit", "light", "dark"] = 'streamlit',
+
+        #TREE DATA:
+        tree_data: bool = False,
+        tree_level_col: str = None,
+        tree_parent_col: str = None,
+        tree_id_col: str = None,
+        
+        cache_grid_options: bool = True,
+        copy_data: bool = True,
+
+        #ROW MODEL:
+        row_model: Literal["client", "paged", "grouped"] = 'client',
+        block_size: int = 1000,
+        filter_pushdown: bool = True,
+        quick_search: Union[bool, List[str]] = False,
+        data_version: Optional[Hashable] = None,
+        chunk_batch_rows: int = 50_000,
+        chunk_rerun: Literal["app", "fragment", "none"] = 'app',
+
+        on_metrics: Optional[Callable[[table_metrics], None]] = None,
+        transport: Literal["auto", "arrow", "json"] = 'auto',
+        dict_encode: Union[bool, List[str]] = False,
+        dict_encode_ratio: float = 0.05,
+        precompute_set_filters: bool = False,
+        set_filter_counts: bool = False,
+        row_id: Union[str, bool, None] = None,
+        selection_response: Literal["rows", "ids"] = 'rows',
+
+        enterprise: bool = False,
+    ): #  -> Any | str | 'pd.DataFrame' | None
+    '''
+    Render a dataframe with AgGrid and custom options
+
+    The gridOptions are cached (see `grid_options_cache`) using the dataframe
+    schema and every argument as key, so reruns with the same configuration
+    skip `GridOptionsBuilder` and the columnDefs construction.
+    Set `cache_grid_options=False` to always rebuild them.
+
+    With `copy_data=False` the dataframe is not duplicated in memory: the
+    caller's frame is never mutated and only the columns that easy_table
+    transforms are allocated again. The paged and grouped row models never
+    copy the whole frame: they only send new frames built from it.
+
+    With `tree_data=True` the rows form a tree (AG Grid enterprise): either a
+    `tree_level_col` with the rows in depth-first order, or a
+    `tree_parent_col` with the parent `tree_id_col` of each row. The path of
+    every row is built in Python (vectorized, cached per data version) and
+    sent as a list column.
+
+    With `row_model='grouped'` the `rowGroup` columns are grouped in Python
+    (pandas groupby, with the `aggFunc` of the value columns): the grid only
+    receives the group rows of one level, and clicking a group loads its
+    children. A breadcrumb above the grid goes back up. The column filters
+    and sorting of the grid are not pushed down in this mode: they apply in
+    the browser to the rows of the level shown, and the group counts and
+    aggregates always cover every row (or every `quick_search` match).
+
+    Above `column_virtualisation_threshold` columns the grid only renders
+    the visible columns (None = never, the default); the columns then keep
+    their widths instead of being fitted to the view. With
+    `estimate_column_widths=True` the initial width of each column is
+    computed in Python (header length and a quantile of the text length of
+    a row sample) and the grid skips its autosize pass.
+
+    `dataframe` can also be an iterator of dataframe chunks (a SQL cursor,
+    `pd.read_csv(..., chunksize=...)`): the first chunk is rendered at once
+    and the script reruns to append the next batches (at least
+    `chunk_batch_rows` rows each, doubling with the rows loaded). The
+    iterator of the first run is kept in `st.session_state` under `key`
+    (required); pass a new `data_version` to read the data again. Without a
+    `data_version`, pass the same iterator object on every rerun: a new one
+    starts the loading again. While loading,
+    `st.session_state[f"{key}__loading"]` is True. How the next batch is
+    requested depends on `chunk_rerun`:
+
+    - 'app' (default): easy_table calls `st.rerun()` right after rendering.
+      WARNING: this stops the script at the table on every batch, so the
+      code below easy_table does not run and the response is not returned
+      until every chunk is loaded.
+    - 'fragment': `st.rerun(scope="fragment")`; call easy_table inside an
+      `@st.fragment` so only the fragment reruns.
+    - 'none': easy_table returns normally and never reruns; the caller
+      checks the loading flag and calls `st.rerun()` when it is done.
+
+    With `row_model='paged'` only one block of `block_size` rows is sent to
+    the browser; a page selector above the grid serves the other blocks from
+    the Python frame. With `filter_pushdown` (and a `key`) the column
+    filters and sorting of the grid are applied to the whole frame in
+    Python (vectorized, cached per filter state) before paging.
+    `data_version` identifies the data in the caches (it is computed from
+    the values when not given).
+
+    `quick_search=True` shows a search box above the grid over the `col_text`
+    columns (or an explicit list of fields). It is served by a trigram index
+    built in Python once per data version (updated incrementally when rows
+    change, matched by index label): only the matching rows are sent to the
+    grid, or paged.
+
+    `on_metrics` receives a `table_metrics` with the duration of each phase
+    and the byte size of gridOptions and rows (see also `capture_metrics`).
+
+    st_aggrid sends the rows as an Apache Arrow buffer; `transport='auto'`
+    falls back to JSON records when a column cannot be converted, 'arrow'
+    raises instead and 'json' always sends JSON records (see `transport`).
+
+    With `dict_encode=True` the `category` columns and the string columns
+    with at most `dict_encode_ratio` distinct values per row (or an explicit
+    list of columns) are sent as integer codes plus one lookup table, decoded
+    in the browser by a valueGetter. The rows returned by the grid (e.g.
+    `selected_rows`) keep the codes of those columns.
+
+    With `precompute_set_filters=True` the distinct values of the
+    `agSetColumnFilter` columns are computed in Python (cached per data
+    version) and passed as `filterParams.values`; `set_filter_counts=True`
+    also shows the number of rows of each value. Pass a `data_version`
+    along: without it every set-filter column is hashed on each rerun.
+
+    `row_id` gives every row a stable id (a unique key column, or True to
+    hash the dataframe index) used as `getRowId`: new data is applied by the
+    grid as a transaction, re-rendering only the added, removed and changed
+    rows and keeping scroll and selection. With a `key`, the delta against
+    the previous render is stored in `st.session_state[f"{key}__row_delta"]`.
+    Pass a `data_version` along: the ids and row hashes are then computed
+    once per version instead of on every rerun.
+
+    With `selection_response='ids'` the rows are identified by their position
+    in `dataframe` and the grid only returns the selected ids and its state
+    (`DataReturnMode.CUSTOM`, the response has no `selected_rows`); read the
+    selection with `selected_data(response, dataframe)` (a positional `take`,
+    original dtypes kept). Positional ids are not tracked as a row delta.
+
+    Returns:
+        response.selected_rows
+    '''
+
+    tracer = start_trace(key=key, callback=on_metrics)
+
+    ## CHUNKED DATA
+    chunked = None
+    if not isinstance(dataframe, pd.DataFrame):
+        chunked = chunked_source(dataframe, key=key, version=data_version, batch_rows=chunk_batch_rows)
+        dataframe = chunked.load_batch()
+        if data_version is not None:
+            # El frame crece en cada lote: la version de los caches incluye las filas
+            data_version = (data_version, chunked.row_count)
+        st.session_state[f"{key}__loading"] = not chunked.exhausted
+        if not chunked.exhausted:
+            st.caption(f"Cargando... {chunked.row_count:,} filas")
+        if chunk_rerun not in ('app', 'fragment', 'none'):
+            raise ValueError(f"Unknown chunk_rerun: {chunk_rerun!r}")
+        tracer.lap('chunks')
+
+    ## DATAFRAME
+    # Los modelos paged/grouped solo envian frames nuevos (bloques, grupos): sin copia completa
+    df = _table_frame(dataframe, copy_data=copy_data and row_model == 'client')
+    tracer.lap('copy')
+
+    # ---------------------------------------------------------------
+    #  AUTO-CALCULAR maxAbs PARA col_bar (búsqueda recursiva)
+    # ---------------------------------------------------------------
+    if columns_list:
+        auto_scale_col_bars(df, columns_list, version=data_version)
+    tracer.lap('col_bar_scale')
+
+    spec = compile_columns(columns_list) if columns_list else None
+    tracer.lap('column_spec')
+
+    ## ROW MODEL
+    full_df = df
+    grid_key = key
+    positions = None # posiciones en full_df de las filas enviadas (None = todas)
+    group_level = None
+
+    ## QUICK SEARCH
+    query, hits = '', None # hits: posiciones en full_df que contienen la busqueda
+    if quick_search:
+        if tree_data:
+            raise ValueError("quick_search is not supported with tree_data")
+        fields = text_fields(columns_list) if quick_search is True else list(quick_search)
+        if not fields:
+            raise ValueError("quick_search=True requires col_text columns (or a list of fields)")
+        query, hits = search_box(df, fields, key=key, version=data_version)
+        tracer.lap('quick_search')
+
+    if row_model == 'paged':
+        source = DataFrameSource(df, block_size=block_size, version=data_version, positions=hits, view=query or None)
+        if filter_pushdown and key is not None:
+            # Filtros y orden de la grid (estado del rerun anterior) aplicados al frame completo
+            filter_model, sort_model = grid_models(st.session_state.get(key))
+            if filter_model or sort_model:
+                view_positions = filtered_positions(df, filter_model, sort_model, version=source.version)
+                if view_positions is None: # modelos de columnas que no estan en el frame: todas las filas
+                    view_positions = np.arange(len(df))
+                if hits is not None:
+                    view_positions = view_positions[np.isin(view_positions, hits)]
+                source.positions = view_positions
+                source.view = fingerprint(filter_model, sort_model, query)
+        block = page_selector(source, key=key)
+        df = source.block(block)
+        positions = source.block_positions(block)
+    elif row_model == 'grouped':
+        group_by = [f for f in (spec.fields if spec else []) if spec.get(f).get('rowGroup')]
+        if not group_by:
+            raise ValueError("row_model='grouped' requires at least one column with rowGroup=True")
+        aggs = {f: spec.get(f)['aggFunc'] for f in spec.fields if spec.get(f).get('aggFunc')}
+        if hits is not None:
+            df = df.take(hits)
+        grouped = GroupedSource(
+            df,
+            group_by=group_by,
+            aggs=aggs,
+            version=data_version if hits is None or data_version is None else (data_version, query),
+        )
+        group_path = group_path_selector(grouped, key=key)
+        # Una instancia de grid por nivel: la seleccion de un nivel no se arrastra al siguiente
+        grid_key = f"{key or 'easy_table'}__level{len(group_path)}"
+        if grouped.is_leaf(group_path):
+            df = grouped.leaves(group_path)
+            positions = grouped.positions(group_path)
+            if hits is not None:
+                positions = hits[positions]
+        else:
+            group_level = group_by[len(group_path)]
+            df = group_rows = grouped.groups(group_path)
+            spec, select_checkbox, row_grouping = None, False, False
+            selection_response, row_id, selection_multiple = 'ids', None, False
+    elif row_model == 'client':
+        if hits is not None:
+            df = df.take(hits)
+            positions = hits
+    else:
+        raise ValueError(f"Unknown row_model: {row_model!r}")
+    if tree_data and row_model != 'client':
+        raise ValueError("tree_data requires row_model='client'")
+    tracer.lap('row_model')
+
+    ## GRID OPTIONS
+    build_args = dict(
+        columns_list=spec,
+        cell_style=cell_style,
+        header_style=header_style,
+        select_checkbox=select_checkbox,
+        selection_multiple=selection_multiple,
+        suppressMovableColumns=suppressMovableColumns,
+        floatingFilter=floatingFilter,
+        statusbar=statusbar,
+        sidebar=sidebar,
+        row_height=row_height,
+        row_grouping=row_grouping,
+        theme=theme,
+    )
+    if cache_grid_options:
+        # La spec compilada ya trae su huella: no recorrer de nuevo el arbol
+        cache_key = digest((schema_fingerprint(df), dict(build_args, columns_list=spec and spec.fingerprint)))
+        tracer.lap('fingerprint')
+        cached = grid_options_cache.get(cache_key)
+        if tracer.enabled:
+            tracer.metrics.grid_options_cache_hit = cached is not None
+        if cached is None:
+            template, _theme = build_grid_options(df, **build_args, tracer=tracer)
+            cached = grid_options_cache.put(cache_key, (template, _theme, _freeze_options(template)))
+        # AgGrid reescribe los JsCode del dict recibido: nunca entregar los contenedores cacheados
+        template, _theme, marked = cached
+        grid_options = _thaw_options(template, marked)
+        tracer.lap('cache_copy')
+    else:
+        # Los columnDefs de la spec son compartidos: copiar antes de entregarlos
+        template, _theme = build_grid_options(df, **build_args, tracer=tracer)
+        grid_options = _thaw_options(template, _freeze_options(template))
+
+    ## SET FILTERS
+    if precompute_set_filters:
+        use_set_filter_values(grid_options, full_df, version=data_version, counts=set_filter_counts)
+        tracer.lap('set_filters')
+
+    ## ROW IDS
+    delta_key = key
+    if selection_response == 'ids' and (row_id is None or row_id is False):
+        # Ids posicionales: la seleccion se resuelve con take() sobre el dataframe original
+        row_id = positions if positions is not None else np.arange(len(df))
+        delta_key = None # una posicion no identifica a la fila: sin hashes ni snapshot
+    elif selection_response not in ('rows', 'ids'):
+        raise ValueError(f"Unknown selection_response: {selection_response!r}")
+    if row_id is not None and row_id is not False:
+        # La version solo identifica las filas si se envian todas
+        df, delta = use_row_ids(grid_options, df, row_id, key=delta_key, version=data_version if positions is None else None)
+        if tracer.enabled and delta is not None:
+            tracer.metrics.rows_added = len(delta.added)
+            tracer.metrics.rows_changed = len(delta.changed)
+            tracer.metrics.rows_removed = len(delta.removed)
+        tracer.lap('row_ids')
+
+    ## TREE DATA
+    if tree_data:
+        df = use_tree_data(
+            grid_options,
+            df,
+            level_col=tree_level_col,
+            parent_col=tree_parent_col,
+            id_col=tree_id_col,
+            version=data_version,
+            cell_style=cell_style.to_dict(),
+        )
+        tracer.lap('tree_data')
+
+    ## BAR COLUMNS
+    if columns_list and group_level is None:
+        # Porcentaje de las col_bar(performance=True): solo de las filas enviadas
+        bars = bar_percent_columns(df, columns_list)
+        if bars:
+            df = with_columns(df, bars)
+            tracer.lap('bar_columns')
+
+    ## HEATMAP BINS
+    if columns_list and group_level is None:
+        # Cuantiles del frame completo (misma escala en todas las paginas), bins de las filas enviadas
+        heat_bins = heat_bin_columns(df, columns_list, reference=full_df, version=data_version)
+        if heat_bins:
+            df = with_columns(df, heat_bins)
+            tracer.lap('heatmap_bins')
+
+    ## SPARKLINES
+    sparklines = dict()
+    if columns_list and group_level is None:
+        # Series reducidas de las filas enviadas (la version solo vale si son todas las filas)
+        sparklines = sparkline_columns(df, columns_list, version=data_version if positions is None else None)
+        if sparklines:
+            df = with_columns(df, sparklines)
+            tracer.lap('sparklines')
+
+    ## COLUMN LAYOUT
+    # Anchos de las filas enviadas (la version solo vale si son todas las filas)
+    virtualised = use_column_layout(
+        grid_options,
+        df,
+        virtualisation_threshold=column_virtualisation_threshold,
+        estimate=estimate_column_widths,
+        version=data_version if positions is None else None,
+    )
+    fixed_widths = estimate_column_widths or virtualised
+    if fixed_widths:
+        # Anchos ya calculados, o columnas virtualizadas (ajustarlas a la vista las pinta todas)
+        fit_columns_on_grid_load = False
+        grid_options.pop('autoSizeStrategy', None)
+    tracer.lap('column_layout')
+
+    ## DICTIONARY ENCODING
+    if dict_encode:
+        df, dicts = dict_encode_columns(
+            df,
+            columns=dict_encode,
+            max_ratio=dict_encode_ratio,
+            # Las listas de las sparklines no se codifican (el renderer lee los valores)
+            exclude=value_getter_fields(grid_options["columnDefs"]) + list(sparklines),
+        )
+        if dicts:
+            use_dict_encoding(grid_options, dicts)
+        tracer.lap('dict_encode')
+
+    ## GROUP ROWS
+    if group_level is not None:
+        # Click en una fila de grupo = expandirla (carga sus hijos en el siguiente rerun)
+        grid_options['suppressRowClickSelection'] = False
+        grid_options.pop('rowGroupPanelShow', None)
+        for col in grid_options['columnDefs']:
+            if col.get('field') == GROUP_COUNT_FIELD:
+                col['headerName'] = 'Filas'
+
+    ## TRANSPORT
+    use_json_serialization = json_serialization(transport)
+
+    if tracer.enabled:
+        tracer.measure_payload(grid_options, df, transport=transport)
+        tracer.restart() # el coste de medir no cuenta como fase
+
+    ## RESPONSE
+    return_args = dict()
+    if selection_response == 'ids':
+        # Solo los ids seleccionados vuelven a Python, no los datos de las filas
+        return_args = dict(data_return_mode=DataReturnMode.CUSTOM, custom_jscode_for_grid_return=SELECTED_IDS_RETURN)
+
     ## TABLE
-    return AgGrid(
+    response = AgGrid(
         data=df,
         gridOptions=grid_options,
-        key=key,
+        key=grid_key,
         enable_enterprise_modules=enterprise,  # necesario para aggregation
         allow_unsafe_jscode=True,
+        use_json_serialization=use_json_serialization,
 
         height=height,  # opcional, ignora alto fijo
         fit_columns_on_grid_load = fit_columns_on_grid_load,
         # columns_auto_size_mode = ColumnsAutoSizeMode.FIT_ALL_COLUMNS_TO_VIEW,
-        columns_auto_size_mode = "FIT_ALL_COLUMNS_TO_VIEW",
+        columns_auto_size_mode = "NO_AUTOSIZE" if fixed_widths else "FIT_ALL_COLUMNS_TO_VIEW",
         # domLayout="autoHeight",
         # theme='dark' if dark_theme else 'light',
         # theme=_theme if theme in [Theme.DARK, Theme.LIGHT] else 'streamlit',
-        theme=_theme if theme in ['dark', 'light'] else 'streamlit', # streamlit / alpine / balham
+        theme=_theme, # streamlit / alpine / balham
+        custom_css=heatmap_css(columns_list) if columns_list and group_level is None else None,
         
         # update_on=['selectionChanged'],
+        **return_args,
     )
+    tracer.lap('aggrid')
+    tracer.finish()
+
+    if group_level is not None:
+        ids = selected_ids(response)
+        if ids:
+            # Valor del grupo antes de dict_encode (df ya lleva los codigos)
+            expand_group(grouped, group_path, group_rows[group_level].iloc[int(ids[0])], key=key)
+            st.rerun()
+
+    # Siguiente lote de chunks en el siguiente rerun (la tabla ya se ha pintado)
+    if chunked is not None and not chunked.exhausted:
+        if chunk_rerun == 'app':
+            st.rerun()
+        elif chunk_rerun == 'fragment':
+            st.rerun(scope="fragment")
+
+    return response
 
@@ -0,0 +1,170 @@
+'''
+Row data transport of `easy_table`
+
+st_aggrid already sends the `data` frame as an Apache Arrow IPC buffer
+(a Streamlit component dataframe argument) and the grid builds its rows in
+the browser; `easy_table(..., transport=...)` only chooses the
+`use_json_serialization` of AgGrid:
+
+- 'auto': Arrow, retried as JSON records when pyarrow cannot convert a
+  column (mixed types, dicts...);
+- 'arrow': Arrow only, conversion errors are raised;
+- 'json': JSON records inside `gridOptions.rowData`.
+
+On a 100k x 4 frame (float, int, 3-value string, datetime) the Arrow
+buffer is ~3.0 MB built in ~10 ms and the JSON records ~5.4 MB in ~140 ms;
+`row_payload_bytes` reports the size for `table_metrics`.
+
+Low-cardinality string columns (and `category` dtype) can also be
+dictionary-encoded with `easy_table(..., dict_encode=True)`: the rows carry
+integer codes and one lookup table per column travels in the grid
+`context`. A shared valueGetter decodes them in the browser, so rendering,
+filtering, sorting and export keep using the real values.
+
+Functions
+---------
+json_serialization
+row_payload_bytes
+dict_encode_columns
+value_getter_fields
+use_dict_encoding
+'''
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from st_aggrid import JsCode
+
+from easy_st_aggrid.frame import with_columns
+
+TRANSPORTS = {"auto": "auto", "arrow": False, "json": True} # -> AgGrid(use_json_serialization=...)
+
+
+def json_serialization(transport: str) -> Union[bool, str]:
+    '''
+    Value of `AgGrid(use_json_serialization=...)` for an easy_table transport
+    '''
+    try:
+        return TRANSPORTS[transport]
+    except KeyError:
+        raise ValueError(f"Unknown transport: {transport!r}") from None
+
+
+def row_payload_bytes(df: 'pd.DataFrame', transport: str = 'auto') -> int:
+    '''
+    Size of the rows as st_aggrid sends them: the Arrow IPC buffer of the
+    component argument, or the JSON records of `gridOptions.rowData`
+    '''
+    if json_serialization(transport) is True:
+        return len(df.to_json(orient='records').encode('utf-8'))
+    from streamlit import dataframe_util
+    return len(dataframe_util.convert_pandas_df_to_arrow_bytes(df, downcast_large_types=True))
+
+
+## DICTIONARY ENCODING
+DICT_VALUE_GETTER = JsCode("""
+    function(params) {
+        if (!params.data) return null;
+        const field = params.colDef.field;
+        const code = params.data[field];
+        const dict = ((params.context || {}).easyDicts || {})[field];
+        if (!dict || code === null || code === undefined || code < 0) return null;
+        return dict[code];
+    }
+""")
+
+
+def _json_value(value: Any) -> Any:
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    if hasattr(value, 'item'):
+        return value.item()
+    return value
+
+
+def _encodable(series: 'pd.Series') -> bool:
+    return (
+        isinstance(series.dtype, pd.CategoricalDtype)
+        or pd.api.types.is_object_dtype(series.dtype)
+        or pd.api.types.is_string_dtype(series.dtype)
+    )
+
+
+def dict_encode_columns(
+        df: 'pd.DataFrame',
+        columns: Union[bool, List[str]] = True,
+        max_ratio: float = 0.05,
+        exclude: Optional[List[str]] = None,
+    ) -> Tuple['pd.DataFrame', Dict[str, List[Any]]]:
+    '''
+    Replaces low-cardinality columns by integer codes
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+    columns : bool or List[str]
+        Explicit list of columns to encode, or True to detect them:
+        `category` dtype, or string/object columns whose number of distinct
+        values is at most `max_ratio` of the rows.
+    max_ratio : float
+    exclude : List[str] or None
+        Columns never encoded.
+
+    Returns
+    -------
+    (df, dicts) : the encoded frame (only the encoded columns are new
+    arrays) and the lookup table of each column. Nulls are coded as -1.
+    '''
+    exclude = set(exclude or ())
+    explicit = not isinstance(columns, bool)
+    candidates = columns if explicit else [c for c in df.columns if _encodable(df[c])]
+
+    encoded, dicts = dict(), dict()
+    for col in candidates:
+        if col in exclude or col not in df.columns or str(col).startswith('__'):
+            continue
+        series = df[col]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            codes, uniques = series.cat.codes.to_numpy(), series.cat.categories
+        else:
+            codes, uniques = pd.factorize(series, use_na_sentinel=True)
+            if not explicit and len(uniques) > max_ratio * len(series):
+                continue
+        dtype = np.int8 if len(uniques) < 2**7 else np.int16 if len(uniques) < 2**15 else np.int32
+        encoded[col] = codes.astype(dtype, copy=False)
+        dicts[col] = [_json_value(v) for v in uniques]
+
+    if not encoded:
+        return df, dicts
+    return with_columns(df, encoded), dicts
+
+
+def value_getter_fields(column_defs: List[Dict[str, Any]]) -> List[str]:
+    '''
+    Returns the fields that already define their own valueGetter (they must
+    not be encoded)
+    '''
+    fields = []
+    for col in column_defs:
+        if col.get('children'):
+            fields.extend(value_getter_fields(col['children']))
+        elif col.get('valueGetter') is not None and col.get('field'):
+            fields.append(col['field'])
+    return fields
+
+
+def use_dict_encoding(grid_options: Dict[str, Any], dicts: Dict[str, List[Any]]) -> None:
+    '''
+    Adds the lookup tables to the grid context and the decoding valueGetter
+    to the encoded columns (any level of children)
+    '''
+    grid_options.setdefault("context", {})["easyDicts"] = dicts
+
+    def walk(column_defs):
+        for col in column_defs:
+            if col.get('children'):
+                walk(col['children'])
+            elif col.get('field') in dicts:
+                col['valueGetter'] = DICT_VALUE_GETTER
+
+    walk(grid_options.get("columnDefs", []))
@@ -0,0 +1,210 @@
+'''
+Tree data for `easy_table`
+
+AG Grid tree data needs the path of every row (the keys of its ancestors
+and its own key). The paths are built in Python with vectorized NumPy
+operations, from either:
+
+- a level column, with the rows in depth-first order (each row is a
+  child of the closest previous row with a lower level), or
+- a parent-id column (`None`/NaN for the roots), in any row order.
+
+They travel as a native list column (`__path__`) that `getDataPath`
+returns as is, so the browser does not parse anything per row. Results
+are cached per data version.
+
+Tree data is an AG Grid enterprise feature (`easy_table(..., enterprise=True)`).
+
+Functions
+---------
+level_ancestors
+parent_ancestors
+tree_paths
+use_tree_data
+'''
+from typing import Any, Dict, Hashable, Optional
+
+import numpy as np
+import pandas as pd
+from st_aggrid import JsCode
+
+from easy_st_aggrid.cache import LRUCache, data_version
+from easy_st_aggrid.frame import with_columns
+
+TREE_PATH_FIELD = '__path__'
+
+## CACHE
+# Columna de paths por (version de datos, columnas del arbol)
+tree_path_cache = LRUCache(maxsize=16)
+
+# Con el transporte Arrow de st_aggrid las listas llegan como Vector de Arrow, no como Array
+TREE_DATA_PATH = JsCode("""
+    function(data) {
+        const path = data.__path__;
+        return Array.isArray(path) ? path : Array.from(path || []);
+    }
+""")
+
+
+def level_ancestors(levels: 'pd.Series') -> np.ndarray:
+    '''
+    Ancestor matrix of a depth-first ordered frame with a level column
+
+    Returns an (n, depth) int array: column `l` holds the position of the
+    ancestor at depth `l` (the row itself at its own depth) and -1 beyond
+    the depth of the row. One running maximum per distinct level.
+    '''
+    if levels.isna().any():
+        raise ValueError("tree_level_col has null values.")
+    # Niveles densos 0..L-1 (admite niveles empezando en 0 o 1, o con saltos)
+    uniques, depth = np.unique(levels.to_numpy(), return_inverse=True)
+    depth = depth.ravel()
+    n = len(depth)
+    positions = np.arange(n)
+
+    ancestors = np.full((n, len(uniques)), -1, dtype=np.int64)
+    for level in range(len(uniques)):
+        # Ultima fila de ese nivel en o antes de cada fila
+        last = np.maximum.accumulate(np.where(depth == level, positions, -1))
+        mask = depth >= level
+        ancestors[mask, level] = last[mask]
+
+    # Cada ancestro debe existir y venir despues del ancestro de nivel superior
+    valid = (ancestors >= 0) | (np.arange(len(uniques)) > depth[:, None])
+    valid[:, 1:] &= (ancestors[:, 1:] >= ancestors[:, :-1]) | (ancestors[:, 1:] < 0)
+    if not valid.all():
+        row = int(np.flatnonzero(~valid.all(axis=1))[0])
+        raise ValueError(
+            f"tree_level_col is not in depth-first order: row {row} has no parent row before it."
+        )
+    return ancestors
+
+
+def parent_ancestors(ids: 'pd.Series', parents: 'pd.Series') -> np.ndarray:
+    '''
+    Ancestor matrix from an id column and a parent-id column
+
+    Same layout as `level_ancestors`. The parent pointers are resolved with
+    one index lookup and followed for all the rows at once, one step per
+    level of the tree.
+    '''
+    index = pd.Index(ids)
+    if not index.is_unique:
+        raise ValueError("tree_id_col has duplicated values.")
+    parent_pos = index.get_indexer(parents)
+    orphan = (parent_pos < 0) & parents.notna().to_numpy()
+    if orphan.any():
+        row = int(np.flatnonzero(orphan)[0])
+        raise KeyError(f"Parent id not found: {parents.iloc[row]!r} (row {row})")
+
+    n = len(index)
+    # Cadena de ancestros: self, padre, abuelo... (-1 al llegar a la raiz)
+    chain = [np.arange(n)]
+    current = parent_pos
+    while (current >= 0).any():
+        if len(chain) > n:
+            raise ValueError("tree_parent_col contains a cycle.")
+        chain.append(current)
+        current = np.where(current >= 0, parent_pos[np.maximum(current, 0)], -1)
+
+    chain = np.stack(chain, axis=1)
+    depth = (chain >= 0).sum(axis=1) - 1
+    # Invertir cada fila: raiz primero, la propia fila en su profundidad
+    steps = depth[:, None] - np.arange(chain.shape[1])[None, :]
+    ancestors = np.take_along_axis(chain, np.maximum(steps, 0), axis=1)
+    return np.where(steps >= 0, ancestors, -1)
+
+
+def tree_paths(
+        df: 'pd.DataFrame',
+        level_col: Optional[str] = None,
+        parent_col: Optional[str] = None,
+        id_col: Optional[str] = None,
+    ) -> np.ndarray:
+    '''
+    Returns the path of every row (object array of lists of str)
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+    level_col : str or None
+        Level of each row; rows in depth-first order.
+    parent_col : str or None
+        Parent id of each row (requires `id_col`).
+    id_col : str or None
+        Key of each row in the paths. The row position if not given
+        (only with `level_col`).
+    '''
+    if parent_col is not None:
+        if id_col is None:
+            raise ValueError("tree_parent_col requires tree_id_col")
+        ancestors = parent_ancestors(df[id_col], df[parent_col])
+    elif level_col is not None:
+        ancestors = level_ancestors(df[level_col])
+    else:
+        raise ValueError("tree_data requires tree_level_col or tree_parent_col")
+
+    if id_col is not None:
+        keys = df[id_col].astype(str).to_numpy(dtype=object)
+    else:
+        keys = np.arange(len(df)).astype(str).astype(object)
+
+    # Un bloque por profundidad: filas de igual longitud de path -> un solo tolist()
+    paths = np.empty(len(df), dtype=object)
+    depth = (ancestors >= 0).sum(axis=1)
+    for d in np.unique(depth):
+        rows = np.flatnonzero(depth == d)
+        paths[rows] = pd.Series(keys[ancestors[rows, :d]].tolist(), dtype=object).to_numpy()
+    return paths
+
+
+def use_tree_data(
+        grid_options: Dict[str, Any],
+        df: 'pd.DataFrame',
+        level_col: Optional[str] = None,
+        parent_col: Optional[str] = None,
+        id_col: Optional[str] = None,
+        version: Optional[Hashable] = None,
+        cell_style: Optional[Dict[str, Any]] = None,
+    ) -> 'pd.DataFrame':
+    '''
+    Turns gridOptions into a tree-data grid and returns the frame with the
+    `__path__` column
+
+    Parameters
+    ----------
+    grid_options : Dict[str, Any]
+    df : pd.DataFrame
+    level_col, parent_col, id_col : str or None
+        See `tree_paths`.
+    version : Hashable or None
+        Identifier of the data. If None, the tree columns are hashed.
+    cell_style : Dict or None
+        cellStyle of the tree column.
+    '''
+    tree_cols = [c for c in (level_col, parent_col, id_col) if c is not None]
+    if version is None:
+        version = data_version(df, tree_cols)
+    cache_key = (version, len(df), level_col, parent_col, id_col)
+    paths = tree_path_cache.get(cache_key)
+    if paths is None:
+        paths = tree_path_cache.put(cache_key, tree_paths(df, level_col, parent_col, id_col))
+
+    grid_options['treeData'] = True
+    grid_options['animateRows'] = True
+    grid_options['getDataPath'] = TREE_DATA_PATH
+    grid_options['groupDefaultExpanded'] = -1 # -1 = Todo expandido
+    grid_options.pop('rowGroupPanelShow', None)
+    auto_tree_column = {
+        "headerName": "Nivel",
+        "width": 60 if level_col else 200,
+        "suppressSizeToFit": True, #PARA QUE NO SE AJUSTE
+        "cellRendererParams": {"suppressCount": True},
+    }
+    if level_col:
+        auto_tree_column["field"] = level_col
+    if cell_style:
+        auto_tree_column["cellStyle"] = cell_style
+    grid_options['autoGroupColumnDef'] = auto_tree_column
+
+    return with_columns(df, {TREE_PATH_FIELD: paths})
@@ -0,0 +1,52 @@
+'''
+Shared fixtures: `easy_table` runs against a stand-in of `AgGrid`
+
+The stand-in prepares the data exactly like st_aggrid (it calls
+`_parse_data_and_grid_options`, which modifies the frame it receives) and
+records every call instead of rendering the component.
+'''
+from types import SimpleNamespace
+
+import pytest
+import streamlit as st
+from st_aggrid.aggrid_utils import _parse_data_and_grid_options
+
+import easy_st_aggrid.table as table
+
+
+class GridCalls:
+    def __init__(self):
+        self.calls = []
+        self.reruns = [] # scope de cada st.rerun
+        self.response = SimpleNamespace(selected_rows=None, selected_rows_id=None, grid_state=None)
+
+    def __call__(self, data=None, gridOptions=None, **kwargs):
+        default_column_parameters = {k: v for k, v in kwargs.items() if k == 'fit_columns_on_grid_load'}
+        data, grid_options, _ = _parse_data_and_grid_options(
+            data, gridOptions, default_column_parameters, kwargs.get('allow_unsafe_jscode', False),
+            kwargs.get('use_json_serialization') is True,
+        )
+        self.calls.append(SimpleNamespace(data=data, grid_options=grid_options, kwargs=kwargs))
+        return self.response
+
+    @property
+    def last(self):
+        return self.calls[-1]
+
+
+@pytest.fixture(autouse=True)
+def session_state():
+    for k in list(st.session_state.keys()):
+        del st.session_state[k]
+    yield st.session_state
+    for k in list(st.session_state.keys()):
+        del st.session_state[k]
+
+
+@pytest.fixture
+def grid(monkeypatch):
+    calls = GridCalls()
+    monkeypatch.setattr(table, 'AgGrid', calls)
+    # Sin ScriptRunContext st.rerun no puede relanzar el script
+    monkeypatch.setattr(table.st, 'rerun', lambda scope='app': calls.reruns.append(scope))
+    return calls
@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+
+from easy_st_aggrid import easy_table, col_base, col_bar
+from easy_st_aggrid.col_bar import bar_percent_columns, bar_field, max_abs_cache
+from easy_st_aggrid.renderers import RENDERERS, BAR_RENDERER_LITE
+
+
+def test_percent_columns_vectorized():
+    df = pd.DataFrame({'delta': [10.0, -5.0, 40.0, None], 'label': ['x', 'y', 'z', 'w']})
+    bars = bar_percent_columns(df, [col_bar(id='delta', max_abs=20, performance=True), col_bar(id='label', max_abs=1)])
+    assert list(bars) == [bar_field('delta')] # solo las col_bar(performance=True)
+    pct = bars[bar_field('delta')]
+    assert pct.dtype == np.float32
+    assert pct[:3].tolist() == [25.0, -12.5, 50.0] # recortado a media barra
+    assert np.isnan(pct[3])
+
+
+def test_single_element_bar_in_table(grid):
+    max_abs_cache.clear()
+    df = pd.DataFrame({'delta': [10.0, -40.0, 20.0], 'name': list('abc')})
+    columns = [col_base(alias='G', children=[col_bar(id='delta', performance=True)])]
+    easy_table(df, columns_list=columns)
+    col = grid.last.grid_options['columnDefs'][0]['children'][0]
+    assert col['cellRenderer'] == BAR_RENDERER_LITE
+    assert col['cellRendererParams'] == {'maxAbs': 40.0, 'pctField': '__bar_delta'}
+    assert grid.last.data['__bar_delta'].tolist() == [12.5, -50.0, 25.0]
+    assert '__bar_delta' not in df.columns
+    # Un solo nodo por celda: pista, linea y barra son gradientes del propio div
+    js = RENDERERS[BAR_RENDERER_LITE].js_code
+    assert js.count('document.createElement(') == 2 # el div de la celda y la hoja de estilos global
+
+
+def test_explicit_max_abs_replaces_auto_scale(grid):
+    max_abs_cache.clear()
+    df = pd.DataFrame({'delta': [10.0, -40.0, 20.0]})
+    bar = col_bar(id='delta')
+    easy_table(df, columns_list=[bar], data_version='v')
+    assert bar.max_abs == 40.0
+
+    bar.max_abs = 100
+    for _ in range(2):
+        easy_table(df, columns_list=[bar], data_version='v')
+        assert bar.max_abs == 100
+        assert grid.last.grid_options['columnDefs'][0]['cellRendererParams'] == {'maxAbs': 100}
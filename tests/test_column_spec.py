@@ -0,0 +1,81 @@
+import pandas as pd
+import pytest
+
+from easy_st_aggrid import easy_table, col_base, col_text, col_bar
+from easy_st_aggrid.column_spec import compile_columns, spec_cache, tree_cache
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    spec_cache.clear()
+    tree_cache.clear()
+
+
+def _columns():
+    return [
+        col_text(id='name', alias='NAME'),
+        col_base(id='group', alias='GROUP', children=[col_text(id='city', alias='CITY')]),
+    ]
+
+
+def test_rebuilt_tree_hits_cache():
+    first = compile_columns(_columns())
+    columns = _columns()
+    second = compile_columns(columns)
+    assert spec_cache.info()['hits'] == 1
+    assert second.fingerprint == first.fingerprint
+    assert second.columns_list[0] is columns[0]
+    assert second.fields == ['name', 'city']
+
+
+def test_in_place_changes_recompile():
+    columns = _columns()
+    spec = compile_columns(columns)
+    columns[1].children[0].kwargs['tooltipField'] = 'name'
+    assert spec.is_stale
+    updated = compile_columns(columns)
+    assert updated.get('city')['tooltipField'] == 'name'
+    assert 'tooltipField' not in spec.get('city')
+
+    columns[0].alias = 'NOMBRE'
+    assert compile_columns(columns).get('name')['headerName'] == 'NOMBRE'
+
+
+def test_same_columns_skip_the_walk(monkeypatch):
+    columns = _columns()
+    spec = compile_columns(columns)
+    walks = []
+    monkeypatch.setattr(col_text, 'data', lambda self: walks.append(self) or {})
+    assert compile_columns(columns) is spec
+    assert compile_columns(list(columns)) is spec
+    assert walks == []
+    assert not spec.is_stale
+
+    columns[1].children.append(col_text(id='zip'))
+    assert spec.is_stale
+    compile_columns(columns)
+    assert len(walks) == 3 # la columna nueva obliga a recompilar el arbol
+
+
+def test_auto_scaled_bar_keeps_the_spec(grid):
+    df = pd.DataFrame({'delta': [1.0, -4.0]})
+    columns = [col_bar(id='delta')]
+    easy_table(df, columns_list=columns)
+    spec = compile_columns(columns)
+    assert spec.get('delta')['cellRendererParams'] == {'maxAbs': 4.0}
+    easy_table(df, columns_list=columns) # mismo max_abs: la columna no cambia
+    assert compile_columns(columns) is spec
+    easy_table(df * 2, columns_list=columns)
+    assert compile_columns(columns).get('delta')['cellRendererParams'] == {'maxAbs': 8.0}
+
+
+def test_user_dunder_column_is_shown(grid):
+    df = pd.DataFrame({'name': ['a'], '__x': [1], '__row_id__': [0], '__bar_name': [0.5]})
+    spec = compile_columns(_columns())
+    assert spec.extra_columns(df.columns) == ['__x']
+    assert spec.export_fields(df.columns) == ['name', 'city', '__x']
+
+    easy_table(df[['name', '__x']], columns_list=_columns())
+    fields = [c.get('field') for c in grid.last.grid_options['columnDefs']]
+    assert '__x' in fields
+    assert '__x' in grid.last.grid_options['defaultExcelExportParams']['columnKeys']
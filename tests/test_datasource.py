@@ -0,0 +1,167 @@
+import numpy as np
+import pandas as pd
+import pytest
+from st_aggrid.aggrid_utils import _parse_data_and_grid_options
+from st_aggrid.collectors.custom import CustomResponse
+
+from easy_st_aggrid import easy_table, col_base
+from easy_st_aggrid.datasource import DataFrameSource, GroupedSource
+
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame({
+        'name': list('abcdef'),
+        'value': [5, 3, 8, 1, 9, 2],
+        'date': pd.date_range('2026-01-01', periods=6),
+    })
+
+
+def _as_aggrid(df):
+    # Mismas modificaciones que AgGrid hace sobre el frame recibido
+    data, _, _ = _parse_data_and_grid_options(df, {'columnDefs': []}, {}, True, False)
+    return data
+
+
+@pytest.mark.parametrize('positions', [None, np.array([5, 3, 1, 0, 2, 4])])
+def test_block_survives_aggrid(frame, positions):
+    source = DataFrameSource(frame, block_size=4, version='v', positions=positions, view='view')
+    sent = _as_aggrid(source.block(0))
+    assert '::auto_unique_id::' in sent.columns
+
+    again = source.block(0)
+    assert list(again.columns) == ['name', 'value', 'date']
+    assert again['date'].dtype.kind == 'M'
+    assert again is not source.block(0)
+    assert list(frame.columns) == ['name', 'value', 'date']
+
+
+def test_block_rows(frame):
+    source = DataFrameSource(frame, block_size=4, positions=np.array([5, 3, 1, 0, 2, 4]))
+    assert source.block_count == 2
+    assert source.block(1)['name'].tolist() == ['c', 'e']
+    with pytest.raises(IndexError):
+        source.block(2)
+
+
+def test_groups_survive_aggrid(frame):
+    frame['group'] = ['x', 'y', 'x', 'y', 'x', 'x']
+    source = GroupedSource(frame, group_by=['group'], aggs={'value': 'sum'}, version='v')
+    _as_aggrid(source.groups())
+    groups = source.groups()
+    assert list(groups.columns) == ['group', '__count__', 'value']
+    assert groups['value'].tolist() == [24, 4]
+
+
+def test_group_count_does_not_collide(grid, frame):
+    frame['group'] = ['x', 'y', 'x', 'y', 'x', 'x']
+    frame['count'] = [1, 1, 1, 1, 1, 1]
+    source = GroupedSource(frame, group_by=['group'], aggs={'count': 'sum', 'value': 'max'}, version='v')
+    groups = source.groups()
+    assert groups['__count__'].tolist() == [4, 2]
+    assert groups['count'].tolist() == [4, 2]
+    assert groups['value'].tolist() == [9, 3]
+
+    columns = [col_base(id='group', rowGroup=True), col_base(id='count', kwargs={'aggFunc': 'sum'})]
+    easy_table(frame, columns_list=columns, row_model='grouped', key='g', data_version='v')
+    headers = {c['field']: c.get('headerName') for c in grid.last.grid_options['columnDefs']}
+    assert headers['__count__'] == 'Filas'
+
+
+def test_paged_block_reused_across_reruns(grid, frame):
+    for _ in range(2):
+        easy_table(frame, key='paged', row_model='paged', block_size=4, data_version='v')
+        fields = [c.get('field') for c in grid.last.grid_options['columnDefs']]
+        assert '::auto_unique_id::' not in fields
+        assert grid.last.grid_options['columnDefs'][fields.index('date')].get('type') != ['textColumn']
+    assert grid.calls[0].grid_options['columnDefs'] == grid.calls[1].grid_options['columnDefs']
+
+
+def test_group_click_expands_decoded_value(grid, session_state, frame):
+    frame['group'] = ['x', 'y', 'x', 'y', 'x', 'x']
+    columns = [col_base(id='group', alias='GROUP', rowGroup=True), col_base(id='value', alias='VALUE', kwargs={'aggFunc': 'sum'})]
+    grid.response = CustomResponse({'selectedRowIds': ['1']})
+    easy_table(frame, columns_list=columns, row_model='grouped', dict_encode=['group'], key='g', data_version='v')
+    assert grid.last.grid_options['context']['easyDicts']['group'] == ['x', 'y']
+    assert session_state['g__group_path'] == ('y',)
+
+    grid.response = CustomResponse(None)
+    easy_table(frame, columns_list=columns, row_model='grouped', dict_encode=['group'], key='g', data_version='v')
+    assert grid.last.data['name'].tolist() == ['b', 'd']
+
+
+def _chunks(frame):
+    return (frame.iloc[i:i + 2] for i in range(0, len(frame), 2))
+
+
+def test_chunks_rerun_the_app(grid, session_state, frame):
+    sizes = []
+    while True:
+        easy_table(_chunks(frame), key='c', data_version='v', chunk_batch_rows=2)
+        sizes.append(len(grid.last.data))
+        if not session_state['c__loading']:
+            break
+    assert sizes == [2, 4, 6]
+    assert grid.reruns == ['app', 'app'] # ninguno con todas las filas cargadas
+
+
+@pytest.mark.parametrize('chunk_rerun, reruns', [('fragment', ['fragment']), ('none', [])])
+def test_chunk_rerun_scope(grid, session_state, frame, chunk_rerun, reruns):
+    response = easy_table(_chunks(frame), key='c', data_version='v', chunk_batch_rows=4, chunk_rerun=chunk_rerun)
+    assert response is grid.response
+    assert session_state['c__loading'] is True
+    assert grid.reruns == reruns
+
+
+def test_page_selector_initialised_through_session_state(grid, session_state, monkeypatch, frame):
+    import streamlit as st
+    inputs = []
+
+    def number_input(label, key=None, **kwargs):
+        inputs.append(kwargs)
+        return st.session_state[key]
+
+    monkeypatch.setattr(st, 'number_input', number_input)
+    easy_table(frame, key='p', row_model='paged', block_size=2, data_version='v')
+    assert session_state['p__page'] == 1
+
+    session_state['p__page'] = 3
+    easy_table(frame.head(3), key='p', row_model='paged', block_size=2, data_version='v2')
+    assert session_state['p__page'] == 2 # la pagina 3 ya no existe
+    assert grid.last.data['name'].tolist() == ['c']
+    assert all('value' not in kwargs for kwargs in inputs)
+
+
+@pytest.mark.parametrize('row_model', ['paged', 'grouped'])
+def test_row_model_does_not_copy_frame(grid, monkeypatch, frame, row_model):
+    copies = []
+    original = pd.DataFrame.copy
+
+    def copy(self, deep=True):
+        if deep and len(self) == len(frame):
+            copies.append(self)
+        return original(self, deep=deep)
+
+    frame['group'] = ['x', 'y', 'x', 'y', 'x', 'x']
+    monkeypatch.setattr(pd.DataFrame, 'copy', copy)
+    columns = [col_base(id='group', rowGroup=row_model == 'grouped'), col_base(id='value')]
+    easy_table(frame, columns_list=columns, key='r', row_model=row_model, block_size=2, data_version='v')
+    assert copies == []
+    assert len(grid.last.data) < len(frame)
+
+
+def test_chunks_require_a_key(grid, frame):
+    with pytest.raises(ValueError, match="key"):
+        easy_table(_chunks(frame), data_version='v')
+
+
+def test_new_chunks_without_version_restart(grid, session_state, frame):
+    chunks = _chunks(frame)
+    easy_table(chunks, key='c', chunk_batch_rows=2, chunk_rerun='none')
+    easy_table(chunks, key='c', chunk_batch_rows=2, chunk_rerun='none')
+    assert len(grid.last.data) == 4 # mismo iterador: sigue cargando
+
+    other = frame.assign(value=0)
+    easy_table(_chunks(other), key='c', chunk_batch_rows=2, chunk_rerun='none')
+    assert len(grid.last.data) == 2
+    assert grid.last.data['value'].tolist() == [0, 0]
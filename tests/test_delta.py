@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import easy_st_aggrid.delta as delta_module
+from easy_st_aggrid import easy_table
+from easy_st_aggrid.delta import compute_row_delta, row_hashes, index_ids, row_ids, row_ids_cache
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    row_ids_cache.clear()
+
+
+def test_first_render_adds_everything():
+    ids = np.array([10, 20, 30])
+    delta = compute_row_delta(None, ids, np.array([1, 2, 3], dtype=np.uint64))
+    assert delta.added.tolist() == [10, 20, 30]
+    assert not len(delta.changed) and not len(delta.removed)
+
+
+def test_added_changed_removed():
+    previous = (np.array([10, 20, 30]), np.array([1, 2, 3], dtype=np.uint64))
+    delta = compute_row_delta(previous, np.array([30, 20, 40]), np.array([3, 9, 4], dtype=np.uint64))
+    assert delta.added.tolist() == [40]
+    assert delta.changed.tolist() == [20]
+    assert delta.removed.tolist() == [10]
+    assert compute_row_delta(previous, *previous).empty
+
+
+def test_row_hashes_follow_content():
+    df = pd.DataFrame({'name': ['a', 'b'], 'tags': [['x'], ['y']]})
+    changed = df.assign(name=['a', 'c'])
+    assert (row_hashes(df) == row_hashes(changed)).tolist() == [True, False]
+    assert index_ids(pd.Index(['a', 'b'])).max() < 2 ** 53
+
+
+def test_delta_between_reruns(grid, session_state):
+    df = pd.DataFrame({'id': [1, 2, 3], 'value': [5, 3, 8]})
+    easy_table(df, key='t', row_id='id')
+    assert session_state['t__row_delta'].added.tolist() == [1, 2, 3]
+
+    easy_table(pd.DataFrame({'id': [2, 3, 4], 'value': [3, 0, 1]}), key='t', row_id='id')
+    delta = session_state['t__row_delta']
+    assert (delta.added.tolist(), delta.changed.tolist(), delta.removed.tolist()) == ([4], [3], [1])
+    assert grid.last.grid_options['context']['easyRowId'] == 'id'
+    assert '::auto_unique_id::' not in grid.last.data.columns
+
+
+def test_index_ids_stable():
+    df = pd.DataFrame({'value': [1, 2, 3]}, index=['a', 'b', 'c'])
+    _, ids = row_ids(df, True)
+    _, reordered = row_ids(df.iloc[[2, 0]].assign(value=[9, 9]), True)
+    assert reordered.tolist() == [ids[2], ids[0]] # el id sigue a la etiqueta, no a la posicion ni al contenido
+    assert (row_ids(df, True)[1] == ids).all()
+
+
+def test_duplicated_keys_rejected():
+    df = pd.DataFrame({'id': [1, 1, 2]}, index=['a', 'a', 'b'])
+    with pytest.raises(ValueError, match='duplicated'):
+        row_ids(df, 'id')
+    with pytest.raises(ValueError, match='duplicated'):
+        row_ids(df, True)
+    with pytest.raises(KeyError):
+        row_ids(df, 'missing')
+
+
+def test_index_ids_delta(grid, session_state):
+    df = pd.DataFrame({'value': [5, 3, 8]}, index=['a', 'b', 'c'])
+    easy_table(df, key='t', row_id=True)
+    ids = dict(zip(df.index, grid.last.data['__row_id__']))
+    easy_table(df.drop(index='a').assign(value=[3, 0]), key='t', row_id=True)
+    delta = session_state['t__row_delta']
+    assert (delta.added.tolist(), delta.changed.tolist(), delta.removed.tolist()) == ([], [ids['c']], [ids['a']])
+
+
+def test_ids_cached_by_data_version(grid, session_state, monkeypatch):
+    hashed = []
+    monkeypatch.setattr(delta_module, 'row_hashes', lambda df: hashed.append(len(df)) or row_hashes(df))
+    df = pd.DataFrame({'value': [5, 3, 8]}, index=['a', 'b', 'c'])
+    for _ in range(2):
+        easy_table(df, key='t', row_id=True, data_version='v1')
+    assert hashed == [3]
+    assert session_state['t__row_delta'].empty
+    first = grid.calls[0].data['__row_id__'].tolist()
+    assert grid.last.data['__row_id__'].tolist() == first
+
+    easy_table(df.assign(value=[5, 3, 0]), key='t', row_id=True, data_version='v2')
+    assert hashed == [3, 3]
+    assert session_state['t__row_delta'].changed.tolist() == [first[2]]
@@ -0,0 +1,94 @@
+import io
+import os
+
+import pandas as pd
+import pytest
+import streamlit as st
+
+import easy_st_aggrid.export as export
+from easy_st_aggrid import col_base, col_text
+from easy_st_aggrid.cache import LRUCache
+from easy_st_aggrid.export import export_button, export_file, export_cache, export_columns, write_csv, write_xlsx
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    export_cache.clear()
+    yield
+    export_cache.clear()
+
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame({'code': ['001', '002'], 'value': [1.5, None]})
+
+
+def test_button_builds_file_on_click(monkeypatch, frame):
+    buttons = []
+    monkeypatch.setattr(st, 'download_button', lambda **kwargs: buttons.append(kwargs) or False)
+    hashed = []
+    monkeypatch.setattr(export, 'data_version', lambda df: hashed.append(df) or 'hash')
+
+    export_button(frame, [col_text(id='code', alias='CODE')], file_format='csv', version='v1')
+    assert callable(buttons[0]['data'])
+    assert len(export_cache) == 0 and not hashed
+
+    with buttons[0]['data']() as f: # fichero abierto: Streamlit lo lee sin copia intermedia
+        assert isinstance(f, io.BufferedReader)
+        content = f.read()
+    assert content.decode('utf-8-sig').splitlines() == ['CODE,value', '001,1.5', '002,']
+    assert len(export_cache) == 1 and not hashed
+
+
+def test_evicted_files_are_deleted(frame):
+    first = export_file(frame, file_format='csv', version='v1')
+    assert export_file(frame, file_format='csv', version='v1') == first
+    second = export_file(frame, file_format='csv', version='v2')
+    assert os.path.exists(first) and os.path.exists(second)
+    export_cache.clear()
+    assert not os.path.exists(first) and not os.path.exists(second)
+
+
+def test_lru_on_evict():
+    evicted = []
+    cache = LRUCache(maxsize=2, on_evict=lambda k, v: evicted.append(k))
+    for k in 'abc':
+        cache.put(k, k.upper())
+    cache.put('c', 'other')
+    assert evicted == ['a', 'c']
+    cache.clear()
+    assert evicted == ['a', 'c', 'b', 'c']
+
+
+def _columns():
+    return [col_base(alias='GROUP', children=[col_text(id='code', alias='CODE')]), col_base(id='value', alias='VALUE')]
+
+
+def test_export_columns_follow_the_grid(frame):
+    frame['extra'] = [1, 2]
+    frame['__row_id__'] = [0, 1] # campo auxiliar de easy_table
+    columns = export_columns(frame, _columns())
+    assert [(c.field, c.header, c.text) for c in columns] == [
+        ('code', 'CODE', True), ('value', 'VALUE', False), ('extra', 'extra', False),
+    ]
+
+
+def test_csv_keeps_text_columns(tmp_path, frame):
+    path = write_csv(frame, str(tmp_path / 'out.csv'), _columns(), chunk_size=1)
+    back = pd.read_csv(path, dtype={'CODE': str}, encoding='utf-8-sig')
+    assert back.columns.tolist() == ['CODE', 'VALUE']
+    assert back['CODE'].tolist() == ['001', '002']
+
+
+def test_xlsx_sheet_rollover(tmp_path, monkeypatch, frame):
+    pytest.importorskip('xlsxwriter')
+    openpyxl = pytest.importorskip('openpyxl')
+    monkeypatch.setattr(export, 'EXCEL_MAX_ROWS', 3) # 2 filas de datos por hoja
+    frame = pd.concat([frame] * 3, ignore_index=True)
+    path = write_xlsx(frame, str(tmp_path / 'out.xlsx'), _columns(), chunk_size=4)
+    book = openpyxl.load_workbook(path)
+    assert book.sheetnames == ['Datos', 'Datos (2)', 'Datos (3)']
+    for sheet in book.worksheets:
+        rows = list(sheet.iter_rows(values_only=True))
+        assert rows == [('CODE', 'VALUE'), ('001', 1.5), ('002', None)]
+        assert sheet['A2'].number_format == '@'
@@ -0,0 +1,107 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import easy_st_aggrid.table as table
+from easy_st_aggrid import easy_table, col_base
+from easy_st_aggrid.filters import set_filter_values, use_set_filter_values, set_filter_cache, filtered_positions
+from easy_st_aggrid.search import search_index
+
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame({
+        'status': ['ok', 'ko', None, 'ok', 'wait', 'ok'],
+        'value': [5, 3, 8, 1, 9, 2],
+    })
+
+
+def _set_columns():
+    return [col_base(id='status', alias='STATUS', filter=True, kwargs={'filter': 'agSetColumnFilter'})]
+
+
+def test_set_filter_values(frame):
+    values, counts = set_filter_values(frame['status'], counts=True)
+    assert values == ['ko', 'ok', 'wait', None]
+    assert counts == {'ok': 3, 'ko': 1, 'null': 1, 'wait': 1}
+
+
+def test_use_set_filter_values_cached_per_version(frame):
+    set_filter_cache.clear()
+    grid_options = {'columnDefs': [{'field': 'status', 'filter': 'agSetColumnFilter'}, {'field': 'value'}]}
+    use_set_filter_values(grid_options, frame, version='v1', counts=True)
+    use_set_filter_values(grid_options, frame, version='v1', counts=True)
+    assert set_filter_cache.info()['hits'] == 1
+    assert grid_options['columnDefs'][0]['filterParams']['values'] == ['ko', 'ok', 'wait', None]
+    assert grid_options['context']['easySetCounts']['status']['ok'] == 3
+    assert 'filterParams' not in grid_options['columnDefs'][1]
+
+
+def test_set_filters_opt_in(grid, frame):
+    set_filter_cache.clear()
+    easy_table(frame, columns_list=_set_columns())
+    assert 'values' not in (grid.last.grid_options['columnDefs'][0].get('filterParams') or {})
+    assert set_filter_cache.info()['currsize'] == 0
+
+    easy_table(frame, columns_list=_set_columns(), precompute_set_filters=True, data_version='v1')
+    assert grid.last.grid_options['columnDefs'][0]['filterParams']['values'] == ['ko', 'ok', 'wait', None]
+
+
+@pytest.fixture
+def people():
+    return pd.DataFrame({
+        'name': ['Ana', 'bob', None, 'Anabel', 'carl'],
+        'age': [30, None, 25, 41, 30],
+        'team': ['x', 'y', 'x', None, 'y'],
+    })
+
+
+@pytest.mark.parametrize('model, expected', [
+    ({'filterType': 'text', 'type': 'contains', 'filter': 'AN'}, [0, 3]),
+    ({'filterType': 'text', 'type': 'notContains', 'filter': 'an'}, [1, 2, 4]),
+    ({'filterType': 'number', 'type': 'greaterThanOrEqual', 'filter': 30}, [0, 3, 4]),
+    ({'filterType': 'number', 'type': 'inRange', 'filter': 25, 'filterTo': 41}, [0, 4]),
+    ({'filterType': 'number', 'operator': 'OR', 'conditions': [
+        {'type': 'equals', 'filter': 25}, {'type': 'blank'}]}, [1, 2]),
+])
+def test_filtered_positions_filters(people, model, expected):
+    column = 'name' if model.get('filterType') == 'text' else 'age'
+    assert filtered_positions(people, {column: model}, [], version='v').tolist() == expected
+
+
+def test_filtered_positions_set_and_sort(people):
+    set_model = {'team': {'filterType': 'set', 'values': ['x', None]}}
+    assert filtered_positions(people, set_model, [], version='v').tolist() == [0, 2, 3]
+    # Estable, nulos primero en ascendente
+    sort_model = [{'colId': 'age', 'sort': 'asc'}]
+    assert filtered_positions(people, {}, sort_model, version='v').tolist() == [1, 2, 0, 4, 3]
+    sort_model = [{'colId': 'team', 'sort': 'desc'}, {'colId': 'age', 'sort': 'desc'}]
+    assert filtered_positions(people, set_model, sort_model, version='v').tolist() == [0, 2, 3]
+
+
+def test_filtered_positions_mixed_directions_with_nulls():
+    df = pd.DataFrame({
+        'team': ['x', 'x', 'y', 'x', 'y', 'x'],
+        'age': [30, np.nan, 20, 10, np.nan, 30],
+    })
+    # Nulos de cada clave en su lado: ultimos en 'age' descendente aunque 'team' sea ascendente
+    sort_model = [{'colId': 'team', 'sort': 'asc'}, {'colId': 'age', 'sort': 'desc'}]
+    assert filtered_positions(df, {}, sort_model, version='v').tolist() == [0, 5, 3, 1, 2, 4]
+    sort_model = [{'colId': 'team', 'sort': 'desc'}, {'colId': 'age', 'sort': 'asc'}]
+    assert filtered_positions(df, {}, sort_model, version='v').tolist() == [4, 2, 1, 3, 0, 5]
+
+
+def test_filtered_positions_nothing_to_apply(people):
+    assert filtered_positions(people, {}, [], version='v') is None
+    missing = {'other': {'filterType': 'text', 'type': 'contains', 'filter': 'a'}}
+    assert filtered_positions(people, missing, [{'colId': 'other', 'sort': 'asc'}], version='v') is None
+
+
+def test_paged_search_with_unknown_filter_column(grid, monkeypatch, session_state, people):
+    # Sin ScriptRunContext st.text_input no lee session_state: la busqueda se inyecta
+    monkeypatch.setattr(table, 'search_box', lambda df, fields, key=None, version=None:
+                        ('ana', search_index(df, fields, key=key, version=version).search('ana')))
+    session_state['t'] = {'gridState': {'filter': {'filterModel': {
+        'other': {'filterType': 'text', 'type': 'contains', 'filter': 'a'}}}}}
+    easy_table(people, key='t', row_model='paged', quick_search=['name'], data_version='v')
+    assert grid.last.data['name'].tolist() == ['Ana', 'Anabel']
@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+
+from easy_st_aggrid import easy_table, col_bar
+from easy_st_aggrid.frame import with_columns, shallow_copy
+
+
+def _frame():
+    return pd.DataFrame({
+        'name': ['a', 'b', 'c'],
+        'value': [1.0, -2.0, 3.0],
+        'date': pd.date_range('2026-01-01', periods=3),
+    })
+
+
+def test_with_columns_shares_untouched_buffers():
+    df = _frame()
+    out = with_columns(df, {'value': np.zeros(3), 'extra': [1, 2, 3]})
+    assert list(out.columns) == ['name', 'value', 'date', 'extra']
+    assert np.shares_memory(out['date'].to_numpy(), df['date'].to_numpy())
+    assert df['value'].tolist() == [1.0, -2.0, 3.0]
+    assert 'extra' not in df.columns
+
+
+def test_shallow_copy_isolates_new_columns():
+    df = _frame()
+    copy = shallow_copy(df)
+    copy['added'] = 1
+    copy['date'] = copy['date'].astype(str)
+    assert list(df.columns) == ['name', 'value', 'date']
+    assert df['date'].dtype.kind == 'M'
+
+
+def test_copy_free_table_leaves_caller_frame_untouched(grid):
+    df = _frame()
+    before = df.copy()
+    easy_table(df, columns_list=[col_bar(id='value', performance=True)], copy_data=False)
+    sent = grid.last.data
+    # AgGrid anadio su id y paso las fechas a texto en el frame enviado, no en el del llamante
+    assert '::auto_unique_id::' in sent.columns and sent['date'].dtype.kind != 'M'
+    pd.testing.assert_frame_equal(df, before)
+    assert np.shares_memory(sent['value'].to_numpy(), df['value'].to_numpy())
@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from easy_st_aggrid import easy_table, col_heatmap
+from easy_st_aggrid.col_heatmap import heat_bin_columns, heat_edges, heatmap_css, heat_edges_cache, HEAT_MISSING
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    heat_edges_cache.clear()
+
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame({'latency': [1.0, 2.0, 3.0, 4.0, None, 100.0], 'name': list('abcdef')})
+
+
+def test_quantile_bins(frame):
+    bins = heat_bin_columns(frame, [col_heatmap(id='latency', bins=2)], version='v')
+    assert list(bins) == ['__heat_latency']
+    assert bins['__heat_latency'].dtype == np.int8
+    assert bins['__heat_latency'].tolist() == [0, 0, 1, 1, HEAT_MISSING, 1]
+
+
+def test_threshold_bins(frame):
+    col = col_heatmap(id='latency', bins=[2, 4])
+    assert heat_bin_columns(frame, [col])['__heat_latency'].tolist() == [0, 1, 1, 2, HEAT_MISSING, 2]
+    assert len(heat_edges_cache) == 0
+
+
+def test_page_uses_reference_scale(frame):
+    col = col_heatmap(id='latency', bins=2)
+    page = frame.iloc[:2]
+    assert heat_bin_columns(page, [col], reference=frame, version='v')['__heat_latency'].tolist() == [0, 0]
+    assert heat_bin_columns(page, [col])['__heat_latency'].tolist() == [0, 1]
+
+
+def test_edges_cached_per_version(frame):
+    col = col_heatmap(id='latency', bins=4)
+    edges = heat_edges(frame, col, version='v')
+    assert heat_edges(frame.assign(latency=0), col, version='v') is edges
+    assert heat_edges_cache.info()['hits'] == 1
+
+
+def test_all_missing_column():
+    df = pd.DataFrame({'latency': [None, None]}, dtype=float)
+    assert heat_bin_columns(df, [col_heatmap(id='latency')])['__heat_latency'].tolist() == [HEAT_MISSING] * 2
+
+
+def test_palette_and_rules():
+    col = col_heatmap(id='x', bins=3, colors=['#000000', '#ffffff'])
+    assert col._colors == ['#000000', '#808080', '#ffffff']
+    css = heatmap_css([col])
+    assert [v['color'] for v in css.values()] == ['#ffffff !important', '#212121 !important', '#212121 !important']
+    assert list(col.kwargs['cellClassRules']) == col._classes
+    with pytest.raises(ValueError):
+        col_heatmap(id='x', bins=[3, 1])
+
+
+def test_table_sends_bins_and_css(grid, frame):
+    easy_table(frame, columns_list=[col_heatmap(id='latency', bins=2)], data_version='v')
+    assert grid.last.data['__heat_latency'].tolist() == [0, 0, 1, 1, HEAT_MISSING, 1]
+    assert grid.last.kwargs['custom_css']
@@ -0,0 +1,37 @@
+import pytest
+
+from easy_st_aggrid import col_icon
+from easy_st_aggrid.renderers import RENDERERS, ICON_RENDERER, ICON_RENDERER_LITE
+
+
+def _states():
+    return [col_icon.state('ok', 'Correcto', '#2ecc71', 'check'), col_icon.state(2, 'Error', '#e74c3c', 'close')]
+
+
+@pytest.mark.parametrize('performance, renderer', [(False, ICON_RENDERER), (True, ICON_RENDERER_LITE)])
+def test_performance_mode_swaps_only_the_renderer(performance, renderer):
+    data = col_icon(id='state', states=_states(), icon_size=0, filled=True, performance=performance).data()
+    assert data['cellRenderer'] == renderer
+    assert data['cellRendererParams'] == {
+        'map': {
+            'ok': {'label': 'Correcto', 'color': '#2ecc71', 'icon': 'check'},
+            '2': {'label': 'Error', 'color': '#e74c3c', 'icon': 'close'},
+        },
+        'fallbackColor': '#95a5a6',
+        'fallbackIcon': 'question_mark',
+        'iconSize': 22,
+        'filled': True,
+    }
+
+
+def test_lite_renderer_is_static():
+    js = RENDERERS[ICON_RENDERER_LITE].js_code
+    # Hoja de estilos global inyectada una vez, sin animaciones y sin re-render en refresh
+    assert js.count("document.createElement('style')") == 1 and 'window.__easy_icon_css__' in js
+    assert 'animation' not in js and 'transition' not in js
+    assert 'refresh() { return false; }' in js
+
+
+def test_duplicated_state_rejected():
+    with pytest.raises(ValueError, match='Duplicate'):
+        col_icon(id='state', states=[col_icon.state(1, 'a', '#000', 'x'), col_icon.state('1', 'b', '#000', 'y')])
@@ -0,0 +1,44 @@
+import pandas as pd
+import pytest
+
+from easy_st_aggrid import easy_table, col_status, capture_metrics
+from easy_st_aggrid.instrumentation import start_trace, _NULL_TRACER
+from easy_st_aggrid.table import grid_options_cache
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    grid_options_cache.clear()
+
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame({'name': list('abc'), 'state': [1, 2, 1]})
+
+
+def _columns():
+    return [col_status(id='state', states=[col_status.state(1, 'ok', '#0f0'), col_status.state(2, 'ko', '#f00')])]
+
+
+def test_no_listener_no_tracer():
+    assert start_trace() is _NULL_TRACER
+    with capture_metrics():
+        assert start_trace(key='t') is not _NULL_TRACER
+
+
+def test_callback_and_capture(grid, frame):
+    received = []
+    with capture_metrics(payload=False) as captured:
+        easy_table(frame, key='t', columns_list=_columns(), on_metrics=received.append)
+        easy_table(frame, key='t', columns_list=_columns())
+    first, second = captured
+    assert received == [first]
+    assert (first.key, first.rows, first.columns) == ('t', 3, 2)
+    assert (first.grid_options_cache_hit, second.grid_options_cache_hit) == (False, True)
+    assert {'copy', 'column_spec', 'grid_builder', 'column_defs', 'aggrid'} <= set(first.spans)
+    assert 'grid_builder' not in second.spans and 'cache_copy' in second.spans
+    assert first.total == pytest.approx(sum(first.spans.values()))
+    # La capture sin payload no mide tamanos, el callback si
+    assert first.jscode_blocks > 0 and first.grid_options_bytes > 0
+    assert second.grid_options_bytes is None and second.row_payload_bytes is None
+    assert first.to_dict()['span_aggrid'] == first.spans['aggrid']
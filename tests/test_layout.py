@@ -0,0 +1,62 @@
+import pandas as pd
+
+from easy_st_aggrid import easy_table
+from easy_st_aggrid.layout import estimate_widths, width_cache
+
+
+def _wide(columns):
+    return pd.DataFrame({f"c{i}": [i] for i in range(columns)})
+
+
+def test_virtualisation_off_by_default(grid):
+    easy_table(_wide(150))
+    assert grid.last.grid_options['suppressColumnVirtualisation'] is True
+    assert grid.last.kwargs['columns_auto_size_mode'] == 'FIT_ALL_COLUMNS_TO_VIEW'
+
+
+def test_virtualisation_keeps_column_widths(grid):
+    easy_table(_wide(150), column_virtualisation_threshold=100)
+    assert grid.last.grid_options['suppressColumnVirtualisation'] is False
+    assert grid.last.kwargs['columns_auto_size_mode'] == 'NO_AUTOSIZE'
+    assert grid.last.kwargs['fit_columns_on_grid_load'] is False
+
+    easy_table(_wide(50), column_virtualisation_threshold=100)
+    assert grid.last.grid_options['suppressColumnVirtualisation'] is True
+    assert grid.last.kwargs['columns_auto_size_mode'] == 'FIT_ALL_COLUMNS_TO_VIEW'
+
+
+def test_estimate_widths_from_header_and_content():
+    width_cache.clear()
+    df = pd.DataFrame({
+        'code': ['a', 'b', None],
+        'description': ['x' * 30, None, 'y' * 30],
+        'n': [1, 2, None],
+    })
+    widths = estimate_widths(df, {'code': 'C', 'description': 'DESC', 'n': 'N', 'missing': 'M'})
+    assert set(widths) == {'code', 'description', 'n'}
+    assert widths['code'] == 60 # min_width
+    assert widths['description'] == 30 * 8 + 48
+    assert df['description'].isna().sum() == 1 # el frame no se modifica
+
+
+def test_threshold_with_estimated_widths(grid):
+    df = _wide(5).astype(str)
+    df.iloc[0, 0] = None
+    easy_table(df, column_virtualisation_threshold=1, estimate_column_widths=True)
+    options = grid.last.grid_options
+    assert options['suppressColumnVirtualisation'] is False
+    assert all(c['width'] >= 60 and c['suppressSizeToFit'] for c in options['columnDefs'])
+    assert grid.last.kwargs['columns_auto_size_mode'] == 'NO_AUTOSIZE'
+
+
+def test_estimated_widths_follow_the_page(grid, monkeypatch):
+    import streamlit as st
+    width_cache.clear()
+    df = pd.DataFrame({'text': ['a', 'b', 'x' * 40, 'y' * 40]})
+    monkeypatch.setattr(st, 'number_input', lambda label, key=None, **kwargs: st.session_state[key])
+    widths = []
+    for page in (1, 2):
+        st.session_state['p__page'] = page
+        easy_table(df, key='p', row_model='paged', block_size=2, estimate_column_widths=True, data_version='v')
+        widths.append(grid.last.grid_options['columnDefs'][0]['width'])
+    assert widths[0] < widths[1]
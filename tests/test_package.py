@@ -0,0 +1,44 @@
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+import easy_st_aggrid
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _loaded_after(statement):
+    # Interprete nuevo: los tests ya han importado todo en este
+    probe = textwrap.dedent(f'''
+        import sys
+        {statement}
+        print(",".join(m for m in ("streamlit", "st_aggrid", "pandas", "numpy") if m in sys.modules))
+    ''')
+    out = subprocess.run([sys.executable, '-c', probe], cwd=ROOT, capture_output=True, text=True, check=True)
+    return set(filter(None, out.stdout.strip().split(',')))
+
+
+@pytest.mark.parametrize('statement', ['import easy_st_aggrid', 'from easy_st_aggrid import col_text, cell_style'])
+def test_import_is_lazy(statement):
+    assert _loaded_after(statement) == set()
+
+
+def test_table_import_loads_dependencies():
+    assert {'streamlit', 'st_aggrid', 'pandas'} <= _loaded_after('from easy_st_aggrid import easy_table')
+
+
+def test_public_names_resolve():
+    for name in easy_st_aggrid.__all__:
+        assert getattr(easy_st_aggrid, name) is not None
+    assert set(easy_st_aggrid.__all__) <= set(dir(easy_st_aggrid))
+    with pytest.raises(AttributeError):
+        easy_st_aggrid.missing_name
+
+
+def test_submodule_import_keeps_class():
+    import easy_st_aggrid.col_bar
+    from easy_st_aggrid.col_bar import col_bar
+    assert easy_st_aggrid.col_bar is col_bar
@@ -0,0 +1,40 @@
+import json
+
+import pandas as pd
+
+from easy_st_aggrid import easy_table, col_base, col_bar, col_icon, col_status
+from easy_st_aggrid.renderers import collect_components, RENDERERS, \
+    STATUS_RENDERER, ICON_RENDERER, ICON_RENDERER_LITE, BAR_RENDERER
+
+
+def _status(field):
+    return col_status(id=field, states=[col_status.state(1, 'ok', '#0f0'), col_status.state(2, 'ko', '#f00')])
+
+
+def _icon(field, performance=False):
+    return col_icon(id=field, performance=performance, states=[col_icon.state(1, 'ok', '#0f0', 'check')])
+
+
+def test_collect_components_from_nested_columns():
+    column_defs = [
+        _status('a').data(),
+        col_base(alias='group', children=[_status('b'), _icon('c'), col_bar(id='d', max_abs=10)]).data(),
+        {'field': 'e', 'cellRenderer': 'agAnimateShowChangeCellRenderer'},
+    ]
+    components = collect_components(column_defs)
+    assert set(components) == {STATUS_RENDERER, ICON_RENDERER, BAR_RENDERER}
+    assert all(components[name] is RENDERERS[name] for name in components)
+
+
+def test_renderer_registered_once_per_grid(grid):
+    df = pd.DataFrame({f's{i}': [1, 2] for i in range(5)} | {'i': [1, 1]})
+    columns = [_status(f's{i}') for i in range(5)] + [_icon('i', performance=True)]
+    easy_table(df, columns_list=columns)
+    options = grid.last.grid_options
+    assert set(options['components']) == {STATUS_RENDERER, ICON_RENDERER_LITE}
+    renderers = [c['cellRenderer'] for c in options['columnDefs'] if 'cellRenderer' in c]
+    assert renderers == [STATUS_RENDERER] * 5 + [ICON_RENDERER_LITE]
+    # Las clases solo estan en components: las columnas llevan el nombre y sus parametros
+    assert 'window.__easy_renderers__' not in json.dumps(options['columnDefs'])
+    assert all('window.__easy_renderers__' in js for js in options['components'].values())
+    assert options['columnDefs'][0]['cellRendererParams']['map']['2']['label'] == 'ko'
@@ -0,0 +1,81 @@
+import pandas as pd
+import pytest
+
+from easy_st_aggrid import col_base, col_text
+from easy_st_aggrid.search import TrigramIndex, row_texts, search_index, text_fields, \
+    search_index_cache, latest_index_cache
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    search_index_cache.clear()
+    latest_index_cache.clear()
+
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame({
+        'name': ['Madrid', 'Málaga', 'Bilbao', None, 'Mérida'],
+        'code': ['MAD', 'AGP', 'BIO', 'XXX', 'MID'],
+    }, index=[10, 20, 30, 40, 50])
+
+
+def _index(df):
+    return TrigramIndex(row_texts(df, ['name', 'code']), df.index.to_numpy())
+
+
+@pytest.mark.parametrize('query, expected', [
+    ('m', [0, 1, 4]),
+    ('ál', [1]),
+    ('bil', [2]),
+    ('mad', [0]),
+    ('madr', [0]),
+    ('MÉRIDA mid', [4]),
+    ('idm', []), # trigramas de dos campos distintos
+    ('xxx', [3]),
+    ('zzzz', []),
+])
+def test_search(frame, query, expected):
+    assert _index(frame).search(query).tolist() == expected
+
+
+def test_updated_leaves_old_index_intact(frame):
+    index = _index(frame)
+    assert index.search('bil').tolist() == [2]
+
+    new = frame.drop(index=10)
+    new.loc[30, 'name'] = 'Sevilla'
+    new.loc[60] = ['Bilbo', 'BIB']
+    updated = index.updated(row_texts(new, ['name', 'code']), new.index.to_numpy())
+
+    assert updated is not index
+    assert updated.search('bil').tolist() == [4]
+    assert updated.search('sev').tolist() == [1]
+    assert updated.search('mad').tolist() == []
+    assert updated.row_count == 5
+    # El indice anterior sigue sirviendo los datos anteriores
+    assert index.search('bil').tolist() == [2]
+    assert index.search('mad').tolist() == [0]
+    assert index.row_count == 5
+
+
+def test_updated_rebuilds_without_ids(frame):
+    index = TrigramIndex(row_texts(frame, ['name']))
+    updated = index.updated(row_texts(frame.iloc[::-1], ['name']), None)
+    assert updated.search('bil').tolist() == [2]
+    assert updated.delta is None
+
+
+def test_search_index_per_version(frame):
+    first = search_index(frame, ['name'], key='t', version='v1')
+    assert search_index(frame, ['name'], key='t', version='v1') is first
+    changed = frame.assign(name=frame['name'].replace('Bilbao', 'Burgos'))
+    second = search_index(changed, ['name'], key='t', version='v2')
+    assert second is not first
+    assert second.search('bur').tolist() == [2] and first.search('bur').tolist() == []
+    assert search_index(frame, ['name'], key='t', version='v1').search('bil').tolist() == [2]
+
+
+def test_text_fields():
+    columns = [col_text(id='a'), col_base(id='b'), col_base(id='g', children=[col_text(id='c')])]
+    assert text_fields(columns) == ['a', 'c']
@@ -0,0 +1,70 @@
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+import streamlit as st
+from st_aggrid import DataReturnMode
+from st_aggrid.collectors.custom import CustomResponse
+
+from easy_st_aggrid import easy_table
+from easy_st_aggrid.selection import selected_ids, selected_data, SELECTED_IDS_RETURN
+
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame({'name': list('abcd'), 'value': [5, 3, 8, 1]}, index=[10, 20, 30, 40])
+
+
+def test_ids_from_custom_response(frame):
+    response = CustomResponse({'selectedRowIds': ['3', '1'], 'gridState': {}})
+    assert selected_ids(response) == ['3', '1']
+    assert selected_data(response, frame)['name'].tolist() == ['d', 'b']
+    assert selected_ids(CustomResponse(None)) == []
+
+
+@pytest.mark.parametrize('selection, expected', [
+    (['0', '2'], ['0', '2']),
+    ({'selectAll': False, 'toggledNodes': ['2']}, ['2']),
+    ({'selectAll': True, 'toggledNodes': []}, []),
+])
+def test_row_selection_forms(selection, expected):
+    response = SimpleNamespace(selected_rows_id=selection, grid_state=None, selected_rows=None)
+    assert selected_ids(response) == expected
+
+
+def test_ids_mode_returns_only_ids(grid, session_state, frame):
+    easy_table(frame, key='t', selection_response='ids')
+    kwargs = grid.last.kwargs
+    assert kwargs['data_return_mode'] == DataReturnMode.CUSTOM
+    assert kwargs['custom_jscode_for_grid_return'] is SELECTED_IDS_RETURN
+    assert grid.last.data['__row_id__'].tolist() == [0, 1, 2, 3]
+    assert 't__row_snapshot' not in session_state and 't__row_delta' not in session_state
+
+    easy_table(frame, key='t')
+    assert 'data_return_mode' not in grid.last.kwargs
+
+
+def _select(grid, sent_positions):
+    # getRowId de la grid: String(data[context.easyRowId]) de las filas marcadas
+    id_field = grid.last.grid_options['context']['easyRowId']
+    ids = grid.last.data[id_field].iloc[sent_positions].astype(str).tolist()
+    grid.response = CustomResponse({'selectedRowIds': ids})
+    return grid.response
+
+
+def test_positional_ids_round_trip_through_pages(grid, session_state, monkeypatch, frame):
+    # Sin ScriptRunContext number_input no lee session_state: la pagina se inyecta
+    monkeypatch.setattr(st, 'number_input', lambda label, key=None, **kwargs: 2)
+    easy_table(frame, key='p', selection_response='ids', row_model='paged', block_size=2, data_version='v')
+    assert grid.last.data['name'].tolist() == ['c', 'd']
+    response = _select(grid, [1])
+    selected = selected_data(response, frame)
+    assert selected['name'].tolist() == ['d'] and selected.index.tolist() == [40]
+    assert selected.dtypes.equals(frame.dtypes)
+
+
+@pytest.mark.parametrize('row_id', ['name', True])
+def test_key_ids_round_trip(grid, frame, row_id):
+    easy_table(frame, row_id=row_id, selection_response='ids')
+    response = _select(grid, [3, 0])
+    assert selected_data(response, frame, row_id=row_id)['name'].tolist() == ['d', 'a']
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from easy_st_aggrid import easy_table, col_sparkline
+from easy_st_aggrid.col_sparkline import minmax_downsample, lttb_downsample, sparkline_cells, \
+    series_arrays, sparkline_cache, SPARKLINE_GAP
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    sparkline_cache.clear()
+
+
+def test_minmax_keeps_peaks_in_order():
+    row = np.array([0, 9, 1, 2, -5, 3, 4, 4, 7, 1], dtype=float)
+    out = minmax_downsample(np.vstack([row, -row]), 4)
+    # Buckets de 5 valores: (min, max) en su orden original
+    assert out.tolist() == [[9, -5, 7, 1], [-9, 5, -7, -1]]
+    assert minmax_downsample(row[None, :], 20).shape == (1, 10)
+
+
+def test_minmax_ignores_nan_padding():
+    out = minmax_downsample(np.array([[1, 5, np.nan, 2, 8, 0, 3]]), 4)
+    assert out.shape == (1, 4)
+    assert out[0].tolist() == [1, 5, 8, 0]
+
+
+def test_lttb_keeps_ends_and_spike():
+    row = np.zeros(100)
+    row[37] = 50
+    row[-1] = 3
+    out = lttb_downsample(np.vstack([row, row[::-1]]), 10)
+    assert out.shape == (2, 10)
+    assert out[0, 0] == 0 and out[0, -1] == 3 and 50 in out[0]
+    assert out[1, 0] == 3 and out[1, -1] == 0 and 50 in out[1]
+    assert lttb_downsample(row[None, :5], 10).shape == (1, 5)
+    assert lttb_downsample(row[None, :], 2)[0].tolist() == [0, 3]
+
+
+def test_sparkline_cells_scaled_and_cached():
+    values = pd.Series([[1, 2, 3], [5, 5], None, [0, None, 10]], name='serie')
+    cells = sparkline_cells(values, points=10, version='v')
+    assert cells.tolist() == [[0, 50, 100], [50, 50], None, [0, SPARKLINE_GAP, 100]]
+    assert sparkline_cells(values, points=10, version='v') is cells
+    column = sparkline_cells(values, points=10, scale='column', version='v')
+    assert column[0] == [10, 20, 30]
+
+
+def test_series_arrays_numpy_cells():
+    flat, lengths = series_arrays(pd.Series([np.arange(3), None, np.arange(2)]))
+    assert flat.tolist() == [0, 1, 2, 0, 1] and lengths.tolist() == [3, 0, 2]
+
+
+def test_table_sends_downsampled_cells(grid):
+    df = pd.DataFrame({'host': ['a', 'b'], 'latency': [list(range(200)), list(range(200, 0, -1))]})
+    easy_table(df, columns_list=[col_sparkline(id='latency', points=20)], dict_encode=True)
+    cells = grid.last.data['latency'].tolist()
+    assert all(len(c) == 20 for c in cells)
+    assert cells[0][0] == 0 and cells[0][-1] == 100
+    assert df['latency'].map(len).tolist() == [200, 200]
@@ -0,0 +1,74 @@
+import pandas as pd
+import pytest
+from st_aggrid import JsCode
+
+import easy_st_aggrid.table as table
+from easy_st_aggrid import easy_table, col_text, col_status
+from easy_st_aggrid.table import grid_options_cache
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    grid_options_cache.clear()
+
+
+@pytest.fixture
+def builds(monkeypatch):
+    calls = []
+    build = table.build_grid_options
+
+    def counting(*args, **kwargs):
+        calls.append(args[0].columns.tolist())
+        return build(*args, **kwargs)
+
+    monkeypatch.setattr(table, 'build_grid_options', counting)
+    return calls
+
+
+def _frame():
+    return pd.DataFrame({'name': ['a', 'b'], 'state': [1, 2]})
+
+
+def _columns():
+    return [
+        col_text(id='name'),
+        col_status(id='state', states=[col_status.state(1, 'ok', '#0f0'), col_status.state(2, 'ko', '#f00')]),
+    ]
+
+
+def test_hit_does_not_rebuild(grid, builds):
+    easy_table(_frame(), columns_list=_columns())
+    easy_table(_frame(), columns_list=_columns())
+    assert len(builds) == 1
+    assert grid_options_cache.info()['hits'] == 1
+    assert grid.calls[0].grid_options == grid.calls[1].grid_options
+
+
+def test_schema_or_option_change_misses(grid, builds):
+    easy_table(_frame())
+    easy_table(_frame().astype({'state': float}))
+    easy_table(_frame().rename(columns={'name': 'label'}))
+    easy_table(_frame(), statusbar=True)
+    assert len(builds) == 4
+    assert 'statusBar' in grid.last.grid_options
+
+
+def test_render_does_not_corrupt_cache(grid):
+    easy_table(_frame(), columns_list=_columns(), estimate_column_widths=True, precompute_set_filters=True)
+    first = grid.last.grid_options
+    first['columnDefs'][0]['headerName'] = 'changed'
+    first['components'].clear()
+    first['defaultColDef']['filter'] = False
+
+    (template, _, _), = grid_options_cache._data.values()
+    state = next(c for c in template['columnDefs'] if c['field'] == 'state')
+    # AgGrid solo reescribio los JsCode de su copia
+    assert all(isinstance(js, JsCode) for js in template['components'].values())
+    assert isinstance(state['filterParams']['valueFormatter'], JsCode)
+    assert 'width' not in state and 'values' not in state.get('filterParams', {})
+
+    easy_table(_frame(), columns_list=_columns())
+    second = grid.last.grid_options
+    assert grid_options_cache.info()['hits'] == 1
+    assert 'headerName' not in second['columnDefs'][0]
+    assert second['components'] and second['defaultColDef']['filter'] is True
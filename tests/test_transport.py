@@ -0,0 +1,69 @@
+from io import StringIO
+
+import pandas as pd
+import pytest
+
+from easy_st_aggrid import easy_table, col_base, col_text
+from easy_st_aggrid.instrumentation import capture_metrics
+from easy_st_aggrid.transport import row_payload_bytes, dict_encode_columns
+
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame({'name': list('abcd'), 'value': [1.5, 2.0, None, 4.0]})
+
+
+@pytest.mark.parametrize('transport, json_serialization', [('auto', 'auto'), ('arrow', False), ('json', True)])
+def test_transport_is_native(grid, frame, transport, json_serialization):
+    with capture_metrics() as metrics:
+        easy_table(frame, transport=transport)
+    call = grid.last
+    assert call.kwargs['use_json_serialization'] == json_serialization
+    assert 'easyArrow' not in call.grid_options.get('context', {})
+    if transport == 'json':
+        assert call.data is None and len(pd.read_json(StringIO(call.grid_options['rowData']))) == 4
+    else:
+        assert call.data['name'].tolist() == list('abcd')
+    assert metrics[0].row_payload_bytes == row_payload_bytes(frame, transport)
+
+
+def test_arrow_payload_smaller_than_json():
+    df = pd.DataFrame({'value': range(10_000), 'ratio': [i / 7 for i in range(10_000)]})
+    assert row_payload_bytes(df, 'arrow') < row_payload_bytes(df, 'json')
+
+
+def test_unknown_transport(grid, frame):
+    with pytest.raises(ValueError, match='transport'):
+        easy_table(frame, transport='msgpack')
+
+
+def _decode(codes, values):
+    # Mismo criterio que DICT_VALUE_GETTER: codigo negativo = nulo
+    return [None if code < 0 else values[code] for code in codes]
+
+
+def test_dict_encode_decodes_to_original():
+    df = pd.DataFrame({
+        'city': ['Madrid', 'Lima', None, 'Madrid'] * 50,
+        'kind': pd.Categorical(['a', 'b', 'a', None] * 50),
+        'unique': [f'id{i}' for i in range(200)],
+        'value': range(200),
+    })
+    encoded, dicts = dict_encode_columns(df, max_ratio=0.05)
+    assert set(dicts) == {'city', 'kind'} # 'unique' supera el ratio, 'value' no es texto
+    for col in dicts:
+        assert encoded[col].dtype == 'int8'
+        original = [None if pd.isna(v) else v for v in df[col]]
+        assert _decode(encoded[col].tolist(), dicts[col]) == original
+    assert encoded['unique'].equals(df['unique'])
+    assert df['city'].dtype != 'int8' # el frame original no se modifica
+
+
+def test_dict_encoded_columns_get_value_getter(grid):
+    df = pd.DataFrame({'city': ['Madrid', 'Lima'] * 20, 'n': range(40)})
+    easy_table(df, columns_list=[col_base(alias='G', children=[col_text(id='city')])], dict_encode=['city'])
+    options = grid.last.grid_options
+    assert options['context']['easyDicts'] == {'city': ['Madrid', 'Lima']}
+    child = options['columnDefs'][0]['children'][0]
+    assert 'easyDicts' in child['valueGetter']
+    assert _decode(grid.last.data['city'].tolist(), options['context']['easyDicts']['city']) == df['city'].tolist()
@@ -0,0 +1,53 @@
+import pandas as pd
+import pytest
+
+from easy_st_aggrid import easy_table
+from easy_st_aggrid.tree import level_ancestors, parent_ancestors, tree_paths
+
+
+def test_level_ancestors():
+    ancestors = level_ancestors(pd.Series([1, 2, 3, 2, 1, 2]))
+    assert ancestors.tolist() == [
+        [0, -1, -1],
+        [0, 1, -1],
+        [0, 1, 2],
+        [0, 3, -1],
+        [4, -1, -1],
+        [4, 5, -1],
+    ]
+
+
+@pytest.mark.parametrize('levels', [[1, 3, 2], [2, 1], [0, None]])
+def test_level_ancestors_rejects_bad_order(levels):
+    with pytest.raises(ValueError):
+        level_ancestors(pd.Series(levels, dtype=float))
+
+
+def test_parent_ancestors_any_order():
+    ids = pd.Series(['c', 'a', 'b', 'd'])
+    parents = pd.Series(['b', None, 'a', 'a'])
+    assert parent_ancestors(ids, parents).tolist() == [[1, 2, 0], [1, -1, -1], [1, 2, -1], [1, 3, -1]]
+
+    with pytest.raises(KeyError):
+        parent_ancestors(ids, pd.Series(['b', None, 'x', 'a']))
+    with pytest.raises(ValueError, match='cycle'):
+        parent_ancestors(pd.Series(['a', 'b']), pd.Series(['b', 'a']))
+
+
+def test_tree_paths_level_and_parent_agree():
+    df = pd.DataFrame({
+        'id': ['root', 'child', 'leaf', 'other'],
+        'level': [0, 1, 2, 0],
+        'parent': [None, 'root', 'child', None],
+    })
+    by_level = tree_paths(df, level_col='level', id_col='id')
+    by_parent = tree_paths(df, parent_col='parent', id_col='id')
+    assert by_level.tolist() == by_parent.tolist() == [['root'], ['root', 'child'], ['root', 'child', 'leaf'], ['other']]
+    assert tree_paths(df, level_col='level')[2] == ['0', '1', '2']
+
+
+def test_tree_table_sends_paths(grid):
+    df = pd.DataFrame({'name': ['a', 'b', 'c'], 'level': [1, 2, 2]})
+    easy_table(df, tree_data=True, tree_level_col='level', tree_id_col='name')
+    assert grid.last.grid_options['treeData'] is True
+    assert grid.last.data['__path__'].tolist() == [['a'], ['a', 'b'], ['a', 'c']]